@@ -0,0 +1,60 @@
+# benchmarks/bench_cli_startup.py
+"""
+Бенчмарк времени запуска CLI: `halter-cli --help` в отдельном процессе.
+
+Запуск: python benchmarks/bench_cli_startup.py [--runs N] [--budget SEC]
+Код выхода 1, если медиана превышает бюджет.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Бюджет на медиану `halter-cli --help`, секунды
+STARTUP_BUDGET = 0.35
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+CLI = "from halter.cli.main import run; run()"
+
+
+def measure(args: list[str], runs: int) -> list[float]:
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    timings: list[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, *args],
+            env=env,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET)
+    args = parser.parse_args()
+
+    interpreter = statistics.median(measure(["-c", "pass"], args.runs))
+    cli = statistics.median(measure(["-c", CLI, "--help"], args.runs))
+
+    print(f"python -c pass      : {interpreter * 1000:7.1f} ms")
+    print(f"halter-cli --help   : {cli * 1000:7.1f} ms")
+    print(f"budget              : {args.budget * 1000:7.1f} ms")
+
+    if cli > args.budget:
+        print("FAIL: CLI startup is over budget")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+# benchmarks/bench_pipeline.py
+"""
+Бенчмарк основных этапов на синтетическом проекте: время и пик памяти.
+
+Запуск: python benchmarks/bench_pipeline.py [--devices N] [--networks N]
+    [--software N] [--ports N] [--prefix N] [--seed N] [--repeat N]
+    [--save results.json] [--compare baseline.json --tolerance 0.2]
+
+Время - медиана по --repeat запускам, пик памяти - отдельный запуск
+под tracemalloc (учитываются только аллокации Python). С --compare код
+выхода 1, если медиана любого этапа хуже базовой больше чем на tolerance.
+"""
+
+import argparse
+import gc
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from synthetic import ProjectShape, generate_project
+
+from halter.core.models.project import Project
+from halter.core.services.config_io import load_project, save_project
+from halter.core.services.connectivity import build_connectivity_index
+from halter.core.services.export.firewall import (
+    generate_firewall_config_for_device,
+    generate_iptables_script,
+)
+from halter.core.services.export.netmap import export_to_xlsx
+from halter.core.services.export.network_config import (
+    export_interface_configs_of_device,
+)
+
+
+@dataclass(slots=True, kw_only=True)
+class StageResult:
+    stage: str
+    median: float
+    best: float
+    peak_mib: float
+
+
+def measure(stage: str, fn: Callable[[], Any], repeat: int) -> StageResult:
+    timings: list[float] = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return StageResult(
+        stage=stage,
+        median=statistics.median(timings),
+        best=min(timings),
+        peak_mib=peak / 2**20,
+    )
+
+
+def firewall(project: Project) -> None:
+    index = build_connectivity_index(project.devices, project.software)
+    for device in project.devices:
+        config = generate_firewall_config_for_device(
+            device, project.software, project.devices, index
+        )
+        generate_iptables_script(config)
+
+
+def interface_configs(project: Project) -> None:
+    for device in project.devices:
+        export_interface_configs_of_device(device, project.networks)
+
+
+def run_stages(
+    shape: ProjectShape, repeat: int, workdir: Path
+) -> list[StageResult]:
+    project_path = workdir / "project.yaml"
+    netmap_path = workdir / "netmap.xlsx"
+    project = generate_project(shape)
+
+    stages: list[tuple[str, Callable[[], Any]]] = [
+        ("generate", lambda: generate_project(shape)),
+        ("save_project", lambda: save_project(project, project_path)),
+        ("load_project", lambda: load_project(project_path)),
+        ("firewall", lambda: firewall(project)),
+        ("interface_configs", lambda: interface_configs(project)),
+        ("export_to_xlsx", lambda: export_to_xlsx(project, netmap_path)),
+        (
+            "export_to_xlsx_streaming",
+            lambda: export_to_xlsx(project, netmap_path, streaming=True),
+        ),
+    ]
+    return [measure(name, fn, repeat) for name, fn in stages]
+
+
+def print_report(shape: ProjectShape, results: list[StageResult]) -> None:
+    print(
+        f"devices={shape.devices} networks={shape.networks} "
+        f"software={shape.software} ports={shape.ports} "
+        f"prefix=/{shape.prefix} seed={shape.seed}"
+    )
+    print(f"{'stage':<26}{'median ms':>12}{'best ms':>12}{'peak MiB':>12}")
+    for r in results:
+        print(
+            f"{r.stage:<26}{r.median * 1000:12.1f}"
+            f"{r.best * 1000:12.1f}{r.peak_mib:12.2f}"
+        )
+
+
+def compare(
+    results: list[StageResult], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Этапы, медиана которых хуже базовой больше чем на tolerance"""
+    base = {r["stage"]: r for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        if (old := base.get(r.stage)) is None:
+            continue
+        if r.median > old["median"] * (1 + tolerance):
+            regressions.append(
+                f"{r.stage}: {old['median'] * 1000:.1f} ms -> "
+                f"{r.median * 1000:.1f} ms"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    defaults = ProjectShape()
+    parser.add_argument("--devices", type=int, default=defaults.devices)
+    parser.add_argument("--networks", type=int, default=defaults.networks)
+    parser.add_argument("--software", type=int, default=defaults.software)
+    parser.add_argument("--ports", type=int, default=defaults.ports)
+    parser.add_argument("--prefix", type=int, default=defaults.prefix)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", type=Path, help="Write results as JSON")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    shape = ProjectShape(
+        devices=args.devices,
+        networks=args.networks,
+        software=args.software,
+        ports=args.ports,
+        prefix=args.prefix,
+        seed=args.seed,
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            results = run_stages(shape, args.repeat, Path(tmp))
+        except ValueError as e:
+            parser.error(str(e))
+    print_report(shape, results)
+
+    if args.save:
+        args.save.write_text(
+            json.dumps(
+                {
+                    "shape": asdict(shape),
+                    "results": [asdict(r) for r in results],
+                },
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        if baseline["shape"] != asdict(shape):
+            print("FAIL: baseline was measured on a different project shape")
+            return 1
+        if regressions := compare(results, baseline, args.tolerance):
+            print(f"FAIL: slower than baseline by > {args.tolerance:.0%}")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+# benchmarks/bench_serializers.py
+"""
+Сравнение сохранения проекта: рефлексивный to_dict + yaml.dump против
+сериализаторов, собранных на класс (services/serializers.py).
+
+Запуск: python benchmarks/bench_serializers.py [--devices N]
+    [--networks N] [--prefix N] [--seed N] [--repeat N]
+
+По умолчанию проект примерно на 50 тысяч интерфейсов. Перед замером
+проверяется, что оба пути дают побайтно одинаковый YAML.
+"""
+
+import argparse
+import gc
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+import yaml
+from synthetic import ProjectShape, generate_project
+from yaml import CSafeDumper as Dumper
+
+from halter.core.models.project import Project
+from halter.core.services.serializers import (
+    dump_yaml,
+    encode,
+    reflective_to_dict,
+)
+
+
+def reflective_dump(project: Project) -> str:
+    """Прежний путь save_project"""
+    data = reflective_to_dict(project)
+    text: str = yaml.dump(
+        data, Dumper=Dumper, sort_keys=False, allow_unicode=True
+    )
+    return text
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--devices", type=int, default=40000)
+    parser.add_argument("--networks", type=int, default=200)
+    parser.add_argument("--prefix", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    shape = ProjectShape(
+        devices=args.devices,
+        networks=args.networks,
+        prefix=args.prefix,
+        seed=args.seed,
+    )
+    try:
+        project = generate_project(shape)
+    except ValueError as e:
+        parser.error(str(e))
+    interfaces = sum(len(d.interfaces) for d in project.devices)
+
+    if dump_yaml(project) != reflective_dump(project):
+        print("FAIL: compiled writer output differs from yaml.dump")
+        return 1
+
+    stages = [
+        ("to_dict reflective", lambda: reflective_to_dict(project)),
+        ("to_dict compiled", lambda: encode(project)),
+        ("save reflective", lambda: reflective_dump(project)),
+        ("save compiled", lambda: dump_yaml(project)),
+    ]
+    timings = {name: measure(fn, args.repeat) for name, fn in stages}
+
+    print(f"devices={len(project.devices)} interfaces={interfaces}")
+    print(f"{'stage':<22}{'median ms':>12}")
+    for name, median in timings.items():
+        print(f"{name:<22}{median * 1000:12.1f}")
+    for kind in ("to_dict", "save"):
+        speedup = timings[f"{kind} reflective"] / timings[f"{kind} compiled"]
+        print(f"{kind} speedup: {speedup:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
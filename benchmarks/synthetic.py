@@ -0,0 +1,149 @@
+# benchmarks/synthetic.py
+"""
+Детерминированный генератор синтетического проекта для бенчмарков.
+
+Один и тот же набор параметров и seed всегда даёт один и тот же проект,
+поэтому замеры разных ревизий сравнимы между собой.
+"""
+
+import ipaddress
+import random
+from dataclasses import dataclass
+from itertools import islice
+
+from halter.core.constants import DEVICE_ROLES
+from halter.core.models.address import AddressingType
+from halter.core.models.area import Area
+from halter.core.models.device import Device
+from halter.core.models.interface import NetworkInterface, VlanMode
+from halter.core.models.network import (
+    VLAN,
+    Network,
+    NetworkTier,
+    NetworkTopology,
+)
+from halter.core.models.project import Project
+from halter.core.models.software import Direction, Port, Protocol, Software
+
+AREAS = ["MNS", "PT"]
+# Сеть, из которой нарезаются подсети проекта
+BASE_NETWORK = ipaddress.ip_network("10.0.0.0/8")
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ProjectShape:
+    devices: int = 200
+    networks: int = 20
+    software: int = 10
+    ports: int = 5
+    prefix: int = 24
+    seed: int = 0
+
+
+def generate_project(shape: ProjectShape) -> Project:
+    """Собирает проект заданного размера"""
+    if shape.networks < 1:
+        raise ValueError("At least one network is required.")
+    if not BASE_NETWORK.prefixlen < shape.prefix <= 30:
+        raise ValueError(f"Prefix must be in 9..30, got {shape.prefix}.")
+
+    rng = random.Random(shape.seed)
+    subnets = list(
+        islice(BASE_NETWORK.subnets(new_prefix=shape.prefix), shape.networks)
+    )
+    if len(subnets) < shape.networks:
+        raise ValueError(f"/{shape.prefix} fits only {len(subnets)} networks.")
+
+    networks = [
+        Network(
+            name=f"NET{i:04d}",
+            description=f"Synthetic network {i}",
+            vlan=VLAN(id=i % 4094 + 1, name=f"VLAN{i}"),
+            topology=rng.choice(list(NetworkTopology)),
+            tier=rng.choice(list(NetworkTier)),
+            address_type=AddressingType.IP_NETWORK,
+            address=str(subnet),
+            gateway=str(subnet.network_address + 1),
+            area_type=[AREAS[i % len(AREAS)]],
+        )
+        for i, subnet in enumerate(subnets)
+    ]
+
+    # Общий пул номеров, чтобы у разного ПО совпадали порты
+    port_pool = max(1, shape.software * shape.ports // 2)
+    software = [
+        Software(
+            name=f"sw_{i:03d}",
+            description=f"Synthetic software {i}",
+            version="1.0",
+            ports=[
+                Port(
+                    index=1000 + rng.randrange(port_pool),
+                    description=f"port {j}",
+                    direction=rng.choice(list(Direction)),
+                    protocol=rng.choice(list(Protocol)),
+                )
+                for j in range(shape.ports)
+            ],
+        )
+        for i in range(shape.software)
+    ]
+
+    # Следующий свободный хост в каждой подсети (.1 - шлюз)
+    next_host = [2] * shape.networks
+
+    def interface(name: str, net: int, routes: list[str]) -> NetworkInterface:
+        subnet = subnets[net]
+        if next_host[net] >= subnet.num_addresses - 1:
+            raise ValueError(
+                f"/{shape.prefix} has too few hosts for {shape.devices} "
+                f"devices in {shape.networks} networks."
+            )
+        address = subnet.network_address + next_host[net]
+        next_host[net] += 1
+        return NetworkInterface(
+            name=name,
+            network_id=networks[net].name,
+            routes=routes,
+            address_type=AddressingType.IP_ADDRESS,
+            address=str(address),
+            vlan_mode=VlanMode.ACCESS,
+            software_id="networking",
+        )
+
+    devices = []
+    for i in range(shape.devices):
+        net = i % shape.networks
+        routes = []
+        if shape.networks > 1 and rng.random() < 0.5:
+            routes.append(networks[rng.randrange(shape.networks)].name)
+        interfaces = [interface("eth0", net, routes)]
+        # Каждое четвёртое устройство подключено ко второй сети
+        if shape.networks > 1 and i % 4 == 0:
+            interfaces.append(
+                interface("eth1", (net + 1) % shape.networks, [])
+            )
+
+        used = rng.sample(software, k=min(len(software), rng.randint(1, 3)))
+        devices.append(
+            Device(
+                name=f"DEV-{i:05d}",
+                description=f"Synthetic device {i}",
+                model="Synthetic",
+                role=rng.choice(DEVICE_ROLES),
+                interfaces=interfaces,
+                software_used=[sw.name for sw in used],
+                firewall_id="iptables",
+                area_type=[AREAS[net % len(AREAS)]],
+            )
+        )
+
+    return Project(
+        name="Synthetic",
+        description=f"Synthetic project {shape}",
+        area_type=list(AREAS),
+        networks=networks,
+        devices=devices,
+        software=software,
+        areas=[Area(name=area, description=area) for area in AREAS],
+    )
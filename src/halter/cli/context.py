@@ -1,11 +1,68 @@
 # src/halter/cli/context.py
+from collections.abc import Callable
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 from halter.core.constants import DEFAULT_PATH
 from halter.core.models.project import Project
 
+if TYPE_CHECKING:
+    from halter.core.services.sqlite_io import ProjectDatabase
+
+
+class ProjectRef(dict[str, Project]):
+    """
+    Активный проект. Проект из базы SQLite собирается при первом
+    обращении к "active" (loader), чтобы команды-запросы могли читать
+    базу напрямую, не загружая весь проект.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.loader: Callable[[], Project | None] | None = None
+
+    def _materialize(self, key: object) -> None:
+        if key == "active" and self.loader is not None:
+            loader, self.loader = self.loader, None
+            if (project := loader()) is not None:
+                self["active"] = project
+
+    def __getitem__(self, key: str) -> Project:
+        self._materialize(key)
+        return super().__getitem__(key)
+
+    def __contains__(self, key: object) -> bool:
+        self._materialize(key)
+        return super().__contains__(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        self._materialize(key)
+        return super().get(key, default)
+
+    def loaded(self) -> Project | None:
+        """Проект, если он уже в памяти; загрузку не запускает"""
+        return super().get("active")
+
+
 # Активный проект
-project_ref: dict[str, Project] = {}
+project_ref = ProjectRef()
+
+# Хэш активного проекта на момент загрузки (см. project_fingerprint)
+loaded_fingerprint: dict[str, str] = {}
+
+# База SQLite активного проекта
+project_db: dict[str, "ProjectDatabase"] = {}
 
 # Текущий файл проекта
 project_file: Path = Path(DEFAULT_PATH)  # или импортируй DEFAULT_PATH
+
+
+def query_database() -> "ProjectDatabase | None":
+    """
+    База для запросов без загрузки проекта: есть, пока проект из SQLite
+    не загружен в память. После загрузки (и возможных правок) команды
+    работают с project_ref.
+    """
+    if project_ref.loader is None:
+        return None
+    return project_db.get("active")
@@ -1,9 +1,11 @@
 import typer
 from rich import print
 
-from halter.cli.context import project_ref
+from halter.cli.context import project_ref, query_database
+from halter.core.models.address import AddressingType
 from halter.core.models.device import Device
 from halter.core.models.interface import NetworkInterface
+from halter.core.services.ipam import build_ipam
 
 app = typer.Typer(help="Manage devices in the active project")
 
@@ -17,6 +19,9 @@ def add(
         ..., help="router | switch | ntp server | workstation | panel"
     ),
     interfaces: int = typer.Option(1, help="Number of network interfaces"),
+    auto_ip: bool = typer.Option(
+        False, help="Assign the next free address of each interface network"
+    ),
 ) -> None:
     """Add a device with specified number of interfaces"""
     project = project_ref.get("active")
@@ -28,21 +33,41 @@ def add(
         print("[red]NetBIOS name must be 15 characters or fewer.[/red]")
         raise typer.Exit()
 
-    net_names = [n.name for n in project.networks]
+    net_names = project.networks.names()
     if not net_names:
         print(
             "[yellow]Warning: No networks defined. Interfaces may fail validation.[/yellow]"
         )
 
+    # Пулы строятся один раз: адреса, выданные интерфейсам этого
+    # устройства, сразу становятся занятыми
+    try:
+        ipam = build_ipam(project) if auto_ip else None
+    except ValueError as e:
+        print(f"[red]Address pool error:[/red] {e}")
+        raise typer.Exit()
+
     interfaces_list = []
     for i in range(interfaces):
         print(f"[blue]Configuring interface #{i + 1}[/blue]")
 
         iface_name = typer.prompt("Interface name")
         net_id = typer.prompt(f"Network name (one of: {net_names})")
-        address = typer.prompt("IPv4 address")
+        if ipam is not None:
+            try:
+                pool = ipam.pool(net_id)
+                [ip] = pool.allocate(owner=f"{name}/{iface_name}")
+            except ValueError as e:
+                print(f"[red]Interface error:[/red] {e}")
+                raise typer.Exit()
+            address = str(ip)
+            address_type = AddressingType.IP_ADDRESS
+            print(f"[blue]Assigned address {address}[/blue]")
+        else:
+            address = typer.prompt("IPv4 address")
         routes_str = typer.prompt("Routes (comma separated IPv4s)", default="")
-        address_type = typer.prompt("Address type", default="IPv4 Address")
+        if ipam is None:
+            address_type = typer.prompt("Address type", default="IPv4 Address")
         vlan_mode = typer.prompt("Vlan mode", default="Access")
         software_id = typer.prompt("Software id")
         route_list = [r.strip() for r in routes_str.split(",") if r.strip()]
@@ -75,15 +100,18 @@ def add(
 @app.command("list")
 def list_devices() -> None:
     """List all devices"""
-    project = project_ref.get("active")
-    if not project or not project.devices:
+    if (db := query_database()) is not None:
+        rows = [(d.name, d.role, d.interfaces) for d in db.device_summaries()]
+    elif project := project_ref.get("active"):
+        rows = [(d.name, d.role, len(d.interfaces)) for d in project.devices]
+    else:
+        rows = []
+    if not rows:
         print("[yellow]No devices to show.[/yellow]")
         return
 
-    for d in project.devices:
-        print(
-            f"[cyan]{d.name}[/cyan] | {d.role} | Interfaces: {len(d.interfaces)}"
-        )
+    for name, role, interfaces in rows:
+        print(f"[cyan]{name}[/cyan] | {role} | Interfaces: {interfaces}")
 
 
 @app.command("delete")
@@ -94,9 +122,7 @@ def delete(name: str) -> None:
         print("[red]No active project.[/red]")
         raise typer.Exit()
 
-    before = len(project.devices)
-    project.devices = [d for d in project.devices if d.name != name]
-    if len(project.devices) == before:
+    if not project.devices.remove_named(name):
         print(f"[yellow]No device named '{name}' found.[/yellow]")
     else:
         print(f"[green]Device '{name}' deleted.[/green]")
@@ -109,11 +135,23 @@ def list_interfaces(name: str) -> None:
     if not project:
         print("[red]No active project.[/red]")
         raise typer.Exit()
-    for d in project.devices:
-        if d.name == name:
-            device = d
-    else:
-        if device is None:
-            print(f"[yellow]No device named '{name}' found.[/yellow]")
+    if (device := project.devices.get(name)) is None:
+        print(f"[yellow]No device named '{name}' found.[/yellow]")
+        return
     for interface in device.interfaces:
         print(f"[cyan]{interface.name}[/cyan]")
+
+
+@app.command("rename")
+def rename(name: str, new_name: str) -> None:
+    """Rename a device"""
+    project = project_ref.get("active")
+    if not project:
+        print("[red]No active project.[/red]")
+        raise typer.Exit()
+
+    try:
+        project.rename_device(name, new_name)
+        print(f"[green]Device '{name}' renamed to '{new_name}'.[/green]")
+    except ValueError as e:
+        print(f"[red]Rename failed:[/red] {e}")
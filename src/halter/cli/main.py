@@ -5,15 +5,17 @@ import typer
 from rich import print
 
 from halter.core.constants import DEFAULT_EXPORT_PATH, DEFAULT_PATH
+from halter.core.models.firewall import IptablesFormat
 from halter.core.models.project import Project
-from halter.core.services.config_io import load_project, save_project
-from halter.core.services.export.firewall import export_firewall_configs
-from halter.core.services.export.netmap import export_to_xlsx
-from halter.core.services.export.network_config import (
-    export_networking_configs,
+from halter.core.services.config_io import (
+    load_project,
+    load_project_fingerprinted,
+    project_fingerprint,
+    save_project,
 )
+from halter.core.services.export.layout import NetmapLayout
 
-from .context import project_file, project_ref
+from .context import loaded_fingerprint, project_db, project_file, project_ref
 from .device import app as device_app
 from .network import app as network_app
 from .project import app as project_app
@@ -21,48 +23,92 @@ from .software import app as software_app
 
 app = typer.Typer(help="Project Network Architecture Planner CLI")
 
+# Использовать бинарный снимок проекта при загрузке и сохранении
+use_cache: bool = True
+# Загружать корректные записи проекта с ошибками (--load-valid)
+valid_subset: bool = False
+# Путь сохранения в виде из -f: Path отбросил бы "/" в конце, по
+# которому новый проект сохраняется каталогом
+save_target: str = DEFAULT_PATH
+
 
 @app.callback()
 def global_init(
-    file: Path = typer.Option(
-        Path(DEFAULT_PATH),
+    file: str = typer.Option(
+        DEFAULT_PATH,
         "-f",
         "--file",
-        help="Path to the project YAML file",
+        help="Project YAML file, project directory or SQLite database",
+    ),
+    cache: bool = typer.Option(
+        True,
+        "--cache/--no-cache",
+        help="Use the binary snapshot next to the project file",
+    ),
+    load_valid: bool = typer.Option(
+        False,
+        "--load-valid",
+        help="Load the valid entries of a project with errors, skip the rest",
     ),
 ) -> None:
     """
     Глобальный callback: загружает проект при любом запуске CLI.
     """
-    global project_file
-    project_file = file
+    global project_file, save_target, use_cache, valid_subset
+    project_file = Path(file)
+    save_target = file
+    use_cache = cache
+    valid_subset = load_valid
+    project_ref.loader = None
+    project_db.clear()
+    # Хэш прошлого запуска в том же процессе (тесты, встраивание) не
+    # должен выдать новый проект за неизменённый
+    loaded_fingerprint.clear()
 
     if project_file.exists():
-        try:
-            project = load_project(project_file)
-            if isinstance(project, Project):
-                project_ref["active"] = project
-                print(f"[blue]Auto-loaded project from {project_file}[/blue]")
-            else:
-                print(
-                    f"[yellow]Warning: Invalid project data in {project_file}[/yellow]"
-                )
-        except Exception as e:
-            print(f"[red]Failed to load {project_file}:[/red] {e}")
+        from halter.core.services.sqlite_io import (
+            ProjectDatabase,
+            is_sqlite_path,
+        )
+
+        if is_sqlite_path(project_file):
+            # Проект из базы загружается при первом обращении; запросы
+            # вроде device list читают базу напрямую
+            project_db["active"] = ProjectDatabase(project_file)
+            project_ref.pop("active", None)
+            project_ref.loader = _load_active
+            print(f"[blue]Opened project database {project_file}[/blue]")
+        elif (project := _load_active()) is not None:
+            project_ref["active"] = project
+            print(f"[blue]Auto-loaded project from {project_file}[/blue]")
     else:
         # Создаём дефолтный проект, если файл не существует
         project = Project(
             name="Default name",
             description="Description",
             area_type=["Other"],
-            networks=[],
-            devices=[],
-            software=[],
         )
         project_ref["active"] = project
         print(f"[blue]Default project created `{project.name}`[/blue]")
 
 
+def _load_active() -> Project | None:
+    try:
+        project, fingerprint = load_project_fingerprinted(
+            project_file, cache=use_cache, valid_subset=valid_subset
+        )
+    except Exception as e:
+        print(f"[red]Failed to load {project_file}:[/red] {e}")
+        return None
+    if not isinstance(project, Project):
+        print(
+            f"[yellow]Warning: Invalid project data in {project_file}[/yellow]"
+        )
+        return None
+    loaded_fingerprint["active"] = fingerprint
+    return project
+
+
 app.add_typer(project_app, name="project")
 app.add_typer(software_app, name="software")
 app.add_typer(network_app, name="network")
@@ -73,30 +119,251 @@ def run() -> None:
     try:
         app()
     finally:
-        p = project_ref.get("active")
-        if p is not None and isinstance(p, Project):
+        p = project_ref.loaded()
+        # Команды только для чтения не переписывают файл проекта
+        if (
+            p is not None
+            and isinstance(p, Project)
+            and loaded_fingerprint.get("active") != project_fingerprint(p)
+        ):
             try:
-                save_project(p, project_file)
+                save_project(p, save_target, cache=use_cache)
             except Exception as e:
                 print(f"[red]Auto-save failed:[/red] {e}")
 
 
 @app.command("export-netmap")
-def export_netmap(path: str = "network_ips.xlsx") -> None:
+def export_netmap(
+    path: str = "network_ips.xlsx",
+    streaming: bool = typer.Option(
+        False, help="Write rows straight to file (flat memory)"
+    ),
+    layout: NetmapLayout = typer.Option(
+        NetmapLayout.FULL, help="full: every address; compact: occupied only"
+    ),
+) -> None:
     """Export netmap in xlsx format"""
+    # Экспортёры импортируются только при запуске своей команды
+    from halter.core.services.export.netmap import export_to_xlsx
+
     p = project_ref.get("active")
     if not p:
         print("[red]No active project.[/red]")
         raise typer.Exit()
-    export_to_xlsx(p, path)
+    export_to_xlsx(p, path, streaming=streaming, layout=layout)
 
 
 @app.command("export-configs")
-def export_configs(path: Path = Path(DEFAULT_EXPORT_PATH)) -> None:
+def export_configs(
+    path: Path = Path(DEFAULT_EXPORT_PATH),
+    jobs: int = typer.Option(
+        1, "--jobs", "-j", min=1, help="Number of worker processes"
+    ),
+    ipset: bool = typer.Option(
+        False, help="Match peer groups with ipset sets in iptables scripts"
+    ),
+    iptables_format: IptablesFormat = typer.Option(
+        IptablesFormat.SCRIPT,
+        help="script: iptables.sh; restore: iptables-restore rules file",
+    ),
+    incremental: bool = typer.Option(
+        False, help="Regenerate only devices whose inputs changed"
+    ),
+) -> None:
     """Export all device configs"""
+    from halter.core.services.export.firewall import export_firewall_configs
+    from halter.core.services.export.incremental import (
+        export_configs_incremental,
+        print_incremental_result,
+    )
+    from halter.core.services.export.network_config import (
+        export_networking_configs,
+    )
+    from halter.core.services.export.parallel import export_configs_parallel
+
     p = project_ref.get("active")
     if not p:
         print("[red]No active project.[/red]")
         raise typer.Exit()
+    if incremental:
+        result = export_configs_incremental(
+            p, path, ipset=ipset, iptables_format=iptables_format, jobs=jobs
+        )
+        print_incremental_result(result)
+        if result.errors:
+            raise typer.Exit(code=1)
+        return
+    if jobs > 1:
+        results = export_configs_parallel(
+            p, path, jobs, ipset=ipset, iptables_format=iptables_format
+        )
+        if any(r.error is not None for r in results):
+            raise typer.Exit(code=1)
+        return
     export_networking_configs(project=p, output_dir=path)
-    export_firewall_configs(project=p, output_dir=path)
+    export_firewall_configs(
+        project=p,
+        output_dir=path,
+        ipset=ipset,
+        iptables_format=iptables_format,
+    )
+
+
+@app.command("firewall-diff")
+def firewall_diff(
+    old: Path = typer.Argument(..., help="Old revision of the project YAML"),
+    new: Path = typer.Argument(..., help="New revision of the project YAML"),
+    exit_code: bool = typer.Option(
+        False, "--exit-code", help="Exit with 1 if any rule changed"
+    ),
+) -> None:
+    """Show firewall rule changes per device between two project files"""
+    from halter.core.services.export.firewall import rule_spec
+    from halter.core.services.firewall_diff import diff_firewalls
+
+    try:
+        diff = diff_firewalls(load_project(old), load_project(new))
+    except (OSError, ValueError) as e:
+        print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(code=2)
+
+    for device in diff.devices:
+        if device.old_backend is None and device.new_backend is not None:
+            title = f"{device.device} (firewall added: {device.new_backend})"
+        elif device.new_backend is None:
+            title = f"{device.device} (firewall removed)"
+        elif device.old_backend != device.new_backend:
+            title = (
+                f"{device.device} ({device.old_backend} -> "
+                f"{device.new_backend})"
+            )
+        else:
+            title = f"{device.device} ({device.new_backend})"
+        print(f"[bold]{title}[/bold]")
+        for rule in device.removed:
+            print(f"[red]- {rule_spec(rule)}[/red]")
+        for rule in device.added:
+            print(f"[green]+ {rule_spec(rule)}[/green]")
+
+    added = sum(len(d.added) for d in diff.devices)
+    removed = sum(len(d.removed) for d in diff.devices)
+    print(
+        f"{len(diff.devices)} device(s) changed: +{added} -{removed} rule(s); "
+        f"{diff.recomputed} recomputed, {diff.unchanged} unchanged"
+    )
+    if exit_code and diff.devices:
+        raise typer.Exit(code=1)
+
+
+@app.command("check")
+def check() -> None:
+    """Report duplicate interface addresses and overlapping networks"""
+    from halter.core.services.project_check import check_project
+
+    p = project_ref.get("active")
+    if not p:
+        print("[red]No active project.[/red]")
+        raise typer.Exit()
+
+    result = check_project(p)
+    for dup in result.duplicates:
+        print(
+            f"[red]Duplicate address {dup.address}:[/red] "
+            f"{', '.join(dup.owners)}"
+        )
+    for overlap in result.overlaps:
+        if overlap.identical:
+            print(
+                f"[red]Same network {overlap.outer_address}:[/red] "
+                f"{overlap.outer}, {overlap.inner}"
+            )
+        else:
+            print(
+                f"[red]Overlapping networks:[/red] {overlap.outer} "
+                f"({overlap.outer_address}) contains {overlap.inner} "
+                f"({overlap.inner_address})"
+            )
+
+    if result.ok:
+        print("[green]No address conflicts found.[/green]")
+        return
+    print(
+        f"{len(result.duplicates)} duplicate address(es), "
+        f"{len(result.overlaps)} network overlap(s)"
+    )
+    raise typer.Exit(code=1)
+
+
+@app.command("path")
+def show_path(
+    source: str = typer.Argument(..., help="Source device"),
+    target: str = typer.Argument(..., help="Target device"),
+    port: int | None = typer.Option(
+        None, help="Also require this port in the software of both devices"
+    ),
+) -> None:
+    """Show the network path from one device to another"""
+    from halter.core.services.reachability import build_reachability_graph
+
+    p = project_ref.get("active")
+    if not p:
+        print("[red]No active project.[/red]")
+        raise typer.Exit()
+
+    graph = build_reachability_graph(p)
+    try:
+        hops = graph.path(source, target)
+    except ValueError as e:
+        print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(code=2)
+
+    if hops is None:
+        print(f"[red]{target} is not reachable from {source}.[/red]")
+        raise typer.Exit(code=1)
+
+    print(f"[cyan]{source} -> {target}[/cyan]")
+    for hop in hops:
+        via = f" (route on {hop.via})" if hop.via else ""
+        print(f"  {hop.network}{via}")
+
+    ports = sorted(graph.common_ports(source, target))
+    print(f"  Common ports: {', '.join(map(str, ports)) or 'none'}")
+    if port is not None and not graph.can_reach(source, target, port):
+        print(f"[red]Port {port} is not used by both devices.[/red]")
+        raise typer.Exit(code=1)
+
+
+@app.command("shell")
+def shell(
+    script: Path | None = typer.Argument(
+        None, help="File with one command per line (stdin if omitted)"
+    ),
+    fail_fast: bool = typer.Option(
+        False, "--fail-fast", help="Stop at the first failed command"
+    ),
+) -> None:
+    """Run many commands on the loaded project, save once at the end"""
+    import sys
+
+    from typer.main import get_command
+
+    from .shell import iter_commands, run_shell
+
+    # Подкоманды вызываются напрямую, минуя global_init: проект
+    # уже в project_ref и не перечитывается
+    group = get_command(app)
+    commands = {
+        name: command
+        for name, command in getattr(group, "commands", {}).items()
+        if name != "shell"
+    }
+
+    if script is None:
+        lines = iter_commands(sys.stdin, interactive=sys.stdin.isatty())
+        results = run_shell(commands, lines, fail_fast=fail_fast)
+    else:
+        with open(script, encoding="utf-8") as f:
+            results = run_shell(commands, iter_commands(f), fail_fast)
+
+    if any(r.exit_code for r in results):
+        raise typer.Exit(code=1)
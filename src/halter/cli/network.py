@@ -1,7 +1,7 @@
 import typer
 from rich import print
 
-from halter.cli.context import project_ref
+from halter.cli.context import project_ref, query_database
 from halter.core.models.address import AddressingType
 from halter.core.models.network import (
     VLAN,
@@ -9,6 +9,12 @@ from halter.core.models.network import (
     NetworkTier,
     NetworkTopology,
 )
+from halter.core.services.ipam import (
+    build_ipam,
+    format_range,
+    format_ranges,
+)
+from halter.core.validation.address_validators import parse_range
 
 app = typer.Typer(help="Manage networks in the active project")
 
@@ -78,11 +84,7 @@ def delete(name: str) -> None:
         print("[red]No active project.[/red]")
         raise typer.Exit()
 
-    before = len(project.networks)
-    project.networks = [n for n in project.networks if n.name != name]
-    after = len(project.networks)
-
-    if before == after:
+    if not project.networks.remove_named(name):
         print(f"[yellow]No network named '{name}' found.[/yellow]")
     else:
         print(f"[green]Deleted network '{name}'[/green]")
@@ -108,50 +110,104 @@ def edit(
         print("[red]No active project.[/red]")
         raise typer.Exit()
 
-    for net in project.networks:
-        if net.name == name:
-            try:
-                if address:
-                    net.update_address(
-                        address, address_type or net.address_type
-                    )
-                if description:
-                    net.description = description
-                if vlan_id and vlan_name:
-                    net.vlan = VLAN(id=vlan_id, name=vlan_name)
-                if topology:
-                    net.topology = topology
-                if tier:
-                    net.tier = tier
-                if gateway:
-                    net.gateway = gateway
-                print(f"[green]Updated network '{name}'.[/green]")
-            except ValueError as e:
-                print(f"[red]Validation failed:[/red] {e}")
-            return
-
-    print(f"[yellow]Network '{name}' not found.[/yellow]")
+    if (net := project.networks.get(name)) is None:
+        print(f"[yellow]Network '{name}' not found.[/yellow]")
+        return
+
+    try:
+        if address:
+            net.update_address(address, address_type or net.address_type)
+        if description:
+            net.description = description
+        if vlan_id and vlan_name:
+            net.vlan = VLAN(id=vlan_id, name=vlan_name)
+        if topology:
+            net.topology = topology
+        if tier:
+            net.tier = tier
+        if gateway:
+            net.gateway = gateway
+        print(f"[green]Updated network '{name}'.[/green]")
+    except ValueError as e:
+        print(f"[red]Validation failed:[/red] {e}")
+
+
+@app.command("rename")
+def rename(
+    name: str = typer.Argument(..., help="Current network name"),
+    new_name: str = typer.Argument(..., help="New network name"),
+) -> None:
+    """Rename a network and update interfaces that refer to it."""
+    project = project_ref.get("active")
+    if not project:
+        print("[red]No active project.[/red]")
+        raise typer.Exit()
+
+    try:
+        project.rename_network(name, new_name)
+        print(f"[green]Renamed network '{name}' to '{new_name}'.[/green]")
+    except ValueError as e:
+        print(f"[red]Rename failed:[/red] {e}")
 
 
 @app.command("show")
 def show(name: str = typer.Argument(..., help="Network name to show")) -> None:
     """Show detailed info about a network."""
+    if (db := query_database()) is not None:
+        net = db.network(name)
+    elif project := project_ref.get("active"):
+        net = project.networks.get(name)
+    else:
+        print("[red]No active project.[/red]")
+        raise typer.Exit()
+
+    if net is None:
+        print(f"[yellow]Network '{name}' not found.[/yellow]")
+        return
+
+    vlan = f"{net.vlan.id} ({net.vlan.name})" if net.vlan else "None"
+    print(f"[cyan]Network: {net.name}[/cyan]")
+    print(f"  Description   : {net.description}")
+    print(f"  Address       : {net.address}")
+    print(f"  Address Type  : {net.address_type.value}")
+    print(f"  VLAN          : {vlan}")
+    print(f"  Topology      : {net.topology.value}")
+    print(f"  Tier          : {net.tier.value}")
+    print(f"  Gateway       : {net.gateway}")
+
+
+@app.command("allocate")
+def allocate(
+    name: str = typer.Argument(..., help="Network name"),
+    count: int = typer.Option(
+        1, min=1, help="Number of free addresses to reserve"
+    ),
+    reserve: str = typer.Option(
+        None, help="Reserve a fixed address or range (A or A-B) instead"
+    ),
+) -> None:
+    """Reserve free addresses or a fixed range in a network."""
     project = project_ref.get("active")
     if not project:
         print("[red]No active project.[/red]")
         raise typer.Exit()
 
-    for net in project.networks:
-        if net.name == name:
-            vlan = f"{net.vlan.id} ({net.vlan.name})" if net.vlan else "None"
-            print(f"[cyan]Network: {net.name}[/cyan]")
-            print(f"  Description   : {net.description}")
-            print(f"  Address       : {net.address}")
-            print(f"  Address Type  : {net.address_type.value}")
-            print(f"  VLAN          : {vlan}")
-            print(f"  Topology      : {net.topology.value}")
-            print(f"  Tier          : {net.tier.value}")
-            print(f"  Gateway       : {net.gateway}")
-            return
-
-    print(f"[yellow]Network '{name}' not found.[/yellow]")
+    if (net := project.networks.get(name)) is None:
+        print(f"[yellow]Network '{name}' not found.[/yellow]")
+        return
+
+    try:
+        pool = build_ipam(project).pool(name)
+        if reserve:
+            first, last = parse_range(reserve)
+            pool.reserve(first, last)
+            ranges = [format_range(first, last)]
+        else:
+            ranges = format_ranges(pool.allocate(count))
+    except ValueError as e:
+        print(f"[red]Allocation failed:[/red] {e}")
+        raise typer.Exit(code=1)
+
+    net.reserved.extend(ranges)
+    print(f"[green]Reserved in '{name}': {', '.join(ranges)}[/green]")
+    print(f"  Free addresses left: {pool.free_count()}")
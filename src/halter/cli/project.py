@@ -34,8 +34,8 @@ def summary() -> None:
 
 
 @app.command("save")
-def save(path: Path | None = None) -> None:
-    """Save project to YAML."""
+def save(path: str | None = None) -> None:
+    """Save project to YAML; a path ending with / saves a directory."""
     project = project_ref.get("active")
     if not isinstance(project, Project):
         print("[red]No active project.[/red]")
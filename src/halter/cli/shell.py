@@ -0,0 +1,130 @@
+# src/halter/cli/shell.py
+"""
+Пакетный режим: много команд над одним загруженным проектом.
+
+Проект загружается глобальным callback'ом один раз, команды работают
+с context.project_ref, а сохранение делает run() после выхода.
+"""
+
+import shlex
+import time
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from typing import Any, TextIO
+
+import typer
+from rich import print
+from rich.markup import escape
+from typer.exceptions import TyperException
+
+PROMPT = "halter> "
+EXIT_WORDS = frozenset({"exit", "quit"})
+
+
+@dataclass(slots=True, kw_only=True)
+class CommandResult:
+    line: str
+    exit_code: int
+    elapsed: float
+
+
+def iter_commands(stream: TextIO, interactive: bool = False) -> Iterator[str]:
+    """
+    Строки команд из потока без пустых строк и комментариев (#).
+
+    Строки читаются по одной, поэтому ответы на typer.prompt можно
+    писать в скрипте сразу после команды.
+    """
+    while True:
+        if interactive:
+            try:
+                line = input(PROMPT)
+            except EOFError:
+                return
+        else:
+            line = stream.readline()
+            if not line:
+                return
+
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line in EXIT_WORDS:
+            return
+        yield line
+
+
+def run_command(commands: Mapping[str, Any], line: str) -> int:
+    """Выполняет одну строку как команду halter-cli, возвращает код выхода"""
+    try:
+        argv = shlex.split(line)
+    except ValueError as e:
+        print(f"[red]Parse error:[/red] {e}")
+        return 2
+
+    name, *args = argv
+    command = commands.get(name)
+    if command is None:
+        print(
+            f"[red]Unknown command '{escape(name)}'.[/red] "
+            f"Available: {', '.join(sorted(commands))}"
+        )
+        return 2
+
+    try:
+        # standalone_mode даёт обычный вывод ошибок и --help,
+        # завершение приходит как SystemExit
+        command.main(
+            args, prog_name=f"halter-cli {name}", standalone_mode=True
+        )
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        return e.code if isinstance(e.code, int) else 1
+    except typer.Exit as e:
+        return e.exit_code
+    except typer.Abort:
+        print("[red]Aborted.[/red]")
+        return 1
+    except TyperException as e:
+        print(f"[red]Error:[/red] {escape(e.format_message())}")
+        return e.exit_code
+    # Ошибки проекта (ValueError) и файлов; прочие - ошибки в коде,
+    # им незачем теряться среди результатов пакета
+    except (OSError, ValueError) as e:
+        print(f"[red]Error:[/red] {escape(str(e))}")
+        return 1
+    return 0
+
+
+def run_shell(
+    commands: Mapping[str, Any],
+    lines: Iterable[str],
+    fail_fast: bool = False,
+) -> list[CommandResult]:
+    """Выполняет команды по очереди с замером времени каждой"""
+    results: list[CommandResult] = []
+
+    for line in lines:
+        start = time.perf_counter()
+        code = run_command(commands, line)
+        elapsed = time.perf_counter() - start
+        results.append(
+            CommandResult(line=line, exit_code=code, elapsed=elapsed)
+        )
+
+        colour = "green" if code == 0 else "red"
+        print(
+            f"[{colour}]{elapsed * 1000:.1f} ms[/{colour}] "
+            f"[dim]{escape(line)}[/dim]"
+        )
+        if code and fail_fast:
+            break
+
+    total = sum(r.elapsed for r in results)
+    failed = sum(1 for r in results if r.exit_code)
+    print(
+        f"[blue]{len(results)} command(s) in {total:.2f} s, "
+        f"{failed} failed[/blue]"
+    )
+    return results
@@ -1,8 +1,7 @@
 import typer
 from rich import print
-from rich.table import Table
 
-from halter.cli.context import project_ref
+from halter.cli.context import project_ref, query_database
 from halter.core.models.software import Direction, Port, Protocol, Software
 
 app = typer.Typer(help="Manage software entries in the active project")
@@ -49,15 +48,16 @@ def list_ports(
     software_name: str = typer.Argument(..., help="Название ПО"),
 ) -> None:
     """Вывести список портов у выбранного ПО"""
-    project = project_ref.get("active")
-    if not project or not project.software:
-        print("[yellow] Нет записей ПО в проекте.[/yellow]")
-        return
+    from rich.table import Table
 
-    # Поиск ПО по имени
-    software = next(
-        (sw for sw in project.software if sw.name == software_name), None
-    )
+    if (db := query_database()) is not None:
+        software = db.software(software_name)
+    else:
+        project = project_ref.get("active")
+        if not project or not project.software:
+            print("[yellow] Нет записей ПО в проекте.[/yellow]")
+            return
+        software = project.software.get(software_name)
 
     if software is None:
         print(f"[red] ПО с названием '{software_name}' не найдено.[/red]")
@@ -94,9 +94,7 @@ def delete(name: str) -> None:
         print("[red]No active project.[/red]")
         raise typer.Exit()
 
-    before = len(project.software)
-    project.software = [s for s in project.software if s.name != name]
-    if len(project.software) == before:
+    if not project.software.remove_named(name):
         print(f"[yellow]No software named '{name}' found.[/yellow]")
     else:
         print(f"[green]Software '{name}' deleted.[/green]")
@@ -115,8 +113,11 @@ def add_port(
         print("[red]No active project found.[/red]")
         raise typer.Exit()
 
+    if (software := project.software.get(software_name)) is None:
+        print(f"[red]No software named '{software_name}' found.[/red]")
+        raise typer.Exit()
+
     try:
-        software = next(s for s in project.software if s.name == software_name)
         new_port = Port(
             direction=direction,
             protocol=protocol,
@@ -143,8 +144,11 @@ def remove_port(
         print("[red]No active project found.[/red]")
         raise typer.Exit()
 
+    if (software := project.software.get(software_name)) is None:
+        print(f"[red]No software named '{software_name}' found.[/red]")
+        raise typer.Exit()
+
     try:
-        software = next(s for s in project.software if s.name == software_name)
         removed = software.ports.pop(port_index)
         print(
             f"[yellow] Удалён порт {removed.protocol}:{removed.index} из {software.name}[/yellow]"
@@ -169,8 +173,11 @@ def edit_port(
         print("[red]No active project found.[/red]")
         raise typer.Exit()
 
+    if (software := project.software.get(software_name)) is None:
+        print(f"[red]No software named '{software_name}' found.[/red]")
+        raise typer.Exit()
+
     try:
-        software = next(s for s in project.software if s.name == software_name)
         p = software.ports[port_index]
         if direction:
             p.direction = direction
@@ -185,3 +192,18 @@ def edit_port(
         )
     except IndexError:
         print("[red] Неверный индекс порта [/red]")
+
+
+@app.command("rename")
+def rename(name: str, new_name: str) -> None:
+    """Rename software and update devices that use it"""
+    project = project_ref.get("active")
+    if not project:
+        print("[red]No active project.[/red]")
+        raise typer.Exit()
+
+    try:
+        project.rename_software(name, new_name)
+        print(f"[green]Software '{name}' renamed to '{new_name}'.[/green]")
+    except ValueError as e:
+        print(f"[red]Rename failed:[/red] {e}")
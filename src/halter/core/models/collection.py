@@ -0,0 +1,152 @@
+# src/halter/core/models/collection.py
+"""
+Список именованных объектов проекта со словарём по имени.
+
+NamedList остаётся обычным list для сериализации, итерации и сравнения,
+но поиск по имени - O(1). Словарь обновляется при любом изменении
+списка; переименовывать элементы нужно через rename().
+"""
+
+from collections.abc import Iterable, Mapping
+from typing import Any, Protocol, SupportsIndex, overload
+
+
+class Named(Protocol):
+    name: str
+
+
+class NamedList[T: Named](list[T]):
+    """
+    Список с индексом name -> элемент. При повторяющихся именах в индексе
+    первый элемент, как у поиска перебором (команды CLI). Экспортёрам
+    нужен last_by_name: последний элемент, как у словаря из списка.
+    """
+
+    def __init__(self, items: Iterable[T] = ()) -> None:
+        super().__init__(items)
+        self._reindex()
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Индекс не сохраняется в pickle, а строится заново
+        return self.__class__, (list(self),)
+
+    def _reindex(self) -> None:
+        self._by_name: dict[str, T] = {}
+        for item in self:
+            self._by_name.setdefault(item.name, item)
+        self._last_by_name: dict[str, T] | None = None
+
+    @property
+    def by_name(self) -> Mapping[str, T]:
+        return self._by_name
+
+    @property
+    def last_by_name(self) -> Mapping[str, T]:
+        """Индекс, где при повторах имени побеждает последний элемент"""
+        if self._last_by_name is None:
+            self._last_by_name = {item.name: item for item in self}
+        return self._last_by_name
+
+    def get(self, name: str) -> T | None:
+        return self._by_name.get(name)
+
+    def names(self) -> list[str]:
+        return list(self._by_name)
+
+    def remove_named(self, name: str) -> int:
+        """Удаляет все элементы с именем name, возвращает их число"""
+        if name not in self._by_name:
+            return 0
+        before = len(self)
+        kept = [item for item in self if item.name != name]
+        super().__setitem__(slice(None), kept)
+        del self._by_name[name]
+        self._last_by_name = None
+        return before - len(self)
+
+    def rename(self, old: str, new: str) -> T:
+        """
+        Переименовывает элемент. Новое имя проверяется теми же правилами,
+        что и при создании объекта.
+        """
+        if (item := self._by_name.get(old)) is None:
+            raise ValueError(f"'{old}' not found.")
+        if new != old and new in self._by_name:
+            raise ValueError(f"'{new}' already exists.")
+
+        item.name = new
+        try:
+            if post_init := getattr(item, "__post_init__", None):
+                post_init()
+        except ValueError:
+            item.name = old
+            raise
+        self._reindex()
+        return item
+
+    # === Изменение списка ===
+
+    def append(self, item: T) -> None:
+        super().append(item)
+        self._by_name.setdefault(item.name, item)
+        self._last_by_name = None
+
+    def extend(self, items: Iterable[T]) -> None:
+        start = len(self)
+        super().extend(items)
+        for item in self[start:]:
+            self._by_name.setdefault(item.name, item)
+        self._last_by_name = None
+
+    def __iadd__(self, items: Iterable[T]) -> "NamedList[T]":  # type: ignore[override, misc]
+        self.extend(items)
+        return self
+
+    def insert(self, index: SupportsIndex, item: T) -> None:
+        super().insert(index, item)
+        self._reindex()
+
+    def remove(self, item: T) -> None:
+        super().remove(item)
+        self._reindex()
+
+    def pop(self, index: SupportsIndex = -1) -> T:
+        item = super().pop(index)
+        self._reindex()
+        return item
+
+    def clear(self) -> None:
+        super().clear()
+        self._by_name.clear()
+        self._last_by_name = None
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        super().sort(*args, **kwargs)
+        self._reindex()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._reindex()
+
+    @overload
+    def __setitem__(self, key: SupportsIndex, value: T) -> None: ...
+    @overload
+    def __setitem__(self, key: slice, value: Iterable[T]) -> None: ...
+    def __setitem__(self, key: Any, value: Any) -> None:
+        super().__setitem__(key, value)
+        self._reindex()
+
+    def __delitem__(self, key: SupportsIndex | slice) -> None:
+        super().__delitem__(key)
+        self._reindex()
+
+
+def name_map[T: Named](items: Iterable[T]) -> Mapping[str, T]:
+    """
+    Индекс по имени для экспортёров: при повторах имени последний
+    элемент, как у прежнего {item.name: item for item in items}.
+    У NamedList индекс строится один раз до следующего изменения.
+    """
+    if isinstance(items, NamedList):
+        return items.last_by_name
+    return {item.name: item for item in items}
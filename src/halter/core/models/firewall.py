@@ -16,6 +16,27 @@ class Chain(StrEnum):
     FORWARD = "FORWARD"
 
 
+class IptablesFormat(StrEnum):
+    """Вид вывода iptables: скрипт с вызовом на правило или iptables-restore"""
+
+    SCRIPT = "script"
+    RESTORE = "restore"
+
+
+class IpSetType(StrEnum):
+    HASH_IP = "hash:ip"
+    HASH_NET = "hash:net"
+
+
+@dataclass(slots=True, kw_only=True)
+class IpSet:
+    """Именованный набор адресов для одного правила вместо правила на адрес"""
+
+    name: str
+    set_type: IpSetType
+    members: list[str] = field(default_factory=list)
+
+
 @dataclass(slots=True, kw_only=True)
 class FirewallRule:
     chain: Chain
@@ -23,6 +44,9 @@ class FirewallRule:
     protocol: str | None = None
     source: str | None = None
     destination: str | None = None
+    # Имя IpSet из FirewallConfig.ipsets вместо одиночного адреса
+    source_set: str | None = None
+    destination_set: str | None = None
     source_ports: list[int] | None = None
     destination_ports: list[int] | None = None
     interface_in: str | None = None
@@ -38,6 +62,7 @@ class FirewallRule:
 @dataclass(slots=True, kw_only=True)
 class FirewallConfig:
     rules: list[FirewallRule] = field(default_factory=list)
+    ipsets: list[IpSet] = field(default_factory=list)
     default_policy_input: RuleAction = RuleAction.ACCEPT
     default_policy_forward: RuleAction = RuleAction.ACCEPT
     default_policy_output: RuleAction = RuleAction.ACCEPT
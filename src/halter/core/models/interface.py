@@ -45,11 +45,10 @@ class NetworkInterface:
             raise
 
     def is_valid_address(self) -> bool:
-        try:
-            self._validate_address()
+        if self.address is None:
             return True
-        except ValueError:
-            return False
+        validator = VALIDATION_FUNCTIONS.get(self.address_type)
+        return validator is None or validator.check(self.address)
 
     def get_address_type_name(self) -> str:
         return self.address_type.value
@@ -1,9 +1,13 @@
 # core/models/network.py
+import ipaddress
 from dataclasses import dataclass, field
 from enum import StrEnum
 
 from halter.core.models.address import AddressingType
-from halter.core.validation.address_validators import VALIDATION_FUNCTIONS
+from halter.core.validation.address_validators import (
+    VALIDATION_FUNCTIONS,
+    parse_range,
+)
 
 
 class NetworkTier(StrEnum):
@@ -45,6 +49,11 @@ class Network:
     address: str = ""
     gateway: str = ""
     area_type: list[str] = field(default_factory=list)
+    # Зарезервированные адреса и диапазоны: "10.0.0.5", "10.0.0.10-10.0.0.20".
+    # Пустой список в YAML не пишется: файл остаётся прежнего формата
+    reserved: list[str] = field(
+        default_factory=list, metadata={"omit_empty": True}
+    )
 
     def __post_init__(self) -> None:
         self._validate_address()
@@ -53,6 +62,27 @@ class Network:
         if self.address is not None:
             if validator := VALIDATION_FUNCTIONS.get(self.address_type):
                 validator(self.address)
+        self._validate_reserved()
+
+    def _validate_reserved(self) -> None:
+        if not self.reserved:
+            return
+        if self.address_type != AddressingType.IP_NETWORK:
+            raise ValueError("Reserved addresses require an IPv4 network.")
+        network = ipaddress.ip_network(self.address, strict=False)
+        if network.version != 4:
+            raise ValueError(
+                f"Reserved addresses require an IPv4 network: {self.address}"
+            )
+        for item in self.reserved:
+            first, last = parse_range(item)
+            if not (
+                ipaddress.IPv4Address(first) in network
+                and ipaddress.IPv4Address(last) in network
+            ):
+                raise ValueError(
+                    f"Reserved range {item} is outside {network}."
+                )
 
     def update_address(
         self,
@@ -70,11 +100,10 @@ class Network:
             raise
 
     def is_valid_address(self) -> bool:
-        try:
-            self._validate_address()
+        if self.address is None:
             return True
-        except ValueError:
-            return False
+        validator = VALIDATION_FUNCTIONS.get(self.address_type)
+        return validator is None or validator.check(self.address)
 
     def get_address_type_name(self) -> str:
         return self.address_type.value
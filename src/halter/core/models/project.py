@@ -1,22 +1,58 @@
 from dataclasses import dataclass, field
+from typing import Any
 
 from halter.core.constants import PROJECT_TYPES
 from halter.core.models.area import Area
+from halter.core.models.collection import NamedList
 from halter.core.models.device import Device
 from halter.core.models.network import Network
 from halter.core.models.software import Software
 
+# Коллекции проекта с индексом по имени
+_NAMED_FIELDS = frozenset({"networks", "devices", "software"})
+
 
 @dataclass(slots=True, kw_only=True)
 class Project:
     name: str
     description: str
     area_type: list[str] = field(default_factory=list)
-    networks: list[Network] = field(default_factory=list)
-    devices: list[Device] = field(default_factory=list)
-    software: list[Software] = field(default_factory=list)
+    networks: NamedList[Network] = field(default_factory=NamedList)
+    devices: NamedList[Device] = field(default_factory=NamedList)
+    software: NamedList[Software] = field(default_factory=NamedList)
     areas: list[Area] = field(default_factory=list)
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Обычный список при создании или присваивании оборачивается,
+        # чтобы индекс по имени был всегда
+        if name in _NAMED_FIELDS and not isinstance(value, NamedList):
+            value = NamedList(value)
+        object.__setattr__(self, name, value)
+
     def __post_init__(self) -> None:
         if not set(self.area_type).issubset(set(PROJECT_TYPES)):
             raise ValueError("Area type must be of from predefined values.")
+
+    # === Переименование со ссылками ===
+
+    def rename_network(self, old: str, new: str) -> Network:
+        """Переименовывает сеть вместе с network_id и маршрутами интерфейсов"""
+        network = self.networks.rename(old, new)
+        for device in self.devices:
+            for iface in device.interfaces:
+                if iface.network_id == old:
+                    iface.network_id = new
+                iface.routes = [new if r == old else r for r in iface.routes]
+        return network
+
+    def rename_device(self, old: str, new: str) -> Device:
+        return self.devices.rename(old, new)
+
+    def rename_software(self, old: str, new: str) -> Software:
+        """Переименовывает ПО вместе со ссылками в software_used устройств"""
+        software = self.software.rename(old, new)
+        for device in self.devices:
+            device.software_used = [
+                new if s == old else s for s in device.software_used
+            ]
+        return software
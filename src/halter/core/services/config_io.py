@@ -3,110 +3,326 @@
 Модуль для сохранения в yaml
 """
 
-from dataclasses import fields, is_dataclass
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
 
 import yaml
-from yaml import CSafeDumper as Dumper
 from yaml import CSafeLoader as Loader
 
 from halter.core.models.address import AddressingType
 from halter.core.models.area import Area
+from halter.core.models.collection import NamedList
 from halter.core.models.device import Device
-from halter.core.models.interface import NetworkInterface
-from halter.core.models.network import (
-    VLAN,
-    Network,
-    NetworkTier,
-    NetworkTopology,
-)
+from halter.core.models.network import Network
 from halter.core.models.project import Project
-from halter.core.models.software import Port, Software
+from halter.core.models.software import Software
+from halter.core.services.serializers import (
+    decode,
+    decode_errors,
+    encode,
+    write_yaml,
+)
+from halter.core.services.snapshot import (
+    dump_project,
+    fingerprint_of,
+    read_snapshot,
+    write_snapshot,
+)
+from halter.core.validation.address_validators import validate_many
 
+# Разделы проекта в порядке разбора YAML
+_SECTIONS: list[tuple[str, type]] = [
+    ("networks", Network),
+    ("devices", Device),
+    ("software", Software),
+    ("areas", Area),
+]
+_ADDRESS_TYPES = frozenset(t.value for t in AddressingType)
 
-# Представитель для StrEnum: выводим просто строку
-def _enum_representer(dumper: Any, obj: Any) -> Any:
-    return dumper.represent_scalar("tag:yaml.org,2002:str", obj.value)
 
+def to_dict(obj: Any) -> Any:
+    """
+    Преобразование объекта в примитивные структуры для dump. Для
+    dataclass используется encoder, собранный один раз на класс.
+    """
+    return encode(obj)
 
-yaml.add_multi_representer(NetworkTopology, _enum_representer, Dumper=Dumper)
-yaml.add_multi_representer(NetworkTier, _enum_representer, Dumper=Dumper)
-yaml.add_multi_representer(AddressingType, _enum_representer, Dumper=Dumper)
 
-# Преобразование любого объекта в примитивные структуры для dump
+def project_fingerprint(project: Project) -> str:
+    """
+    Хэш содержимого проекта. Совпадение хэшей до и после команды значит,
+    что проект не менялся и сохранять его не нужно.
+    """
+    return fingerprint_of(dump_project(project))
 
 
-def to_dict(obj: Any) -> Any:
-    if is_dataclass(obj):
-        return {f.name: to_dict(getattr(obj, f.name)) for f in fields(obj)}
-    elif hasattr(obj, "__slots__"):
-        return {slot: to_dict(getattr(obj, slot)) for slot in obj.__slots__}
-    elif isinstance(obj, list):
-        return [to_dict(item) for item in obj]
-    elif isinstance(obj, dict):
-        return {k: to_dict(v) for k, v in obj.items()}
-    return obj
-
-
-def save_project(project: Project, path: Path) -> None:
-    """Сериализует Project в YAML без тегов классов"""
-    data = to_dict(project)
-    with open(path, "w", encoding="utf-8") as f:
-        yaml.dump(data, f, Dumper=Dumper, sort_keys=False, allow_unicode=True)
-
-
-def load_project(path: Path) -> Project:
-    """Десериализует Project из YAML с учетом StrEnum"""
+@contextmanager
+def atomic_write(path: Path) -> Iterator[TextIO]:
+    """
+    Запись во временный файл рядом с path и переименование поверх него:
+    при сбое посреди записи старый файл остаётся целым.
+    """
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def save_project(
+    project: Project, path: Path | str, cache: bool = False
+) -> None:
+    """
+    Сериализует Project в YAML без тегов классов. Документ пишется в файл
+    по частям (сети, устройства, ПО), без промежуточных dict и строки
+    на весь проект.
+    cache=True заодно обновляет бинарный снимок для быстрой загрузки.
+
+    Каталог (или путь с разделителем в конце, "plant/") сохраняется в виде
+    индекса и файлов сущностей, см. sharded_io, а файл .sqlite/.db - в
+    базу SQLite, см. sqlite_io. Снимок для них не пишется.
+    """
+    from halter.core.services import sharded_io, sqlite_io
+
+    # Разделитель в конце строки Path отбросит, проверяем до него
+    sharded = sharded_io.is_sharded_path(path)
+    path = Path(path)
+    if sqlite_io.is_sqlite_path(path):
+        sqlite_io.save_project_sqlite(project, path)
+        return
+    if sharded:
+        sharded_io.save_project_dir(project, path)
+        return
+    with atomic_write(path) as f:
+        write_yaml(project, f)
+    if cache:
+        write_snapshot(project, path)
+
+
+@dataclass(slots=True, kw_only=True)
+class LoadIssue:
+    # Путь в YAML: "devices[3].interfaces[0].address"
+    path: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path}: {self.message}"
+
+
+@dataclass(slots=True, kw_only=True)
+class LoadResult:
+    # Проект из корректных записей
+    project: Project
+    issues: list[LoadIssue] = field(default_factory=list)
+
+
+class ProjectLoadError(ValueError):
+    """Проект с ошибками: все найденные ошибки сразу, а не первая"""
+
+    def __init__(self, source: Path, issues: list[LoadIssue]) -> None:
+        self.issues = issues
+        lines = "".join(f"\n  {issue}" for issue in issues)
+        super().__init__(f"{source}: {len(issues)} error(s){lines}")
+
+
+def decode_entry[T](
+    cls: type[T], data: Any, path: str, issues: list[LoadIssue]
+) -> T | None:
+    """
+    Запись раздела проекта или None. Ошибки записи добавляются в issues
+    с путями; подробный разбор идёт только для записей с ошибками.
+    """
+    try:
+        return decode(cls, data)
+    except (AttributeError, TypeError, ValueError) as e:
+        found = _address_issues(data, path)
+        # Ошибку адреса конструктор модели относит ко всей записи,
+        # пакетная проверка уже нашла её с путём поля
+        known = {issue.message for issue in found}
+        errors = decode_errors(cls, data, path) or [(path, str(e))]
+        issues.extend(found)
+        issues.extend(
+            LoadIssue(path=p, message=m) for p, m in errors if m not in known
+        )
+        return None
+
+
+def _address_issues(data: Any, path: str) -> list[LoadIssue]:
+    """
+    Ошибки адресов записи с путями полей. Адреса всех вложенных записей
+    с address_type проверяются пакетно, validate_many на каждый тип.
+    """
+    found: list[tuple[str, AddressingType, str]] = []
+
+    def collect(node: Any, at: str) -> None:
+        if isinstance(node, list):
+            for i, item in enumerate(node):
+                collect(item, f"{at}[{i}]")
+        elif isinstance(node, dict):
+            address, atype = node.get("address"), node.get("address_type")
+            if (
+                isinstance(address, str)
+                and isinstance(atype, str)
+                and atype in _ADDRESS_TYPES
+            ):
+                found.append((f"{at}.address", AddressingType(atype), address))
+            for key, value in node.items():
+                collect(value, f"{at}.{key}")
+
+    collect(data, path)
+    by_type: dict[AddressingType, list[int]] = {}
+    for i, (_, atype, _) in enumerate(found):
+        by_type.setdefault(atype, []).append(i)
+    errors: list[str | None] = [None] * len(found)
+    for atype, indexes in by_type.items():
+        addresses = [found[i][2] for i in indexes]
+        for i, error in zip(
+            indexes, validate_many(atype, addresses), strict=True
+        ):
+            errors[i] = error
+    return [
+        LoadIssue(path=at, message=error)
+        for (at, _, _), error in zip(found, errors, strict=True)
+        if error is not None
+    ]
+
+
+def decode_project_header(
+    data: dict[str, Any], issues: list[LoadIssue]
+) -> Project:
+    """
+    Project с name, description и area_type из data, разделы пустые.
+    Отсутствующие поля и ошибки area_type добавляются в issues.
+    """
+    for key in ("name", "description"):
+        if key not in data:
+            issues.append(
+                LoadIssue(path=key, message="missing required field")
+            )
+    try:
+        return Project(
+            name=data.get("name", ""),
+            description=data.get("description", ""),
+            area_type=data.get("area_type") or [],
+        )
+    except (TypeError, ValueError) as e:
+        issues.append(LoadIssue(path="area_type", message=str(e)))
+        return Project(
+            name=data.get("name", ""), description=data.get("description", "")
+        )
+
+
+def accept_load_result(
+    result: LoadResult, source: Path, valid_subset: bool = False
+) -> Project:
+    """
+    Проект из результата загрузки. При ошибках - ProjectLoadError, а с
+    valid_subset - корректные записи и список пропущенных.
+    """
+    if result.issues:
+        if not valid_subset:
+            raise ProjectLoadError(source, result.issues)
+        for issue in result.issues:
+            print(f"[yellow]Skipped invalid entry[/yellow] {issue}")
+    return result.project
+
+
+def load_project(
+    path: Path, cache: bool = False, valid_subset: bool = False
+) -> Project:
+    """
+    Десериализует Project из YAML с учетом StrEnum.
+
+    Все записи проверяются за один проход. Если есть ошибки, выбрасывается
+    ProjectLoadError со всеми ошибками и их путями в YAML; valid_subset=True
+    вместо этого загружает только корректные записи.
+
+    cache=True сначала пробует актуальный бинарный снимок рядом с YAML,
+    а после разбора YAML без ошибок пересоздаёт устаревший снимок.
+    Каталог читается как проект из индекса и файлов сущностей, файл
+    .sqlite/.db - как база SQLite; ошибки в них собираются так же.
+    """
+    return _load_project(path, cache, valid_subset)[0]
+
+
+def load_project_fingerprinted(
+    path: Path, cache: bool = False, valid_subset: bool = False
+) -> tuple[Project, str]:
+    """
+    Как load_project, но вместе с project_fingerprint проекта. Если
+    снимок прочитан или записан, хэш берётся из его байтов.
+    """
+    project, fingerprint = _load_project(path, cache, valid_subset)
+    if fingerprint is None:
+        fingerprint = project_fingerprint(project)
+    return project, fingerprint
+
+
+def _load_project(
+    path: Path, cache: bool, valid_subset: bool
+) -> tuple[Project, str | None]:
+    if Path(path).is_dir():
+        from halter.core.services.sharded_io import load_project_dir
+
+        return load_project_dir(path, valid_subset=valid_subset), None
+    from halter.core.services.sqlite_io import (
+        is_sqlite_path,
+        load_project_sqlite,
+    )
+
+    if is_sqlite_path(path):
+        return load_project_sqlite(path, valid_subset=valid_subset), None
+    if cache and (snapshot := read_snapshot(Path(path))) is not None:
+        return snapshot
+    result = _load_project_yaml(path)
+    project = accept_load_result(result, path, valid_subset)
+    # Снимок неполного проекта выдал бы его потом за весь файл
+    if cache and not result.issues:
+        try:
+            return project, write_snapshot(project, Path(path))
+        except OSError as e:
+            print(f"[yellow]Snapshot cache not written:[/yellow] {e}")
+    return project, None
+
+
+def _load_project_yaml(path: Path) -> LoadResult:
     with open(path, encoding="utf-8") as f:
         data = yaml.load(f, Loader=Loader)
     if not isinstance(data, dict):
         raise ValueError("YAML root must be mapping with Project fields.")
 
-    # Сети
-    try:
-        nets = []
-        for n in data.get("networks", []):
-            n["topology"] = NetworkTopology(n["topology"])
-            n["tier"] = NetworkTier(n["tier"])
-            n["address_type"] = AddressingType(n["address_type"])
-            if n["vlan"] is not None:
-                n["vlan"] = VLAN(id=n["vlan"]["id"], name=n["vlan"]["name"])
-            nets.append(Network(**n))
-    except Exception as e:
-        print(f"[red]Failed to load network {n}: [/red] {e}")
-
-    # Устройства
-    try:
-        devs = []
-        for d in data.get("devices", []):
-            interfaces = [
-                NetworkInterface(**i) for i in d.get("interfaces", [])
-            ]
-            params = {k: v for k, v in d.items() if k != "interfaces"}
-            params["interfaces"] = interfaces
-            devs.append(Device(**params))
-    except Exception as e:
-        print(f"[red]Failed to load device {d}: [/red] {e}")
-
-    # ПО
-    sws = []
-    for s in data.get("software", []):
-        ports = [Port(**p) for p in s.get("ports", [])]
-        params = {k: v for k, v in s.items() if k != "ports"}
-        params["ports"] = ports
-        sws.append(Software(**params))
-
-    areas = []
-    for area in data.get("areas", []):
-        areas.append(Area(**area))
-
-    return Project(
-        name=data["name"],
-        description=data["description"],
-        area_type=data["area_type"],
-        networks=nets,
-        devices=devs,
-        software=sws,
-        areas=areas,
-    )
+    issues: list[LoadIssue] = []
+    sections: dict[str, list[Any]] = {}
+    for section, cls in _SECTIONS:
+        items = data.get(section) or []
+        if not isinstance(items, list):
+            issues.append(
+                LoadIssue(
+                    path=section,
+                    message=f"expected a list, got {type(items).__name__}",
+                )
+            )
+            items = []
+        sections[section] = [
+            entry
+            for i, item in enumerate(items)
+            if (entry := decode_entry(cls, item, f"{section}[{i}]", issues))
+            is not None
+        ]
+
+    project = decode_project_header(data, issues)
+    project.networks = NamedList(sections["networks"])
+    project.devices = NamedList(sections["devices"])
+    project.software = NamedList(sections["software"])
+    project.areas = sections["areas"]
+    return LoadResult(project=project, issues=issues)
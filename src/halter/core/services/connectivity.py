@@ -0,0 +1,161 @@
+# src/halter/core/services/connectivity.py
+"""
+Индекс связности проекта: номера портов, зоны и сети -> устройства.
+
+Строится один раз на экспорт, после чего поиск соседей устройства
+сводится к пересечению множеств вместо полного перебора project.devices.
+"""
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from halter.core.models.collection import name_map
+from halter.core.models.device import Device
+from halter.core.models.interface import NetworkInterface
+from halter.core.models.software import Direction, Port, Software
+
+
+@dataclass(slots=True, kw_only=True)
+class ConnectivityIndex:
+    """Индекс устройств проекта. Устройства адресуются позицией в devices."""
+
+    devices: list[Device]
+    software_map: Mapping[str, Software]
+    ports: list[list[Port]] = field(default_factory=list)
+    port_indices: list[frozenset[int]] = field(default_factory=list)
+    unique_ports: list[dict[int, Port]] = field(default_factory=list)
+    # network_id -> первый интерфейс устройства, через который сеть доступна
+    reach: list[dict[str, NetworkInterface]] = field(default_factory=list)
+    devices_by_port: dict[int, set[int]] = field(default_factory=dict)
+    devices_by_area: dict[str, set[int]] = field(default_factory=dict)
+    devices_by_network: dict[str, set[int]] = field(default_factory=dict)
+
+    def ports_of(self, device: Device) -> list[Port]:
+        """Порты всего ПО, установленного на устройстве"""
+        return [
+            port
+            for software_name in device.software_used
+            if (software := self.software_map.get(software_name))
+            for port in software.ports
+        ]
+
+    def peers_of(self, device: Device) -> list[int]:
+        """
+        Позиции устройств, у которых с device есть общий порт, общая зона
+        и общая сеть (напрямую или через маршрут). Порядок - как в проекте.
+        """
+        port_set = {port.index for port in self.ports_of(device)}
+        by_port = _union(self.devices_by_port, port_set)
+        if not by_port:
+            return []
+        by_area = _union(self.devices_by_area, device.area_type)
+        by_network = _union(
+            self.devices_by_network,
+            (iface.network_id for iface in device.interfaces),
+        )
+        return sorted(
+            pos
+            for pos in by_port & by_area & by_network
+            if self.devices[pos].name != device.name
+        )
+
+    def firewall_inputs(self, device: Device) -> tuple[Any, ...]:
+        """
+        Всё, от чего зависят правила фаервола устройства: сети интерфейсов,
+        свои порты и у каждого соседа общие порты и адреса. Равные значения
+        в двух ревизиях проекта дают одинаковые правила.
+        """
+        own = create_unique_ports_with_right_direction(self.ports_of(device))
+        networks = tuple(iface.network_id for iface in device.interfaces)
+        peers = []
+        for pos in self.peers_of(device):
+            reach = self.reach[pos]
+            peers.append(
+                (
+                    self.devices[pos].name,
+                    tuple(
+                        _port_key(self.unique_ports[pos][port])
+                        for port in sorted(own.keys() & self.port_indices[pos])
+                    ),
+                    tuple(
+                        iface.address
+                        if (iface := reach.get(network))
+                        else None
+                        for network in networks
+                    ),
+                )
+            )
+        return (
+            device.firewall_id,
+            networks,
+            tuple(_port_key(port) for port in own.values()),
+            tuple(peers),
+        )
+
+
+def _port_key(port: Port) -> tuple[int, str, str]:
+    return (port.index, port.direction, port.protocol)
+
+
+def _union[K](index: dict[K, set[int]], keys: Iterable[K]) -> set[int]:
+    result: set[int] = set()
+    for key in keys:
+        if positions := index.get(key):
+            result |= positions
+    return result
+
+
+def build_connectivity_index(
+    devices: list[Device], software_list: list[Software]
+) -> ConnectivityIndex:
+    """Строит индекс связности по списку устройств и ПО проекта"""
+    index = ConnectivityIndex(
+        devices=devices,
+        software_map=name_map(software_list),
+    )
+
+    for pos, device in enumerate(devices):
+        ports = index.ports_of(device)
+        indices = frozenset(port.index for port in ports)
+        index.ports.append(ports)
+        index.port_indices.append(indices)
+        index.unique_ports.append(
+            create_unique_ports_with_right_direction(ports)
+        )
+
+        reach: dict[str, NetworkInterface] = {}
+        for iface in device.interfaces:
+            reach.setdefault(iface.network_id, iface)
+            for route in iface.routes:
+                reach.setdefault(route, iface)
+        index.reach.append(reach)
+
+        for port_index in indices:
+            index.devices_by_port.setdefault(port_index, set()).add(pos)
+        for area in device.area_type:
+            index.devices_by_area.setdefault(area, set()).add(pos)
+        for network_id in reach:
+            index.devices_by_network.setdefault(network_id, set()).add(pos)
+
+    return index
+
+
+def create_unique_ports_with_right_direction(
+    ports: list[Port],
+) -> dict[int, Port]:
+    """
+    Создает словарь портов с высшим направлнием:
+    если есть оба направления, выбирается both
+    """
+    port_dict: dict[int, Port] = {}
+
+    for port in ports:
+        if port.index not in port_dict:
+            port_dict[port.index] = port
+        elif port.direction == Direction.Both:
+            # Порт с таким индексом уже есть: порт с направлением both
+            # вытесняет его, иначе остаётся существующий
+            port_dict[port.index] = port
+
+    return port_dict
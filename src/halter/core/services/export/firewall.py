@@ -12,6 +12,7 @@ from halter.core.models.firewall import (
     Chain,
     FirewallConfig,
     FirewallRule,
+    IptablesFormat,
     RuleAction,
 )
 from halter.core.models.project import Project
@@ -21,85 +22,82 @@ from halter.core.models.software import (
     Port,
     Software,
 )
+from halter.core.services.connectivity import (
+    ConnectivityIndex,
+    build_connectivity_index,
+    create_unique_ports_with_right_direction,
+)
+from halter.core.services.export.nftables import generate_nftables_ruleset
+from halter.core.services.firewall_optimizer import (
+    collect_ipsets,
+    optimize_firewall_config,
+    port_spec,
+)
+
+# Значения Device.firewall_id, для которых есть генератор
+FIREWALL_BACKENDS = ("iptables", "nftables")
 
 
 def generate_firewall_config_for_device(
     current_device: Device,
     software_list: list[Software],
     devices: list[Device],
+    index: ConnectivityIndex | None = None,
+    optimize: bool = True,
 ) -> FirewallConfig:
-    """Генерирует конфигурацию фаервола для устройства на основе установленного ПО"""
+    """
+    Генерирует конфигурацию фаервола для устройства на основе установленного ПО.
+
+    index - заранее построенный индекс связности проекта. При экспорте всех
+    устройств его нужно строить один раз, иначе он строится на каждый вызов.
+    optimize - убрать повторы, объединить порты и адреса правил
+    (см. firewall_optimizer).
+    """
+    if index is None:
+        index = build_connectivity_index(devices, software_list)
 
-    # Создаем маппинг software_name -> Software объект
-    software_map = {sw.name: sw for sw in software_list}
     rules: list[FirewallRule] = []
 
     # Базовые правила
     rules.extend(_generate_security_rules())
 
     # Получаем порты текущего устройства
-    current_ports: list[Port] = [
-        port
-        for software_name in current_device.software_used
-        if (software := software_map.get(software_name))
-        for port in software.ports
-    ]
-
-    # Проверяем устройства на совпадение портов
-    for other_device in devices:
-        if other_device.name == current_device.name or not (
-            has_common_elements(
-                current_device.area_type, other_device.area_type
-            )
-        ):
-            continue
-
-        # Получаем порты другого устройства
-        other_ports: list[Port] = [
-            port
-            for software_name in other_device.software_used
-            if (software := software_map.get(software_name))
-            for port in software.ports
-        ]
-
-        # Проверяем совпадение портов по индексу (номеру порта)
-        current_set = set(port.index for port in current_ports)
-        other_set = set(port.index for port in other_ports)
-        common_port_indices = current_set & other_set
+    current_ports_by_index = create_unique_ports_with_right_direction(
+        index.ports_of(current_device)
+    )
+    current_set = set(current_ports_by_index)
 
-        if not common_port_indices:
-            continue
+    # Соседи: общий порт, общая зона и общая сеть
+    for pos in index.peers_of(current_device):
+        common_port_indices = current_set & index.port_indices[pos]
+        reach = index.reach[pos]
 
-        # Находим общие сети
+        # Первый интерфейс соседа, через который доступна сеть интерфейса
         for current_interface in current_device.interfaces:
-            for other_interface in other_device.interfaces:
-                if (
-                    current_interface.network_id == other_interface.network_id
-                    or current_interface.network_id in other_interface.routes
-                ):
-                    # Генерируем правила для совпадающих портов с правильными направлениями
-                    rules.extend(
-                        _generate_software_rules(
-                            current_ports,
-                            other_ports,
-                            other_interface.address,
-                            common_port_indices,
-                        )
+            if other_interface := reach.get(current_interface.network_id):
+                # Генерируем правила для совпадающих портов с правильными направлениями
+                rules.extend(
+                    _generate_software_rules(
+                        current_ports_by_index,
+                        index.unique_ports[pos],
+                        other_interface.address,
+                        common_port_indices,
                     )
-                    break  # Один раз для каждой сети
+                )
 
     rules.extend(_generate_final_rules())
-    return FirewallConfig(
+    config = FirewallConfig(
         rules=rules,
         default_policy_input=RuleAction.DROP,
         default_policy_forward=RuleAction.DROP,
         default_policy_output=RuleAction.DROP,
     )
+    return optimize_firewall_config(config) if optimize else config
 
 
 def _generate_software_rules(
-    current_ports: list[Port],
-    other_ports: list[Port],
+    current_ports_by_index: dict[int, Port],
+    other_ports_by_index: dict[int, Port],
     other_address: str,
     common_port_indices: set[int],
 ) -> list[FirewallRule]:
@@ -107,14 +105,6 @@ def _generate_software_rules(
 
     rules: list[FirewallRule] = []
 
-    # Создаем словари для быстрого поиска портов по индексу
-    current_ports_by_index = create_unique_ports_with_right_direction(
-        current_ports
-    )
-    other_ports_by_index = create_unique_ports_with_right_direction(
-        other_ports
-    )
-
     # Группируем порты по направлению и протоколу для текущего устройства
     inbound_tcp_ports: list[int] = []
     inbound_udp_ports: list[int] = []
@@ -385,11 +375,19 @@ def _generate_security_rules() -> list[FirewallRule]:
     return rules
 
 
-def export_firewall_configs(project: Project, output_dir: Path) -> None:
+def export_firewall_configs(
+    project: Project,
+    output_dir: Path,
+    ipset: bool = False,
+    iptables_format: IptablesFormat = IptablesFormat.SCRIPT,
+) -> None:
     # Создаём путь: отдельная папка для проекта
     project_dir = output_dir / project.name
     project_dir.mkdir(parents=True, exist_ok=True)
 
+    # Индекс связности строится один раз на весь экспорт
+    index = build_connectivity_index(project.devices, project.software)
+
     for device in project.devices:
         # Поддиректория для устройства
         device_dir = project_dir / device.name
@@ -397,7 +395,13 @@ def export_firewall_configs(project: Project, output_dir: Path) -> None:
 
         # Экспорт конфигурации
         export_firewall_config_of_device(
-            device, project.software, device_dir, project.devices
+            device,
+            project.software,
+            device_dir,
+            project.devices,
+            index,
+            ipset,
+            iptables_format,
         )
 
 
@@ -406,26 +410,66 @@ def export_firewall_config_of_device(
     software: list[Software],
     output_dir: Path,
     devices: list[Device],
+    index: ConnectivityIndex | None = None,
+    ipset: bool = False,
+    iptables_format: IptablesFormat = IptablesFormat.SCRIPT,
 ) -> None:
     """Экспортирует конфигурации фаервола в файлы"""
+    if device.firewall_id not in FIREWALL_BACKENDS:
+        return
 
     # Генерируем конфигурацию
-    fw_config = generate_firewall_config_for_device(device, software, devices)
+    fw_config = generate_firewall_config_for_device(
+        device, software, devices, index
+    )
 
-    # Генерируем скрипт
-    if device.firewall_id == "iptables":
-        iptables_script = generate_iptables_script(fw_config)
-        (output_dir / "iptables.sh").write_text(
-            iptables_script, encoding="utf-8"
-        )
+    files = render_firewall(device, fw_config, ipset, iptables_format)
+    for filename, content in files.items():
+        (output_dir / filename).write_text(content, encoding="utf-8")
 
-        print(
-            f"[green]Firewall (iptables) config saved to {output_dir}[/green]"
-        )
+    print(
+        f"[green]Firewall ({device.firewall_id}) config saved to {output_dir}[/green]"
+    )
+
+
+def render_firewall(
+    device: Device,
+    config: FirewallConfig,
+    ipset: bool = False,
+    iptables_format: IptablesFormat = IptablesFormat.SCRIPT,
+) -> dict[str, str]:
+    """
+    Файлы фаервола устройства по его firewall_id: {имя файла: содержимое}.
+    Для устройств без поддерживаемого фаервола - пустой словарь.
+    """
+    match device.firewall_id, iptables_format:
+        case "iptables", IptablesFormat.SCRIPT:
+            return {"iptables.sh": generate_iptables_script(config, ipset)}
+        case "iptables", IptablesFormat.RESTORE:
+            if ipset:
+                config = collect_ipsets(config)
+            files = {"iptables.rules": generate_iptables_restore(config)}
+            if config.ipsets:
+                files["ipset.rules"] = "\n".join(
+                    [*generate_ipset_rules(config), ""]
+                )
+            return files
+        case "nftables", _:
+            return {"nftables.nft": generate_nftables_ruleset(config)}
+    return {}
 
 
-def generate_iptables_script(config: FirewallConfig) -> str:
-    """Генерирует bash-скрипт для настройки iptables"""
+def generate_iptables_script(
+    config: FirewallConfig, ipset: bool = False
+) -> str:
+    """
+    Генерирует bash-скрипт для настройки iptables.
+
+    ipset=True: соседи с одинаковыми портами собираются в наборы ipset
+    и проверяются одним правилом -m set (см. collect_ipsets).
+    """
+    if ipset:
+        config = collect_ipsets(config)
     lines: list[str] = []
 
     # Шебанг и заголовок
@@ -452,6 +496,10 @@ def generate_iptables_script(config: FirewallConfig) -> str:
         ]
     )
 
+    # Наборы загружаются до правил, которые на них ссылаются
+    if config.ipsets:
+        lines.extend(_generate_ipset_restore(config))
+
     # Добавляем пользовательские правила
     for rule in config.rules:
         lines.append(_generate_rule(rule))
@@ -464,11 +512,19 @@ def generate_iptables_script(config: FirewallConfig) -> str:
             "# Настройка автоматического восстановления iptables правил при загрузке",
             "mkdir -p /etc/network/if-pre-up.d",
             "echo '#!/bin/sh' | sudo tee /etc/network/if-pre-up.d/iptables",
+            *(
+                [
+                    "echo 'ipset -exist restore < /etc/ipset.rules' | tee -a /etc/network/if-pre-up.d/iptables"
+                ]
+                if config.ipsets
+                else []
+            ),
             "echo 'iptables-restore < /etc/iptables.rules' | tee -a /etc/network/if-pre-up.d/iptables",
             "echo 'exit 0' | tee -a /etc/network/if-pre-up.d/iptables",
             "chmod +x /etc/network/if-pre-up.d/iptables",
             "",
             "# Сохранить правила",
+            *(["ipset save > /etc/ipset.rules"] if config.ipsets else []),
             "/sbin/iptables-save > /etc/iptables.rules",
             "",
             "# Проверить результат",
@@ -479,9 +535,58 @@ def generate_iptables_script(config: FirewallConfig) -> str:
     return "\n".join(lines)
 
 
+def _generate_ipset_restore(config: FirewallConfig) -> list[str]:
+    """Все наборы одним вызовом ipset restore"""
+    return [
+        "ipset -exist restore <<'EOF'",
+        *generate_ipset_rules(config),
+        "EOF",
+        "",
+    ]
+
+
+def generate_ipset_rules(config: FirewallConfig) -> list[str]:
+    """Наборы config.ipsets в формате ipset restore"""
+    lines: list[str] = []
+    for ipset in config.ipsets:
+        lines.append(f"create {ipset.name} {ipset.set_type.value}")
+        lines.append(f"flush {ipset.name}")
+        lines.extend(f"add {ipset.name} {member}" for member in ipset.members)
+    return lines
+
+
+def generate_iptables_restore(
+    config: FirewallConfig, ipset: bool = False
+) -> str:
+    """
+    Таблица filter в формате iptables-restore. Таблица заменяется целиком
+    одной операцией, без промежуточного состояния и процесса на правило.
+
+    Наборы при ipset=True нужно загрузить раньше: ipset -exist restore.
+    """
+    if ipset:
+        config = collect_ipsets(config)
+
+    lines = [
+        "# Generated by Halter. Загрузка: iptables-restore < iptables.rules",
+        "*filter",
+        f":INPUT {config.default_policy_input.value} [0:0]",
+        f":FORWARD {config.default_policy_forward.value} [0:0]",
+        f":OUTPUT {config.default_policy_output.value} [0:0]",
+    ]
+    lines.extend(rule_spec(rule) for rule in config.rules)
+    lines.extend(["COMMIT", ""])
+    return "\n".join(lines)
+
+
 def _generate_rule(rule: FirewallRule) -> str:
     """Генерирует одну строку iptables правила"""
-    cmd_parts = ["iptables"]
+    return f"iptables {rule_spec(rule)}"
+
+
+def rule_spec(rule: FirewallRule) -> str:
+    """Правило без имени команды: -A <цепочка> ... -j <действие>"""
+    cmd_parts: list[str] = []
 
     # Команда и цепочка
     cmd_parts.extend(["-A", rule.chain.value])
@@ -507,13 +612,13 @@ def _generate_rule(rule: FirewallRule) -> str:
     if rule.interface_out:
         cmd_parts.extend(["-o", rule.interface_out])
 
-    # Порты destination_ports
+    # Порты: один номер или диапазон a:b без multiport
     if rule.source_ports:
-        if len(rule.source_ports) == 1:
+        if len(port_spec(rule.source_ports)) == 1:
             cmd_parts.extend(
                 ["--sport", ports_to_multi_or_single(rule.source_ports)]
             )
-        elif len(rule.source_ports) > 1:
+        else:
             cmd_parts.extend(
                 [
                     "--match multiport --sports",
@@ -521,11 +626,11 @@ def _generate_rule(rule: FirewallRule) -> str:
                 ]
             )
     if rule.destination_ports:
-        if len(rule.destination_ports) == 1:
+        if len(port_spec(rule.destination_ports)) == 1:
             cmd_parts.extend(
                 ["--dport", ports_to_multi_or_single(rule.destination_ports)]
             )
-        elif len(rule.destination_ports) > 1:
+        else:
             cmd_parts.extend(
                 [
                     "--match multiport --dports",
@@ -538,6 +643,10 @@ def _generate_rule(rule: FirewallRule) -> str:
         cmd_parts.extend(["-s", rule.source])
     if rule.destination:
         cmd_parts.extend(["-d", rule.destination])
+    if rule.source_set:
+        cmd_parts.extend(["-m set --match-set", rule.source_set, "src"])
+    if rule.destination_set:
+        cmd_parts.extend(["-m set --match-set", rule.destination_set, "dst"])
 
     # Действие
 
@@ -547,7 +656,8 @@ def _generate_rule(rule: FirewallRule) -> str:
 
 
 def ports_to_multi_or_single(ports: list[int]) -> str:
-    return ", ".join(map(str, ports))
+    # iptables ждёт список через запятую без пробелов
+    return ",".join(port_spec(ports))
 
 
 def _get_actual_direction(
@@ -603,35 +713,6 @@ def _get_actual_direction(
             return "both"
 
 
-def create_unique_ports_with_right_direction(
-    ports: list[Port],
-) -> dict[int, Port]:
-    """
-    Создает словарь портов с высшим направлнием:
-    если есть оба направления, выбирается both
-    """
-    port_dict: dict[int, Port] = {}
-
-    for port in ports:
-        if port.index not in port_dict:
-            port_dict[port.index] = port
-        else:
-            # Если уже есть порт с таким индексом, проверяем приоритет
-            existing_port = port_dict[port.index]
-            # Если новый или существующий порт имеет направление both, выбираем его
-            if (
-                port.direction == Direction.Both
-                or existing_port.direction == Direction.Both
-            ):
-                # Оставляем порт с направлением both
-                if port.direction == Direction.Both:
-                    port_dict[port.index] = port
-            # Если оба порта inbound/outbound, можно оставить любой или объединить логику
-            # В данном случае оставляем существующий
-
-    return port_dict
-
-
 def has_common_elements(list1: list[str], list2: list[str]) -> bool:
     """
     Проверяет, есть ли общие элементы в двух списках
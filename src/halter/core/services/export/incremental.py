@@ -0,0 +1,216 @@
+# export/incremental.py
+"""
+Инкрементальный экспорт конфигураций устройств.
+
+Для каждого устройства считается отпечаток входных данных: само
+устройство с интерфейсами, сети его интерфейсов и маршрутов, порты его ПО
+и то, что правила фаервола берут у соседей
+(ConnectivityIndex.firewall_inputs). Отпечатки и списки файлов
+хранятся в манифесте в папке проекта. При следующем экспорте
+перегенерируются и перезаписываются только устройства с другим
+отпечатком или с пропавшими файлами.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from rich import print
+
+from halter.core.models.collection import name_map
+from halter.core.models.device import Device
+from halter.core.models.firewall import IptablesFormat
+from halter.core.models.project import Project
+from halter.core.services.config_io import atomic_write, to_dict
+from halter.core.services.connectivity import (
+    ConnectivityIndex,
+    build_connectivity_index,
+)
+from halter.core.services.export.parallel import (
+    iter_export_configs_parallel,
+    render_device_configs,
+)
+
+MANIFEST_NAME = ".halter-manifest.json"
+# Меняется вместе с форматом манифеста или выводом генераторов:
+# старый манифест тогда не подходит, и экспорт идёт заново
+MANIFEST_VERSION = 1
+
+
+@dataclass(slots=True, kw_only=True)
+class ManifestEntry:
+    fingerprint: str
+    files: list[str] = field(default_factory=list)
+
+
+@dataclass(slots=True, kw_only=True)
+class IncrementalResult:
+    written: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    errors: dict[str, str] = field(default_factory=dict)
+
+
+def device_fingerprint(
+    device: Device,
+    project: Project,
+    index: ConnectivityIndex,
+    options: dict[str, Any] | None = None,
+) -> str:
+    """Хэш всех данных, от которых зависят файлы устройства"""
+    network_map = name_map(project.networks)
+    network_ids = dict.fromkeys(
+        network_id
+        for iface in device.interfaces
+        for network_id in (iface.network_id, *iface.routes)
+    )
+    data = {
+        "version": MANIFEST_VERSION,
+        "options": options or {},
+        "device": to_dict(device),
+        "networks": [
+            to_dict(network_map.get(network_id)) for network_id in network_ids
+        ],
+        # Порты ПО и всё, что правила берут у соседей
+        "firewall": index.firewall_inputs(device),
+    }
+    encoded = json.dumps(data, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def read_manifest(project_dir: Path) -> dict[str, ManifestEntry]:
+    """Манифест прошлого экспорта; пустой, если его нет или он не подходит"""
+    path = project_dir / MANIFEST_NAME
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return {}
+    return {
+        name: ManifestEntry(
+            fingerprint=entry["fingerprint"], files=list(entry["files"])
+        )
+        for name, entry in data.get("devices", {}).items()
+    }
+
+
+def write_manifest(
+    project_dir: Path, entries: dict[str, ManifestEntry]
+) -> None:
+    data = {
+        "version": MANIFEST_VERSION,
+        "devices": {
+            name: {"fingerprint": entry.fingerprint, "files": entry.files}
+            for name, entry in sorted(entries.items())
+        },
+    }
+    with atomic_write(project_dir / MANIFEST_NAME) as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def export_configs_incremental(
+    project: Project,
+    output_dir: Path,
+    ipset: bool = False,
+    iptables_format: IptablesFormat = IptablesFormat.SCRIPT,
+    jobs: int = 1,
+) -> IncrementalResult:
+    """
+    Экспорт только изменившихся устройств. Файлы устройств, которых больше
+    нет в проекте, и файлы, которые устройство перестало создавать
+    (например, после смены формата), удаляются - но только те, что
+    записаны в манифесте.
+    """
+    project_dir = output_dir / project.name
+    project_dir.mkdir(parents=True, exist_ok=True)
+
+    index = build_connectivity_index(project.devices, project.software)
+    options = {"ipset": ipset, "iptables_format": iptables_format.value}
+    old = read_manifest(project_dir)
+    new: dict[str, ManifestEntry] = {}
+    result = IncrementalResult()
+
+    dirty: list[int] = []
+    for pos, device in enumerate(project.devices):
+        fingerprint = device_fingerprint(device, project, index, options)
+        entry = old.get(device.name)
+        if (
+            entry is not None
+            and entry.fingerprint == fingerprint
+            and all((project_dir / f).is_file() for f in entry.files)
+        ):
+            new[device.name] = entry
+            result.unchanged.append(device.name)
+        else:
+            new[device.name] = ManifestEntry(fingerprint=fingerprint)
+            dirty.append(pos)
+
+    if jobs > 1 and len(dirty) > 1:
+        for export in iter_export_configs_parallel(
+            project, output_dir, jobs, ipset, iptables_format, dirty
+        ):
+            if export.error is not None:
+                result.errors[export.device] = export.error
+            else:
+                new[export.device].files = sorted(
+                    path.relative_to(project_dir).as_posix()
+                    for path in export.written
+                )
+    else:
+        for pos in dirty:
+            device = project.devices[pos]
+            try:
+                files = render_device_configs(
+                    device, project, index, ipset, iptables_format
+                )
+            except (OSError, ValueError) as e:
+                result.errors[device.name] = str(e)
+                continue
+            device_dir = project_dir / device.name
+            device_dir.mkdir(parents=True, exist_ok=True)
+            for filename, content in files.items():
+                (device_dir / filename).write_text(content, encoding="utf-8")
+            new[device.name].files = sorted(
+                f"{device.name}/{filename}" for filename in files
+            )
+
+    for pos in dirty:
+        name = project.devices[pos].name
+        if name not in result.errors:
+            result.written.append(name)
+        elif (previous := old.get(name)) is not None:
+            # Старые файлы остаются, а пустой отпечаток не совпадёт ни с
+            # каким: устройство будет экспортировано в следующий раз
+            new[name] = ManifestEntry(fingerprint="", files=previous.files)
+        else:
+            del new[name]
+
+    # Файлы из манифеста, которые больше не создаются
+    current = {f for entry in new.values() for f in entry.files}
+    for name, entry in old.items():
+        stale = [f for f in entry.files if f not in current]
+        for f in stale:
+            (project_dir / f).unlink(missing_ok=True)
+            result.removed.append(f)
+        device_dir = project_dir / name
+        if stale and device_dir.is_dir() and not any(device_dir.iterdir()):
+            device_dir.rmdir()
+
+    write_manifest(project_dir, new)
+    return result
+
+
+def print_incremental_result(result: IncrementalResult) -> None:
+    for name in result.written:
+        print(f"[green]{name}: regenerated[/green]")
+    for name, error in result.errors.items():
+        print(f"[red]{name}: failed[/red] {error}")
+    for f in result.removed:
+        print(f"[yellow]{f}: removed[/yellow]")
+    print(
+        f"{len(result.written)} device(s) regenerated, "
+        f"{len(result.unchanged)} unchanged, {len(result.errors)} failed"
+    )
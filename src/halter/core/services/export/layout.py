@@ -0,0 +1,12 @@
+# export/layout.py
+"""
+Параметры раскладки экспорта. Вынесены отдельно от netmap, чтобы CLI
+мог объявить опции без импорта openpyxl.
+"""
+
+from enum import StrEnum
+
+
+class NetmapLayout(StrEnum):
+    FULL = "full"  # строка на каждый адрес подсети
+    COMPACT = "compact"  # только занятые адреса, свободные - диапазонами
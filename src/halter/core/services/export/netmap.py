@@ -1,14 +1,29 @@
 # src/core/services/export_to_xlnx.py
 import ipaddress
 import re
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterator, Sequence
+from copy import copy
 from dataclasses import dataclass
+from typing import Any
 
 from openpyxl import Workbook
-from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import Cell
+from openpyxl.styles import (
+    Alignment,
+    Border,
+    Font,
+    NamedStyle,
+    PatternFill,
+    Side,
+)
+from openpyxl.worksheet.cell_range import CellRange
 from openpyxl.worksheet.worksheet import Worksheet
 
 from halter.core.models.area import Area
 from halter.core.models.project import Network, Project
+from halter.core.services.export.layout import NetmapLayout
 
 HEADERS = [
     "Канал связи",
@@ -49,6 +64,16 @@ CENTER = Alignment(horizontal="center", vertical="center", wrap_text=True)
 LEFT = Alignment(horizontal="left", vertical="center")
 WHITE_FONT = Font(color="FFFFFF")
 
+NETWORK_HEADERS = [
+    "#",
+    "Network Name",
+    "Address Type",
+    "Address",
+    "Subnet Mask",
+    "VLAN",
+    "Topology",
+]
+
 
 @dataclass
 class DeviceInfo:
@@ -163,11 +188,134 @@ def _networks_for_area(project: Project, area: str) -> list:
     return sorted(nets, key=sort_key)
 
 
+def _host_row(
+    ip_s: str,
+    info: DeviceInfo | None,
+    net: ipaddress.IPv4Network | ipaddress.IPv6Network,
+    gateway: str | None,
+) -> list[str | None]:
+    """Значения колонок B..H для строки одного адреса подсети"""
+    return [
+        info.name if info and info.name else "Не используется",
+        ip_s,
+        f"{net.netmask}/{net.prefixlen}",
+        "Шлюз" if gateway == ip_s else None,
+        info.model if info else None,
+        info.hostname if info else None,
+        info.note if info else None,
+    ]
+
+
+def _subnet_title(
+    net_obj: Network, net: ipaddress.IPv4Network | ipaddress.IPv6Network
+) -> str:
+    vlan = (
+        "Идентификатор VLAN: " + str(net_obj.vlan.id)
+        if net_obj.vlan is not None
+        else ""
+    )
+    return f" Сеть класса «{_ip_class_ru_letter(net)}». {vlan}"
+
+
+def _occupied_addresses(dev_map: dict[str, DeviceInfo]) -> list[int]:
+    """Отсортированные IPv4-адреса устройств в числовом виде"""
+    occupied: list[int] = []
+    for ip_s in dev_map:
+        try:
+            occupied.append(int(ipaddress.IPv4Address(ip_s)))
+        except ValueError:
+            continue
+    occupied.sort()
+    return occupied
+
+
+def _host_bounds(
+    net: ipaddress.IPv4Network | ipaddress.IPv6Network,
+) -> tuple[int, int]:
+    """Первый и последний адрес net.hosts() без перебора подсети"""
+    first, last = int(net.network_address), int(net.broadcast_address)
+    if net.num_addresses > 2:
+        return first + 1, last - 1
+    return first, last
+
+
+def _free_range_row(
+    first: int, last: int, net: ipaddress.IPv4Network | ipaddress.IPv6Network
+) -> list[str | None]:
+    """Значения колонок B..H для свернутого диапазона свободных адресов"""
+    addr_cls = type(net.network_address)
+    count = last - first + 1
+    addresses = (
+        f"{addr_cls(first)}–{addr_cls(last)}"
+        if count > 1
+        else str(addr_cls(first))
+    )
+    return [
+        f"Не используется (хостов: {count})",
+        addresses,
+        f"{net.netmask}/{net.prefixlen}",
+        None,
+        None,
+        None,
+        None,
+    ]
+
+
+def _subnet_rows(
+    net: ipaddress.IPv4Network | ipaddress.IPv6Network,
+    dev_map: dict[str, DeviceInfo],
+    gateway: str | None,
+    layout: NetmapLayout,
+    occupied: list[int] | None,
+) -> Iterator[tuple[list[str | None], bool]]:
+    """
+    Строки адресов подсети: (значения B..H, оформлять как занятую).
+
+    В компактной раскладке строки идут только по занятым адресам и шлюзу,
+    а каждый промежуток свободных адресов сворачивается в одну строку,
+    поэтому время зависит от числа устройств, а не от размера подсети.
+    """
+    if layout == NetmapLayout.FULL:
+        for ip in net.hosts():
+            ip_s = str(ip)
+            info = dev_map.get(ip_s)
+            yield _host_row(ip_s, info, net, gateway), info is not None
+        return
+
+    if occupied is None:
+        occupied = _occupied_addresses(dev_map)
+    first, last = _host_bounds(net)
+    points = set(
+        occupied[bisect_left(occupied, first) : bisect_right(occupied, last)]
+    )
+    if gateway:
+        try:
+            gw = int(ipaddress.ip_address(gateway))
+        except ValueError:
+            gw = -1
+        if first <= gw <= last:
+            points.add(gw)
+
+    addr_cls = type(net.network_address)
+    cursor = first
+    for point in [*sorted(points), last + 1]:
+        if point > cursor:
+            # Текст диапазона должен быть виден, поэтому не белым шрифтом
+            yield _free_range_row(cursor, point - 1, net), True
+        if point <= last:
+            ip_s = str(addr_cls(point))
+            info = dev_map.get(ip_s)
+            yield _host_row(ip_s, info, net, gateway), info is not None
+        cursor = point + 1
+
+
 def _append_subnet_block(
     ws: Worksheet,
     area_name: str,
     net_obj: Network,
     dev_map: dict[str, DeviceInfo],
+    layout: NetmapLayout = NetmapLayout.FULL,
+    occupied: list[int] | None = None,
 ) -> None:
     nname = getattr(net_obj, "description", "Подсеть")
     cidr = getattr(net_obj, "address", None)
@@ -188,11 +336,7 @@ def _append_subnet_block(
     ws.cell(row=row, column=3, value=str(net.network_address))
     ws.cell(row=row, column=4, value=f"{net.netmask}/{net.prefixlen}")
     ws.merge_cells(start_row=row, start_column=5, end_row=row, end_column=8)
-    ws.cell(
-        row=row,
-        column=5,
-        value=f" Сеть класса «{_ip_class_ru_letter(net)}». {'Идентификатор VLAN: ' + str(net_obj.vlan.id) if net_obj.vlan is not None else ''}",
-    )
+    ws.cell(row=row, column=5, value=_subnet_title(net_obj, net))
     # рамки как в шаблоне
     for c in range(1, 9):
         ws.cell(row=row, column=c).border = BORDER_MED
@@ -202,21 +346,9 @@ def _append_subnet_block(
 
     # Зебра стартует каждый блок одинаково
     zebra_toggle = False
-    for ip in net.hosts():
-        ip_s = str(ip)
-        info = dev_map.get(ip_s)
-
-        ws.cell(
-            row=row,
-            column=2,
-            value=(info.name if info and info.name else "Не используется"),
-        )
-        ws.cell(row=row, column=3, value=ip_s)
-        ws.cell(row=row, column=4, value=f"{net.netmask}/{net.prefixlen}")
-        ws.cell(row=row, column=5, value=("Шлюз" if gateway == ip_s else None))
-        ws.cell(row=row, column=6, value=(info.model if info else None))
-        ws.cell(row=row, column=7, value=(info.hostname if info else None))
-        ws.cell(row=row, column=8, value=(info.note if info else None))
+    for values, used in _subnet_rows(net, dev_map, gateway, layout, occupied):
+        for c, value in enumerate(values, start=2):
+            ws.cell(row=row, column=c, value=value)
 
         # зебра по B..H
         if zebra_toggle:
@@ -225,7 +357,7 @@ def _append_subnet_block(
         zebra_toggle = not zebra_toggle
 
         # белый шрифт для «не используется»
-        if not info:
+        if not used:
             for c in range(2, 9):
                 ws.cell(row=row, column=c).font = WHITE_FONT
 
@@ -250,14 +382,28 @@ def _append_subnet_block(
         ws.cell(row=row, column=c).border = BORDER_LR if c == 1 else BORDER_LR
 
 
-def export_to_xlsx(project: Project, output_xlsx: str) -> None:
+def export_to_xlsx(
+    project: Project,
+    output_xlsx: str,
+    streaming: bool = False,
+    layout: NetmapLayout = NetmapLayout.FULL,
+) -> None:
     """
     Экспорт IP-плана по твоему шаблону:
     - отдельный лист на каждый area_type из проекта;
     - в каждом листе блоки по подсетям: заголовок + все адреса по маске;
     - занятые IP заполняются данными устройства, свободные получают белый текст «не используется этот IP адрес»;
     - оформление: ширины колонок, зебра, границы, объединения ячеек как в образце.
+
+    streaming=True пишет книгу в режиме write-only: строки сразу уходят
+    в файл, и память не растёт с размером подсетей.
+    layout=NetmapLayout.COMPACT выводит только занятые адреса, а свободные
+    сворачивает в диапазоны.
     """
+    if streaming:
+        _export_to_xlsx_streaming(project, output_xlsx, layout)
+        return
+
     wb = Workbook()
     # удаляем дефолтный пустой лист
     # wb.remove(wb.active)
@@ -266,54 +412,29 @@ def export_to_xlsx(project: Project, output_xlsx: str) -> None:
     ws.title = "Network Configuration"
 
     # Write headers
-    headers = [
-        "#",
-        "Network Name",
-        "Address Type",
-        "Address",
-        "Subnet Mask",
-        "VLAN",
-        "Topology",
-    ]
-    ws.append(headers)
+    ws.append(NETWORK_HEADERS)
 
     # Make headers bold
-    for col in range(1, len(headers) + 1):
+    for col in range(1, len(NETWORK_HEADERS) + 1):
         cell = ws.cell(row=1, column=col)
         cell.font = Font(bold=True)
 
-    i: int = 0
     # Populate data from Project instance
-    for network in project.networks:
-        i = i + 1
-        ws.append(
-            [
-                i,
-                network.name,  # Direct attribute access
-                network.address_type,
-                str(
-                    ipaddress.ip_network(
-                        network.address, strict=False
-                    ).network_address
-                )
-                if network.address_type == "IPv4 Network"
-                else "",
-                str(
-                    ipaddress.ip_network(network.address, strict=False).netmask
-                )
-                if network.address_type == "IPv4 Network"
-                else "",
-                network.vlan.id if network.vlan is not None else "",
-                network.topology,
-            ]
-        )
+    for i, network in enumerate(project.networks, start=1):
+        ws.append(_network_row(i, network))
 
     # Adjust column widths
-    for col in range(1, len(headers) + 1):
+    for col in range(1, len(NETWORK_HEADERS) + 1):
         col_letter = chr(64 + col)
         ws.column_dimensions[col_letter].width = 18
 
     dev_map = _devices_by_ip(project)
+    # Занятые адреса нужны только компактной раскладке
+    occupied = (
+        _occupied_addresses(dev_map)
+        if layout == NetmapLayout.COMPACT
+        else None
+    )
 
     areas = getattr(project, "area_type", None)
     for area in areas:
@@ -324,7 +445,222 @@ def export_to_xlsx(project: Project, output_xlsx: str) -> None:
         )
         nets = _networks_for_area(project, str(area))
         for net in nets:
-            _append_subnet_block(ws, str(area), net, dev_map)
+            _append_subnet_block(ws, str(area), net, dev_map, layout, occupied)
+
+    wb.save(output_xlsx)
+
+
+def _network_row(i: int, network: Network) -> list[object]:
+    """Строка сводного листа «Network Configuration»"""
+    return [
+        i,
+        network.name,  # Direct attribute access
+        network.address_type,
+        str(
+            ipaddress.ip_network(network.address, strict=False).network_address
+        )
+        if network.address_type == "IPv4 Network"
+        else "",
+        str(ipaddress.ip_network(network.address, strict=False).netmask)
+        if network.address_type == "IPv4 Network"
+        else "",
+        network.vlan.id if network.vlan is not None else "",
+        network.topology,
+    ]
+
+
+# === Потоковый (write-only) экспорт ===
+
+
+def _named_styles() -> dict[str, NamedStyle]:
+    """Именованные стили потокового экспорта, по одному объекту на книгу"""
+    styles = [
+        NamedStyle(name="halter_bold", font=Font(bold=True)),
+        NamedStyle(
+            name="halter_title",
+            font=TITLE_FONT,
+            alignment=CENTER,
+            fill=PatternFill(
+                start_color="565656", end_color="565656", fill_type="solid"
+            ),
+        ),
+        NamedStyle(
+            name="halter_header_center",
+            font=HEADER_FONT,
+            alignment=CENTER,
+            border=BORDER_MED,
+        ),
+        NamedStyle(
+            name="halter_header_left",
+            font=HEADER_FONT,
+            alignment=LEFT,
+            border=BORDER_MED,
+        ),
+        NamedStyle(
+            name="halter_channel",
+            alignment=CENTER,
+            fill=MAIN_CHANNEL,
+            border=BORDER_MED,
+        ),
+        NamedStyle(name="halter_cell", border=BORDER_MED),
+        NamedStyle(name="halter_cell_lr", border=BORDER_LR),
+        NamedStyle(
+            name="halter_used_zebra", border=BORDER_MED, fill=ZEBRA_FILL
+        ),
+        NamedStyle(name="halter_free", border=BORDER_MED, font=WHITE_FONT),
+        NamedStyle(
+            name="halter_free_zebra",
+            border=BORDER_MED,
+            font=WHITE_FONT,
+            fill=ZEBRA_FILL,
+        ),
+    ]
+    return {style.name: style for style in styles}
+
+
+class _StreamSheet:
+    """Лист write-only книги со счётчиком строк и общими стилями"""
+
+    def __init__(self, ws: Any, styles: dict[str, NamedStyle]) -> None:
+        self.ws = ws
+        self.styles = styles
+        self.row = 0
+        # Назначение NamedStyle ищет стиль в книге на каждой ячейке,
+        # поэтому разрешённый массив стиля кэшируется и копируется
+        self._style_arrays: dict[str, Any] = {}
+
+    def cell(self, value: Any, style: str | None = None) -> Cell:
+        cell = WriteOnlyCell(self.ws, value=value)
+        if style is not None:
+            if (array := self._style_arrays.get(style)) is None:
+                cell.style = self.styles[style]
+                self._style_arrays[style] = copy(cell._style)  # type: ignore[attr-defined]
+            else:
+                cell._style = copy(array)  # type: ignore[attr-defined]
+        return cell
+
+    def append(self, cells: Sequence[object]) -> int:
+        self.ws.append(cells)
+        self.row += 1
+        return self.row
+
+    def merge(
+        self, min_row: int, min_col: int, max_row: int, max_col: int
+    ) -> None:
+        self.ws.merged_cells.add(
+            CellRange(
+                min_row=min_row,
+                min_col=min_col,
+                max_row=max_row,
+                max_col=max_col,
+            )
+        )
+
+
+def _stream_title_and_header(sheet: _StreamSheet, sheet_title: str) -> None:
+    # Вид листа пишется вместе с первой строкой, поэтому закрепление - сразу
+    sheet.ws.freeze_panes = "A3"
+    sheet.append(
+        [sheet.cell(f"Сети {sheet_title}", "halter_title")]
+        + [None] * (len(HEADERS) - 1)
+    )
+    sheet.merge(1, 1, 1, len(HEADERS))
+    sheet.append(
+        [
+            sheet.cell(
+                h, "halter_header_center" if i == 1 else "halter_header_left"
+            )
+            for i, h in enumerate(HEADERS, start=1)
+        ]
+    )
+
+
+def _stream_subnet_block(
+    sheet: _StreamSheet,
+    net_obj: Network,
+    dev_map: dict[str, DeviceInfo],
+    layout: NetmapLayout = NetmapLayout.FULL,
+    occupied: list[int] | None = None,
+) -> None:
+    """Потоковый аналог _append_subnet_block"""
+    nname = getattr(net_obj, "description", "Подсеть")
+    cidr = getattr(net_obj, "address", None)
+    atype = getattr(net_obj, "address_type", "IPv4 Network")
+    gateway: str | None = getattr(net_obj, "gateway", None)
+    if not cidr or atype != "IPv4 Network":
+        return
+
+    net = ipaddress.ip_network(str(cidr), strict=False)
+    start_merge_row = sheet.append(
+        [
+            sheet.cell(
+                _extract_suffix_in_parentheses(nname), "halter_channel"
+            ),
+            sheet.cell(f"{nname}", "halter_cell"),
+            sheet.cell(str(net.network_address), "halter_cell"),
+            sheet.cell(f"{net.netmask}/{net.prefixlen}", "halter_cell"),
+            sheet.cell(_subnet_title(net_obj, net), "halter_cell"),
+            sheet.cell(None, "halter_cell"),
+            sheet.cell(None, "halter_cell"),
+            sheet.cell(None, "halter_cell"),
+        ]
+    )
+    sheet.merge(start_merge_row, 5, start_merge_row, 8)
+
+    zebra_toggle = False
+    for values, used in _subnet_rows(net, dev_map, gateway, layout, occupied):
+        if used:
+            style = "halter_used_zebra" if zebra_toggle else "halter_cell"
+        else:
+            style = "halter_free_zebra" if zebra_toggle else "halter_free"
+        sheet.append(
+            [sheet.cell(None, "halter_cell_lr")]
+            + [sheet.cell(value, style) for value in values]
+        )
+        zebra_toggle = not zebra_toggle
+
+    # объединяем A по блоку подсети (заголовок + все IP)
+    sheet.merge(start_merge_row, 1, sheet.row, 1)
+
+    # разделитель между подсетями
+    row = sheet.append([sheet.cell(None, "halter_cell_lr") for _ in range(8)])
+    sheet.merge(row, 1, row, 8)
+
+
+def _export_to_xlsx_streaming(
+    project: Project, output_xlsx: str, layout: NetmapLayout
+) -> None:
+    wb = Workbook(write_only=True)
+    styles = _named_styles()
+    for style in styles.values():
+        wb.add_named_style(style)
+
+    ws = wb.create_sheet("Network Configuration")
+    for col_index in range(1, len(NETWORK_HEADERS) + 1):
+        ws.column_dimensions[chr(64 + col_index)].width = 18
+    summary = _StreamSheet(ws, styles)
+    summary.append([summary.cell(h, "halter_bold") for h in NETWORK_HEADERS])
+    for i, network in enumerate(project.networks, start=1):
+        summary.append(_network_row(i, network))
+
+    dev_map = _devices_by_ip(project)
+    # Занятые адреса нужны только компактной раскладке
+    occupied = (
+        _occupied_addresses(dev_map)
+        if layout == NetmapLayout.COMPACT
+        else None
+    )
+
+    for area in project.area_type:
+        ws = wb.create_sheet(str(area))
+        for col, w in COL_WIDTHS.items():
+            ws.column_dimensions[col].width = w
+        sheet = _StreamSheet(ws, styles)
+        _stream_title_and_header(
+            sheet, _get_area_by_name(area, project.areas).description
+        )
+        for net in _networks_for_area(project, str(area)):
+            _stream_subnet_block(sheet, net, dev_map, layout, occupied)
 
     wb.save(output_xlsx)
 
@@ -4,12 +4,13 @@
 """
 
 import ipaddress
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from pathlib import Path
 from typing import Protocol
 
 from rich import print
 
+from halter.core.models.collection import name_map
 from halter.core.models.device import Device
 from halter.core.models.interface import NetworkInterface, VlanMode
 from halter.core.models.network import Network
@@ -19,7 +20,7 @@ from halter.core.models.project import Project
 # === Тип для обработчиков ===
 class ConfigExporter(Protocol):
     def __call__(
-        self, device: Device, network_map: dict[str, Network]
+        self, device: Device, network_map: Mapping[str, Network]
     ) -> dict[str, str]: ...
 
 
@@ -73,7 +74,8 @@ def export_interface_configs_of_device(
     используя зарегистрированные обработчики.
     """
     results: dict[str, str] = {}
-    network_map = {net.name: net for net in networks}
+    # У project.networks индекс уже есть и не строится на каждое устройство
+    network_map = name_map(networks)
 
     # Группируем интерфейсы по software_id
     grouped: dict[str, list[NetworkInterface]] = {}
@@ -102,7 +104,7 @@ def export_interface_configs_of_device(
 
 @register_handler("networking")
 def export_linux_networking(
-    device: Device, network_map: dict[str, Network]
+    device: Device, network_map: Mapping[str, Network]
 ) -> dict[str, str]:
     lines: list[str] = []
     has_header = False
@@ -156,7 +158,7 @@ def export_linux_networking(
 
 @register_handler("regul_networking")
 def export_regul_networking(
-    device: Device, network_map: dict[str, Network]
+    device: Device, network_map: Mapping[str, Network]
 ) -> dict[str, str]:
     ip_lines: list[str] = []
     route_lines: list[str] = []
@@ -187,7 +189,7 @@ def export_regul_networking(
 
 @register_handler("moxa_networking")
 def export_moxa_networking(
-    device: Device, network_map: dict[str, Network]
+    device: Device, network_map: Mapping[str, Network]
 ) -> dict[str, str]:
     lines: list[str] = []
     return {"config": "\n".join(lines)}
@@ -0,0 +1,287 @@
+# export/nftables.py
+"""
+Генерация набора правил nftables из FirewallConfig.
+
+Результат - один файл для `nft -f`: таблица пересоздаётся и заполняется
+в одной транзакции, поэтому полупримененного состояния не бывает.
+Правила вида «адрес + порты -> действие» из одной серии сворачиваются
+в verdict map и проверяются одним поиском вместо цепочки правил.
+"""
+
+import ipaddress
+from dataclasses import dataclass, field
+from itertools import groupby
+
+from halter.core.models.firewall import (
+    Chain,
+    FirewallConfig,
+    FirewallRule,
+    IpSetType,
+    RuleAction,
+)
+from halter.core.services.firewall_optimizer import port_runs
+
+NFT_TABLE = "halter"
+
+# Меньше правил в группе - verdict map не создаётся
+VMAP_MIN_RULES = 2
+
+_HOOKS = {
+    Chain.INPUT: "input",
+    Chain.FORWARD: "forward",
+    Chain.OUTPUT: "output",
+}
+
+# Флаги iptables, которые генерирует firewall.py
+_TCP_FLAGS = {
+    "--tcp-flags ALL NONE": "tcp flags & (fin|syn|rst|psh|ack|urg) == 0x0",
+    "! --syn": "tcp flags & (fin|syn|rst|ack) != syn",
+}
+
+# Действия, допустимые в verdict map
+_VMAP_ACTIONS = {RuleAction.ACCEPT, RuleAction.DROP}
+
+
+@dataclass(slots=True, kw_only=True)
+class _VerdictMap:
+    name: str
+    chain: Chain
+    protocol: str
+    port_field: str
+    address_field: str
+    action: RuleAction
+    rules: list[FirewallRule] = field(default_factory=list)
+
+
+def generate_nftables_ruleset(
+    config: FirewallConfig, table: str = NFT_TABLE
+) -> str:
+    """Набор правил nftables для `nft -f` с атомарной заменой таблицы"""
+    chains: dict[Chain, list[str]] = {chain: [] for chain in _HOOKS}
+    maps: list[_VerdictMap] = []
+
+    for action, run in groupby(config.rules, key=lambda rule: rule.action):
+        # Внутри серии с одним действием порядок не важен, поэтому
+        # правило с verdict map встаёт на место первого правила группы
+        groups: dict[tuple[object, ...], _VerdictMap | FirewallRule] = {}
+        for rule in run:
+            if (key := _vmap_key(rule)) is None:
+                groups[("rule", id(rule))] = rule
+                continue
+            vmap = groups.get(key)
+            if not isinstance(vmap, _VerdictMap):
+                chain, protocol, port_field, address_field = key
+                vmap = _VerdictMap(
+                    name="",
+                    chain=chain,
+                    protocol=protocol,
+                    port_field=port_field,
+                    address_field=address_field,
+                    action=action,
+                )
+                groups[key] = vmap
+            vmap.rules.append(rule)
+
+        for item in groups.values():
+            if isinstance(item, FirewallRule):
+                chains[item.chain].append(_rule_statement(item))
+            elif len(item.rules) < VMAP_MIN_RULES:
+                chains[item.chain].extend(
+                    _rule_statement(rule) for rule in item.rules
+                )
+            else:
+                item.name = (
+                    f"{_HOOKS[item.chain]}_{item.protocol}_{len(maps) + 1}"
+                )
+                maps.append(item)
+                chains[item.chain].append(_vmap_statement(item))
+
+    policies = {
+        Chain.INPUT: config.default_policy_input,
+        Chain.FORWARD: config.default_policy_forward,
+        Chain.OUTPUT: config.default_policy_output,
+    }
+
+    lines = [
+        "#!/usr/sbin/nft -f",
+        "# Generated by Halter. Загрузка: nft -f nftables.nft",
+        "# Таблица пересоздаётся целиком в одной транзакции",
+        "",
+        f"table inet {table}",
+        f"delete table inet {table}",
+        "",
+        f"table inet {table} {{",
+    ]
+    for ipset in config.ipsets:
+        lines.extend(_set_block(ipset.name, ipset.set_type, ipset.members))
+    for vmap in maps:
+        lines.extend(_vmap_block(vmap))
+    for chain, hook in _HOOKS.items():
+        lines.extend(
+            [
+                f"\tchain {hook} {{",
+                (
+                    f"\t\ttype filter hook {hook} priority filter; "
+                    f"policy {policies[chain].value.lower()};"
+                ),
+                *(f"\t\t{statement}" for statement in chains[chain]),
+                "\t}",
+                "",
+            ]
+        )
+    lines[-1] = "}"
+    lines.append("")
+    return "\n".join(lines)
+
+
+def _vmap_key(rule: FirewallRule) -> tuple[Chain, str, str, str] | None:
+    """Ключ группы для verdict map или None, если правило не подходит"""
+    if rule.action not in _VMAP_ACTIONS:
+        return None
+    if rule.protocol is None or rule.protocol not in ("tcp", "udp"):
+        return None
+    if any(
+        (
+            rule.interface_in,
+            rule.interface_out,
+            rule.state,
+            rule.icmp_type,
+            rule.tcp_flags,
+            rule.source_set,
+            rule.destination_set,
+            rule.table,
+        )
+    ):
+        return None
+
+    ports = [
+        name
+        for name in ("source_ports", "destination_ports")
+        if getattr(rule, name)
+    ]
+    addresses = [
+        name for name in ("source", "destination") if getattr(rule, name)
+    ]
+    if len(ports) != 1 or len(addresses) != 1:
+        return None
+    if not _is_ipv4(getattr(rule, addresses[0])):
+        return None
+    return (rule.chain, rule.protocol, ports[0], addresses[0])
+
+
+def _is_ipv4(address: str) -> bool:
+    try:
+        return ipaddress.ip_network(address, strict=False).version == 4
+    except ValueError:
+        return False
+
+
+def _nft_ports(ports: list[int]) -> list[str]:
+    """Порты в синтаксисе nft: номера и диапазоны a-b"""
+    return [
+        str(start) if start == end else f"{start}-{end}"
+        for start, end in port_runs(ports)
+    ]
+
+
+def _set_of(items: list[str]) -> str:
+    return items[0] if len(items) == 1 else "{ " + ", ".join(items) + " }"
+
+
+def _addr(address: str) -> str:
+    return "ip6" if ":" in address else "ip"
+
+
+def _rule_statement(rule: FirewallRule) -> str:
+    """Одно правило FirewallRule в синтаксисе nft"""
+    parts: list[str] = []
+
+    if rule.interface_in:
+        parts.append(f'iif "{rule.interface_in}"')
+    if rule.interface_out:
+        parts.append(f'oif "{rule.interface_out}"')
+
+    if rule.state:
+        states = [s.strip().lower() for s in rule.state.split(",")]
+        parts.append(f"ct state {_set_of(states)}")
+
+    protocol = rule.protocol
+    if not protocol and (rule.source_ports or rule.destination_ports):
+        protocol = "tcp"
+    has_ports = bool(rule.source_ports or rule.destination_ports)
+    if protocol == "icmp" and rule.icmp_type:
+        parts.append(f"icmp type {rule.icmp_type}")
+    elif (
+        protocol
+        and protocol != "all"
+        and not has_ports
+        and not (protocol == "tcp" and rule.tcp_flags)
+    ):
+        parts.append(f"meta l4proto {protocol}")
+
+    if rule.tcp_flags:
+        if rule.tcp_flags not in _TCP_FLAGS:
+            raise ValueError(f"Unsupported tcp flags: {rule.tcp_flags}")
+        parts.append(_TCP_FLAGS[rule.tcp_flags])
+
+    if rule.source:
+        parts.append(f"{_addr(rule.source)} saddr {rule.source}")
+    if rule.destination:
+        parts.append(f"{_addr(rule.destination)} daddr {rule.destination}")
+    if rule.source_set:
+        parts.append(f"ip saddr @{rule.source_set}")
+    if rule.destination_set:
+        parts.append(f"ip daddr @{rule.destination_set}")
+
+    if rule.source_ports:
+        parts.append(
+            f"{protocol} sport {_set_of(_nft_ports(rule.source_ports))}"
+        )
+    if rule.destination_ports:
+        parts.append(
+            f"{protocol} dport {_set_of(_nft_ports(rule.destination_ports))}"
+        )
+
+    parts.append(rule.action.value.lower())
+    return " ".join(parts)
+
+
+def _vmap_statement(vmap: _VerdictMap) -> str:
+    address = "saddr" if vmap.address_field == "source" else "daddr"
+    port = "sport" if vmap.port_field == "source_ports" else "dport"
+    return f"ip {address} . {vmap.protocol} {port} vmap @{vmap.name}"
+
+
+def _vmap_block(vmap: _VerdictMap) -> list[str]:
+    verdict = vmap.action.value.lower()
+    elements = list(
+        dict.fromkeys(
+            f"{getattr(rule, vmap.address_field)} . {port} : {verdict}"
+            for rule in vmap.rules
+            for port in _nft_ports(getattr(rule, vmap.port_field))
+        )
+    )
+    interval = any("/" in e or "-" in e.split(" : ")[0] for e in elements)
+    return [
+        f"\tmap {vmap.name} {{",
+        "\t\ttype ipv4_addr . inet_service : verdict",
+        *(["\t\tflags interval"] if interval else []),
+        "\t\telements = {",
+        ",\n".join(f"\t\t\t{element}" for element in elements),
+        "\t\t}",
+        "\t}",
+        "",
+    ]
+
+
+def _set_block(
+    name: str, set_type: IpSetType, members: list[str]
+) -> list[str]:
+    return [
+        f"\tset {name} {{",
+        "\t\ttype ipv4_addr",
+        *(["\t\tflags interval"] if set_type == IpSetType.HASH_NET else []),
+        *([f"\t\telements = {{ {', '.join(members)} }}"] if members else []),
+        "\t}",
+        "",
+    ]
@@ -0,0 +1,173 @@
+# export/parallel.py
+"""
+Параллельный экспорт конфигураций устройств через пул процессов
+"""
+
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from rich import print
+
+from halter.core.models.device import Device
+from halter.core.models.firewall import IptablesFormat
+from halter.core.models.project import Project
+from halter.core.services.connectivity import (
+    ConnectivityIndex,
+    build_connectivity_index,
+)
+from halter.core.services.export.firewall import (
+    FIREWALL_BACKENDS,
+    generate_firewall_config_for_device,
+    render_firewall,
+)
+from halter.core.services.export.network_config import (
+    export_interface_configs_of_device,
+)
+
+
+@dataclass(slots=True, kw_only=True)
+class DeviceExportResult:
+    device: str
+    written: list[Path] = field(default_factory=list)
+    error: str | None = None
+
+
+# Состояние процесса-исполнителя: проект передаётся один раз на процесс,
+# а не на каждое устройство
+_worker_project: Project | None = None
+_worker_index: ConnectivityIndex | None = None
+_worker_project_dir: Path | None = None
+_worker_ipset: bool = False
+_worker_iptables_format: IptablesFormat = IptablesFormat.SCRIPT
+
+
+def _init_worker(
+    project: Project,
+    project_dir: Path,
+    ipset: bool,
+    iptables_format: IptablesFormat,
+) -> None:
+    global _worker_project, _worker_index, _worker_project_dir
+    global _worker_ipset, _worker_iptables_format
+    _worker_project = project
+    _worker_index = build_connectivity_index(project.devices, project.software)
+    _worker_project_dir = project_dir
+    _worker_ipset = ipset
+    _worker_iptables_format = iptables_format
+
+
+def _export_device(position: int) -> DeviceExportResult:
+    """Экспорт интерфейсов и фаервола одного устройства в процессе пула"""
+    assert _worker_project is not None and _worker_project_dir is not None
+    project = _worker_project
+    device = project.devices[position]
+    result = DeviceExportResult(device=device.name)
+    device_dir = _worker_project_dir / device.name
+
+    try:
+        device_dir.mkdir(parents=True, exist_ok=True)
+        files = render_device_configs(
+            device,
+            project,
+            _worker_index,
+            _worker_ipset,
+            _worker_iptables_format,
+        )
+        for filename, content in files.items():
+            (device_dir / filename).write_text(content, encoding="utf-8")
+            result.written.append(device_dir / filename)
+    # Ошибки данных и записи - результат устройства; прочие (ошибки в
+    # коде) выходят из пула исключением, как при обычном экспорте
+    except (OSError, ValueError) as e:
+        result.error = str(e)
+
+    return result
+
+
+def render_device_configs(
+    device: Device,
+    project: Project,
+    index: ConnectivityIndex | None,
+    ipset: bool = False,
+    iptables_format: IptablesFormat = IptablesFormat.SCRIPT,
+) -> dict[str, str]:
+    """Все файлы устройства: интерфейсы и фаервол, {имя файла: содержимое}"""
+    files = export_interface_configs_of_device(device, project.networks)
+    if device.firewall_id in FIREWALL_BACKENDS:
+        fw_config = generate_firewall_config_for_device(
+            device, project.software, project.devices, index
+        )
+        files.update(
+            render_firewall(device, fw_config, ipset, iptables_format)
+        )
+    return files
+
+
+def iter_export_configs_parallel(
+    project: Project,
+    output_dir: Path,
+    jobs: int,
+    ipset: bool = False,
+    iptables_format: IptablesFormat = IptablesFormat.SCRIPT,
+    positions: Iterable[int] | None = None,
+) -> Iterator[DeviceExportResult]:
+    """
+    Экспортирует интерфейсы и фаервол всех устройств в jobs процессов.
+    Результаты отдаются по мере готовности устройств.
+    positions - позиции устройств в project.devices, по умолчанию все.
+
+    Обработчики из EXPORT_HANDLERS должны регистрироваться при импорте
+    модуля, иначе исполнители пула их не увидят.
+    """
+    project_dir = output_dir / project.name
+    project_dir.mkdir(parents=True, exist_ok=True)
+
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(project, project_dir, ipset, iptables_format),
+    ) as pool:
+        if positions is None:
+            positions = range(len(project.devices))
+        futures = [pool.submit(_export_device, pos) for pos in positions]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def export_configs_parallel(
+    project: Project,
+    output_dir: Path,
+    jobs: int,
+    ipset: bool = False,
+    iptables_format: IptablesFormat = IptablesFormat.SCRIPT,
+) -> list[DeviceExportResult]:
+    """
+    Параллельный экспорт с выводом прогресса и сводкой ошибок в конце.
+    Файлы совпадают побайтно с последовательным экспортом.
+    """
+    total = len(project.devices)
+    results: list[DeviceExportResult] = []
+
+    for done, result in enumerate(
+        iter_export_configs_parallel(
+            project, output_dir, jobs, ipset, iptables_format
+        ),
+        start=1,
+    ):
+        results.append(result)
+        if result.error is None:
+            print(
+                f"[green][{done}/{total}] {result.device}: "
+                f"{len(result.written)} file(s) saved[/green]"
+            )
+        else:
+            print(f"[red][{done}/{total}] {result.device}: failed[/red]")
+
+    if errors := [r for r in results if r.error is not None]:
+        print(f"[red]Export finished with {len(errors)} error(s):[/red]")
+        for r in errors:
+            print(f"[red]  {r.device}:[/red] {r.error}")
+
+    return results
@@ -0,0 +1,105 @@
+# src/halter/core/services/firewall_diff.py
+"""
+Разница правил фаервола между двумя ревизиями проекта.
+
+Индекс связности строится один раз на ревизию. Правила устройства
+пересчитываются, только если его входные данные
+(ConnectivityIndex.firewall_inputs) в ревизиях различаются. Сравниваются
+правила до оптимизации: добавленный сосед - это добавленные правила,
+а не перестроенные группы портов и адресов.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from halter.core.models.collection import name_map
+from halter.core.models.device import Device
+from halter.core.models.firewall import FirewallRule
+from halter.core.models.project import Project
+from halter.core.services.connectivity import (
+    ConnectivityIndex,
+    build_connectivity_index,
+)
+from halter.core.services.export.firewall import (
+    FIREWALL_BACKENDS,
+    generate_firewall_config_for_device,
+)
+from halter.core.services.firewall_optimizer import rule_key
+
+
+@dataclass(slots=True, kw_only=True)
+class DeviceFirewallDiff:
+    device: str
+    # firewall_id в ревизии или None, если устройства там нет
+    old_backend: str | None
+    new_backend: str | None
+    added: list[FirewallRule] = field(default_factory=list)
+    removed: list[FirewallRule] = field(default_factory=list)
+
+
+@dataclass(slots=True, kw_only=True)
+class FirewallDiff:
+    devices: list[DeviceFirewallDiff] = field(default_factory=list)
+    # Устройства, правила которых пришлось сгенерировать заново
+    recomputed: int = 0
+    unchanged: int = 0
+
+
+def diff_firewalls(old: Project, new: Project) -> FirewallDiff:
+    """Изменения правил по устройствам в порядке new, затем удалённые"""
+    old_index = build_connectivity_index(old.devices, old.software)
+    new_index = build_connectivity_index(new.devices, new.software)
+    old_devices = name_map(old.devices)
+    new_devices = name_map(new.devices)
+
+    result = FirewallDiff()
+    for name in dict.fromkeys([*new_devices, *old_devices]):
+        old_device = old_devices.get(name)
+        new_device = new_devices.get(name)
+        if (
+            old_device is not None
+            and new_device is not None
+            and old_index.firewall_inputs(old_device)
+            == new_index.firewall_inputs(new_device)
+        ):
+            result.unchanged += 1
+            continue
+
+        result.recomputed += 1
+        old_rules = _rules(old_device, old, old_index)
+        new_rules = _rules(new_device, new, new_index)
+        diff = DeviceFirewallDiff(
+            device=name,
+            old_backend=_backend(old_device),
+            new_backend=_backend(new_device),
+            added=[r for k, r in new_rules.items() if k not in old_rules],
+            removed=[r for k, r in old_rules.items() if k not in new_rules],
+        )
+        if diff.added or diff.removed or diff.old_backend != diff.new_backend:
+            result.devices.append(diff)
+        else:
+            result.unchanged += 1
+
+    return result
+
+
+def _backend(device: Device | None) -> str | None:
+    if device is None or device.firewall_id not in FIREWALL_BACKENDS:
+        return None
+    return device.firewall_id
+
+
+def _rules(
+    device: Device | None, project: Project, index: ConnectivityIndex
+) -> dict[tuple[Any, ...], FirewallRule]:
+    """Правила устройства без повторов; пусто, если фаервола нет"""
+    if _backend(device) is None:
+        return {}
+    assert device is not None
+    config = generate_firewall_config_for_device(
+        device, project.software, project.devices, index, optimize=False
+    )
+    rules: dict[tuple[Any, ...], FirewallRule] = {}
+    for rule in config.rules:
+        rules.setdefault(rule_key(rule), rule)
+    return rules
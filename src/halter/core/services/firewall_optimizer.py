@@ -0,0 +1,268 @@
+# src/halter/core/services/firewall_optimizer.py
+"""
+Оптимизация правил FirewallConfig перед генерацией скрипта.
+
+- повторы правила удаляются: срабатывает всё равно первое;
+- в серии подряд идущих правил с одним действием правила, которые
+  отличаются только портами, объединяются в одно;
+- адреса правил с одинаковыми портами сворачиваются в минимальный
+  набор CIDR без расширения разрешённого множества;
+- порты заново делятся на группы multiport, соседние номера - в a:b.
+
+Внутри серии с одним действием порядок правил не влияет на итог,
+поэтому перестановки безопасны. Сами серии остаются на своих местах.
+"""
+
+import ipaddress
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field, fields, replace
+from itertools import groupby
+from typing import Any
+
+from halter.core.models.firewall import (
+    FirewallConfig,
+    FirewallRule,
+    IpSet,
+    IpSetType,
+)
+
+# Лимит элементов в -m multiport; диапазон a:b занимает два
+MULTIPORT_LIMIT = 15
+# Меньше адресов в группе - набор не создаётся, правила остаются как есть
+IPSET_MIN_MEMBERS = 4
+
+_PORT_FIELDS = ("source_ports", "destination_ports")
+_ADDRESS_FIELDS = ("source", "destination")
+_SET_FIELDS = {"source": "source_set", "destination": "destination_set"}
+
+
+def port_runs(ports: Iterable[int]) -> list[tuple[int, int]]:
+    """Непрерывные диапазоны номеров портов: [(начало, конец), ...]"""
+    runs: list[tuple[int, int]] = []
+    for port in sorted(set(ports)):
+        if runs and port == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], port)
+        else:
+            runs.append((port, port))
+    return runs
+
+
+def port_spec(ports: Iterable[int]) -> list[str]:
+    """Элементы для --dports/--sports: номера и диапазоны a:b"""
+    return [
+        str(start) if start == end else f"{start}:{end}"
+        for start, end in port_runs(ports)
+    ]
+
+
+def chunk_ports(
+    ports: Iterable[int], limit: int = MULTIPORT_LIMIT
+) -> list[list[int]]:
+    """Делит порты на группы, каждая из которых умещается в один multiport"""
+    chunks: list[list[int]] = []
+    current: list[int] = []
+    used = 0
+    for start, end in port_runs(ports):
+        cost = 1 if start == end else 2
+        if used + cost > limit:
+            chunks.append(current)
+            current, used = [], 0
+        current.extend(range(start, end + 1))
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+@dataclass(slots=True)
+class _Group:
+    """Правила серии, которые сливаются в одно с общими портами и адресами"""
+
+    rule: FirewallRule
+    port_field: str | None
+    address_field: str | None
+    ports: set[int] = field(default_factory=set)
+    addresses: list[str] = field(default_factory=list)
+
+
+def optimize_firewall_config(config: FirewallConfig) -> FirewallConfig:
+    return replace(config, rules=optimize_rules(config.rules))
+
+
+def optimize_rules(rules: Iterable[FirewallRule]) -> list[FirewallRule]:
+    result: list[FirewallRule] = []
+    for _, run in groupby(_unique(rules), key=lambda rule: rule.action):
+        result.extend(_optimize_run(list(run)))
+    return result
+
+
+def _unique(rules: Iterable[FirewallRule]) -> Iterator[FirewallRule]:
+    seen: set[tuple[Any, ...]] = set()
+    for rule in rules:
+        if (key := rule_key(rule)) not in seen:
+            seen.add(key)
+            yield rule
+
+
+def _optimize_run(rules: list[FirewallRule]) -> list[FirewallRule]:
+    """Серия правил с одним действием"""
+    # Шаг 1: объединяем порты правил, отличающихся только портами
+    by_ports: dict[tuple[Any, ...], _Group] = {}
+    for rule in rules:
+        port_field = _single_field(rule, _PORT_FIELDS)
+        skip = {port_field} if port_field else set()
+        key = (port_field, rule_key(rule, skip))
+        group = by_ports.setdefault(
+            key, _Group(rule=rule, port_field=port_field, address_field=None)
+        )
+        if port_field:
+            group.ports.update(getattr(rule, port_field))
+
+    # Шаг 2: собираем адреса правил с одинаковым набором портов
+    by_address: dict[tuple[Any, ...], _Group] = {}
+    for group in by_ports.values():
+        address_field = _single_field(group.rule, _ADDRESS_FIELDS)
+        skip = {f for f in (group.port_field, address_field) if f}
+        address_key = (
+            group.port_field,
+            tuple(sorted(group.ports)),
+            address_field,
+            rule_key(group.rule, skip),
+        )
+        merged = by_address.setdefault(
+            address_key,
+            _Group(
+                rule=group.rule,
+                port_field=group.port_field,
+                address_field=address_field,
+                ports=group.ports,
+            ),
+        )
+        if address_field:
+            merged.addresses.append(getattr(group.rule, address_field))
+
+    result: list[FirewallRule] = []
+    for group in by_address.values():
+        result.extend(_expand(group))
+    return result
+
+
+def collect_ipsets(
+    config: FirewallConfig, min_members: int = IPSET_MIN_MEMBERS
+) -> FirewallConfig:
+    """
+    Правила, которые отличаются только адресом, заменяются одним правилом
+    с набором адресов (-m set). Число правил перестаёт зависеть от числа
+    соседей. Одинаковые наборы адресов переиспользуются.
+    """
+    sets: dict[tuple[IpSetType, tuple[str, ...]], IpSet] = {}
+    rules: list[FirewallRule] = []
+
+    for _, run in groupby(config.rules, key=lambda rule: rule.action):
+        groups: dict[tuple[Any, ...], list[FirewallRule]] = {}
+        for rule in run:
+            address_field = _single_field(rule, _ADDRESS_FIELDS)
+            if (
+                address_field is None
+                or rule.source_set
+                or rule.destination_set
+            ):
+                groups[("rule", id(rule))] = [rule]
+                continue
+            key = (address_field, rule_key(rule, {address_field}))
+            groups.setdefault(key, []).append(rule)
+
+        for key, members in groups.items():
+            if key[0] == "rule" or len(members) < min_members:
+                rules.extend(members)
+                continue
+            address_field = key[0]
+            addresses = tuple(
+                dict.fromkeys(getattr(rule, address_field) for rule in members)
+            )
+            set_type = (
+                IpSetType.HASH_NET
+                if any("/" in address for address in addresses)
+                else IpSetType.HASH_IP
+            )
+            ipset = sets.get((set_type, addresses))
+            if ipset is None:
+                ipset = IpSet(
+                    name=f"halter_{len(config.ipsets) + len(sets) + 1}",
+                    set_type=set_type,
+                    members=list(addresses),
+                )
+                sets[(set_type, addresses)] = ipset
+            changes: dict[str, Any] = {
+                address_field: None,
+                _SET_FIELDS[address_field]: ipset.name,
+            }
+            rules.append(replace(members[0], **changes))
+
+    return replace(
+        config, rules=rules, ipsets=[*config.ipsets, *sets.values()]
+    )
+
+
+def _expand(group: _Group) -> list[FirewallRule]:
+    """Правила группы: по одному на каждый CIDR и каждую группу портов"""
+    if group.address_field is None and group.port_field is None:
+        return [group.rule]
+
+    addresses: list[str | None] = [None]
+    if group.address_field:
+        addresses = list(_collapse(group.addresses))
+    port_chunks: list[list[int] | None] = [None]
+    if group.port_field:
+        port_chunks = list(chunk_ports(group.ports))
+
+    rules = []
+    for address in addresses:
+        for chunk in port_chunks:
+            changes: dict[str, Any] = {}
+            if group.address_field:
+                changes[group.address_field] = address
+            if group.port_field:
+                changes[group.port_field] = chunk
+            rules.append(replace(group.rule, **changes))
+    return rules
+
+
+def _collapse(addresses: list[str]) -> list[str]:
+    """Адреса и сети в минимальном наборе CIDR, как есть - если не IP"""
+    unique = list(dict.fromkeys(addresses))
+    try:
+        networks = [ipaddress.ip_network(a, strict=False) for a in unique]
+        collapsed = list(
+            ipaddress.collapse_addresses(networks)  # type: ignore[type-var]
+        )
+    except (ValueError, TypeError):
+        # Имена хостов или смесь IPv4/IPv6 - только убираем повторы
+        return unique
+    return [
+        str(net.network_address)
+        if net.prefixlen == net.max_prefixlen
+        else str(net)
+        for net in collapsed
+    ]
+
+
+def _single_field(rule: FirewallRule, names: tuple[str, str]) -> str | None:
+    """Имя единственного заполненного поля из пары или None"""
+    filled = [name for name in names if getattr(rule, name)]
+    return filled[0] if len(filled) == 1 else None
+
+
+def rule_key(
+    rule: FirewallRule, skip: set[str] | None = None
+) -> tuple[Any, ...]:
+    """Значения полей правила для сравнения; порядок портов не важен"""
+    key: list[Any] = []
+    for f in fields(rule):
+        if skip and f.name in skip:
+            continue
+        value = getattr(rule, f.name)
+        if isinstance(value, list):
+            value = tuple(sorted(set(value)))
+        key.append(value)
+    return tuple(key)
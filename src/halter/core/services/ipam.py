@@ -0,0 +1,229 @@
+# src/halter/core/services/ipam.py
+"""
+Учёт и выделение IPv4-адресов в сетях проекта.
+
+Занятость сети хранится битовой картой в int: бит i - адрес
+network_address + i. Поиск свободного адреса, проверка диапазона на
+конфликты и резервирование - операции над целым числом, их цена зависит
+от числа машинных слов в карте, а не от перебора net.hosts().
+
+Адреса делятся на две карты:
+- assigned - адреса интерфейсов устройств; повтор здесь - конфликт;
+- reserved - адрес сети, broadcast, шлюз и Network.reserved.
+"""
+
+import ipaddress
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+from halter.core.models.address import AddressingType
+from halter.core.models.network import Network
+from halter.core.models.project import Project
+from halter.core.validation.address_validators import parse_range
+
+
+@dataclass(slots=True, kw_only=True)
+class AddressConflict:
+    network: str
+    address: str
+    owners: list[str]
+
+
+@dataclass(slots=True)
+class AddressPool:
+    network: ipaddress.IPv4Network
+    assigned: int = 0
+    reserved: int = 0
+    # Смещение адреса -> владелец, только для assigned
+    owners: dict[int, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_network(cls, network: Network) -> "AddressPool":
+        """Пул сети проекта с учётом шлюза и Network.reserved"""
+        pool = cls(ipaddress.IPv4Network(network.address, strict=False))
+        if pool.network.num_addresses > 2:
+            pool.reserved |= 1 | 1 << (pool.size - 1)
+        if network.gateway and pool.contains(network.gateway):
+            pool.reserved |= 1 << pool.offset(network.gateway)
+        for item in network.reserved:
+            pool.reserve(*parse_range(item))
+        return pool
+
+    @property
+    def size(self) -> int:
+        return self.network.num_addresses
+
+    @property
+    def used(self) -> int:
+        return self.assigned | self.reserved
+
+    def contains(self, address: str) -> bool:
+        try:
+            return ipaddress.IPv4Address(address) in self.network
+        except ValueError:
+            return False
+
+    def offset(self, address: str | ipaddress.IPv4Address) -> int:
+        ip = ipaddress.IPv4Address(address)
+        if ip not in self.network:
+            raise ValueError(f"{ip} is outside {self.network}.")
+        return int(ip) - int(self.network.network_address)
+
+    def address(self, offset: int) -> ipaddress.IPv4Address:
+        return self.network.network_address + offset
+
+    def free_count(self) -> int:
+        return self.size - self.used.bit_count()
+
+    def next_free(self) -> ipaddress.IPv4Address | None:
+        free = ~self.used & ((1 << self.size) - 1)
+        if not free:
+            return None
+        return self.address((free & -free).bit_length() - 1)
+
+    def allocate(
+        self, count: int = 1, owner: str = ""
+    ) -> list[ipaddress.IPv4Address]:
+        """Первые count свободных адресов; все или ни одного"""
+        if count < 1:
+            raise ValueError("Count must be positive.")
+        if (free_count := self.free_count()) < count:
+            raise ValueError(
+                f"{self.network} has {free_count} free address(es), "
+                f"{count} requested."
+            )
+        free = ~self.used & ((1 << self.size) - 1)
+        result = []
+        for _ in range(count):
+            low = free & -free
+            free ^= low
+            offset = low.bit_length() - 1
+            self.assigned |= low
+            self.owners[offset] = owner
+            result.append(self.address(offset))
+        return result
+
+    def conflicts(
+        self,
+        first: str | ipaddress.IPv4Address,
+        last: str | ipaddress.IPv4Address,
+    ) -> list[ipaddress.IPv4Address]:
+        """Занятые адреса в диапазоне first..last включительно"""
+        return [
+            self.address(offset)
+            for offset in _bits(self.used & self._range_mask(first, last))
+        ]
+
+    def reserve(
+        self,
+        first: str | ipaddress.IPv4Address,
+        last: str | ipaddress.IPv4Address,
+    ) -> None:
+        """
+        Резервирует диапазон. Адреса интерфейсов в нём - конфликт,
+        уже зарезервированные адреса допустимы.
+        """
+        mask = self._range_mask(first, last)
+        if taken := self.assigned & mask:
+            addresses = ", ".join(
+                f"{self.address(o)} ({self.owners.get(o, '?')})"
+                for o in _bits(taken)
+            )
+            raise ValueError(f"Range {first}-{last} overlaps {addresses}.")
+        self.reserved |= mask
+
+    def assign(self, address: str, owner: str) -> str | None:
+        """Занимает адрес интерфейса; при конфликте - прежний владелец"""
+        offset = self.offset(address)
+        bit = 1 << offset
+        if self.assigned & bit:
+            return self.owners.get(offset, "")
+        self.assigned |= bit
+        self.owners[offset] = owner
+        return None
+
+    def _range_mask(
+        self,
+        first: str | ipaddress.IPv4Address,
+        last: str | ipaddress.IPv4Address,
+    ) -> int:
+        start, end = self.offset(first), self.offset(last)
+        if end < start:
+            raise ValueError(f"Range {first}-{last} is empty.")
+        return ((1 << (end - start + 1)) - 1) << start
+
+
+@dataclass(slots=True)
+class Ipam:
+    pools: dict[str, AddressPool] = field(default_factory=dict)
+    conflicts: list[AddressConflict] = field(default_factory=list)
+
+    def pool(self, network_name: str) -> AddressPool:
+        if (pool := self.pools.get(network_name)) is None:
+            raise ValueError(
+                f"Network '{network_name}' has no IPv4 address pool."
+            )
+        return pool
+
+
+def build_ipam(project: Project) -> Ipam:
+    """
+    Пулы всех IPv4-сетей проекта с занятыми адресами интерфейсов.
+    Адрес, занятый несколькими интерфейсами, попадает в conflicts.
+    Сети IPv6 пулов не получают.
+    """
+    ipam = Ipam()
+    for network in project.networks:
+        if network.address_type != AddressingType.IP_NETWORK:
+            continue
+        if network.name in ipam.pools or not network.address:
+            continue
+        if ipaddress.ip_network(network.address, strict=False).version != 4:
+            continue
+        ipam.pools[network.name] = AddressPool.from_network(network)
+
+    conflicts: dict[str, AddressConflict] = {}
+    for device in project.devices:
+        for iface in device.interfaces:
+            pool = ipam.pools.get(iface.network_id)
+            address = iface.address.split("/")[0].strip()
+            if pool is None or not pool.contains(address):
+                continue
+            owner = f"{device.name}/{iface.name}"
+            if (previous := pool.assign(address, owner)) is not None:
+                conflict = conflicts.setdefault(
+                    f"{iface.network_id}/{address}",
+                    AddressConflict(
+                        network=iface.network_id,
+                        address=address,
+                        owners=[previous],
+                    ),
+                )
+                conflict.owners.append(owner)
+    ipam.conflicts = list(conflicts.values())
+    return ipam
+
+
+def format_range(
+    first: str | ipaddress.IPv4Address, last: str | ipaddress.IPv4Address
+) -> str:
+    return str(first) if str(first) == str(last) else f"{first}-{last}"
+
+
+def format_ranges(addresses: list[ipaddress.IPv4Address]) -> list[str]:
+    """Адреса в записи Network.reserved, соседние - одним диапазоном"""
+    ranges: list[list[ipaddress.IPv4Address]] = []
+    for address in sorted(set(addresses)):
+        if ranges and int(address) == int(ranges[-1][1]) + 1:
+            ranges[-1][1] = address
+        else:
+            ranges.append([address, address])
+    return [format_range(first, last) for first, last in ranges]
+
+
+def _bits(value: int) -> Iterator[int]:
+    """Номера установленных битов по возрастанию"""
+    while value:
+        low = value & -value
+        yield low.bit_length() - 1
+        value ^= low
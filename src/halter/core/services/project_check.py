@@ -0,0 +1,119 @@
+# src/halter/core/services/project_check.py
+"""
+Проверка адресации проекта: повторы адресов интерфейсов и пересечения
+сетей.
+
+- адреса интерфейсов собираются в словарь адрес -> интерфейсы, повтор
+  виден за один проход;
+- сети сортируются по (начало, -конец) и проходятся со стеком открытых
+  сетей. Две CIDR-сети либо не пересекаются, либо одна вложена в другую,
+  поэтому все сети в стеке содержат текущую. Итог - O(n log n) плюс
+  число найденных пересечений вместо попарного сравнения.
+"""
+
+import ipaddress
+from dataclasses import dataclass, field
+
+from halter.core.models.address import AddressingType
+from halter.core.models.project import Project
+
+
+@dataclass(slots=True, kw_only=True)
+class DuplicateAddress:
+    address: str
+    # "устройство/интерфейс" в порядке проекта
+    owners: list[str]
+
+
+@dataclass(slots=True, kw_only=True)
+class NetworkOverlap:
+    # outer содержит inner или совпадает с ней
+    outer: str
+    outer_address: str
+    inner: str
+    inner_address: str
+
+    @property
+    def identical(self) -> bool:
+        return self.outer_address == self.inner_address
+
+
+@dataclass(slots=True, kw_only=True)
+class CheckResult:
+    duplicates: list[DuplicateAddress] = field(default_factory=list)
+    overlaps: list[NetworkOverlap] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.duplicates and not self.overlaps
+
+
+def check_project(project: Project) -> CheckResult:
+    return CheckResult(
+        duplicates=find_duplicate_addresses(project),
+        overlaps=find_network_overlaps(project),
+    )
+
+
+def find_duplicate_addresses(project: Project) -> list[DuplicateAddress]:
+    """Адреса, назначенные нескольким интерфейсам"""
+    owners: dict[str, list[str]] = {}
+    for device in project.devices:
+        for iface in device.interfaces:
+            if iface.address_type != AddressingType.IP_ADDRESS:
+                continue
+            try:
+                ip = ipaddress.ip_address(iface.address)
+            except ValueError:
+                continue
+            owners.setdefault(str(ip), []).append(
+                f"{device.name}/{iface.name}"
+            )
+    return [
+        DuplicateAddress(address=address, owners=names)
+        for address, names in owners.items()
+        if len(names) > 1
+    ]
+
+
+def find_network_overlaps(project: Project) -> list[NetworkOverlap]:
+    """Пары сетей, одна из которых содержит другую"""
+    intervals: list[tuple[int, int, int, int, str, str]] = []
+    for network in project.networks:
+        if network.address_type != AddressingType.IP_NETWORK:
+            continue
+        try:
+            net = ipaddress.ip_network(network.address, strict=False)
+        except ValueError:
+            continue
+        intervals.append(
+            (
+                net.version,
+                int(net.network_address),
+                -int(net.broadcast_address),
+                len(intervals),
+                network.name,
+                str(net),
+            )
+        )
+    # Внутри версии: раньше начало, при равном начале - шире сеть,
+    # при полном совпадении - порядок проекта
+    intervals.sort()
+
+    overlaps: list[NetworkOverlap] = []
+    stack: list[tuple[int, int, str, str]] = []
+    for version, start, neg_end, _, name, address in intervals:
+        end = -neg_end
+        while stack and (stack[-1][0] != version or stack[-1][1] < start):
+            stack.pop()
+        overlaps.extend(
+            NetworkOverlap(
+                outer=outer_name,
+                outer_address=outer_address,
+                inner=name,
+                inner_address=address,
+            )
+            for _, _, outer_name, outer_address in stack
+        )
+        stack.append((version, end, name, address))
+    return overlaps
@@ -0,0 +1,143 @@
+# src/halter/core/services/reachability.py
+"""
+Граф достижимости сетей проекта.
+
+Вершины - сети, рёбра - маршруты интерфейсов: интерфейс в сети N
+с маршрутом R даёт ребро N -> R (из N сеть R доступна через шлюз).
+Маршрут направленный, как он записан в проекте.
+
+Граф строится один раз. Транзитивное замыкание считается обходом в
+ширину при первом запросе для сети и кэшируется, как и объединение
+замыканий по сетям устройства, поэтому повторные вопросы «может ли A
+достучаться до B на порту P» не перебирают проект.
+
+Достижимость здесь шире соседства в правилах фаервола (см.
+ConnectivityIndex.peers_of): она идёт по маршрутам любых устройств
+сети и через любое число сетей, а зоны не учитывает. Фаервол открывает
+доступ только соседу с общей зоной, у которого сеть устройства есть
+среди сетей его интерфейсов или их маршрутов (один шаг). Поэтому путь
+по can_reach ещё не значит, что правила фаервола его пропустят.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+
+from halter.core.models.collection import name_map
+from halter.core.models.project import Project
+
+
+@dataclass(slots=True, kw_only=True)
+class PathHop:
+    network: str
+    # Интерфейс "устройство/интерфейс", маршрут которого ведёт в сеть;
+    # None для первой сети пути
+    via: str | None = None
+
+
+@dataclass(slots=True)
+class ReachabilityGraph:
+    # Сеть -> {сеть назначения: интерфейс, объявивший маршрут}
+    routes: dict[str, dict[str, str]] = field(default_factory=dict)
+    # Устройство -> сети его интерфейсов в порядке интерфейсов
+    device_networks: dict[str, tuple[str, ...]] = field(default_factory=dict)
+    device_ports: dict[str, frozenset[int]] = field(default_factory=dict)
+    _closure: dict[str, frozenset[str]] = field(default_factory=dict)
+    _device_closure: dict[str, frozenset[str]] = field(default_factory=dict)
+
+    def reachable_networks(self, network: str) -> frozenset[str]:
+        """Сети, доступные из network, включая её саму"""
+        if (cached := self._closure.get(network)) is not None:
+            return cached
+        seen = {network}
+        queue = deque([network])
+        while queue:
+            for target in self.routes.get(queue.popleft(), {}):
+                if target not in seen:
+                    seen.add(target)
+                    queue.append(target)
+        result = self._closure[network] = frozenset(seen)
+        return result
+
+    def device_reach(self, device: str) -> frozenset[str]:
+        """Сети, доступные устройству через любой его интерфейс"""
+        if (cached := self._device_closure.get(device)) is not None:
+            return cached
+        reach: set[str] = set()
+        for network in self._networks_of(device):
+            reach |= self.reachable_networks(network)
+        result = self._device_closure[device] = frozenset(reach)
+        return result
+
+    def common_ports(self, a: str, b: str) -> frozenset[int]:
+        return self.device_ports.get(a, frozenset()) & self.device_ports.get(
+            b, frozenset()
+        )
+
+    def can_reach(self, a: str, b: str, port: int | None = None) -> bool:
+        """
+        Устройство a может отправить пакет устройству b. С port - ещё и
+        на общем порту ПО обоих устройств.
+        """
+        if port is not None and port not in self.common_ports(a, b):
+            return False
+        return not self.device_reach(a).isdisjoint(self._networks_of(b))
+
+    def path(self, a: str, b: str) -> list[PathHop] | None:
+        """Кратчайший путь по сетям от a до b или None"""
+        targets = set(self._networks_of(b))
+        # Сеть -> (предыдущая сеть, маршрут) или None для начала пути
+        came_from: dict[str, tuple[str, str] | None] = {}
+        queue: deque[str] = deque()
+        for network in self._networks_of(a):
+            came_from.setdefault(network, None)
+            queue.append(network)
+        while queue:
+            network = queue.popleft()
+            if network in targets:
+                return _unwind(network, came_from)
+            for target, via in self.routes.get(network, {}).items():
+                if target not in came_from:
+                    came_from[target] = (network, via)
+                    queue.append(target)
+        return None
+
+    def _networks_of(self, device: str) -> tuple[str, ...]:
+        if (networks := self.device_networks.get(device)) is None:
+            raise ValueError(f"Device '{device}' not found.")
+        return networks
+
+
+def _unwind(
+    network: str, came_from: dict[str, tuple[str, str] | None]
+) -> list[PathHop]:
+    hops = []
+    while (step := came_from[network]) is not None:
+        previous, via = step
+        hops.append(PathHop(network=network, via=via))
+        network = previous
+    hops.append(PathHop(network=network))
+    hops.reverse()
+    return hops
+
+
+def build_reachability_graph(project: Project) -> ReachabilityGraph:
+    graph = ReachabilityGraph()
+    software_map = name_map(project.software)
+    for device in project.devices:
+        if device.name in graph.device_networks:
+            continue
+        graph.device_networks[device.name] = tuple(
+            dict.fromkeys(iface.network_id for iface in device.interfaces)
+        )
+        graph.device_ports[device.name] = frozenset(
+            port.index
+            for name in device.software_used
+            if (software := software_map.get(name))
+            for port in software.ports
+        )
+        for iface in device.interfaces:
+            edges = graph.routes.setdefault(iface.network_id, {})
+            for route in iface.routes:
+                if route != iface.network_id:
+                    edges.setdefault(route, f"{device.name}/{iface.name}")
+    return graph
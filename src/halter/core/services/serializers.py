@@ -0,0 +1,550 @@
+# src/halter/core/services/serializers.py
+"""
+Сериализаторы моделей, собранные один раз на класс.
+
+По аннотациям полей dataclass один раз строятся:
+- encoder: объект -> dict/list/скаляры, замена рефлексивного to_dict;
+- decoder: dict из YAML -> объект, строки превращаются в StrEnum;
+- YAML-писатель: объект -> текст, побайтно равный
+  yaml.dump(encode(obj), Dumper=CSafeDumper, sort_keys=False,
+  allow_unicode=True).
+
+Поле с metadata={"omit_empty": True} не выводится, пока его список
+пуст: новое необязательное поле не меняет файлы, где оно не заполнено.
+
+Писатель не строит узлы PyYAML и не вызывает representer и resolver на
+каждое значение: вид строки в YAML вычисляется один раз на каждое
+различное значение. Значение, которое может перенестись по ширине
+строки или требует многострочной записи, отдаётся yaml.dump вместе со
+своим элементом верхнего уровня - вывод от этого не меняется.
+"""
+
+import re
+import types
+from collections.abc import Callable, Iterator
+from dataclasses import MISSING, fields, is_dataclass
+from enum import Enum
+from typing import (
+    Any,
+    TextIO,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+import yaml
+from yaml import CSafeDumper as Dumper
+from yaml.nodes import ScalarNode
+from yaml.resolver import Resolver
+
+STR_TAG = "tag:yaml.org,2002:str"
+# Ключ metadata поля: пустой список не выводится
+OMIT_EMPTY = "omit_empty"
+# Ширина строки по умолчанию у yaml.dump
+BEST_WIDTH = 80
+
+# Строки, которые libyaml всегда пишет как есть, если resolver не
+# примет их за число, bool или null
+_PLAIN = re.compile(r"\w(?:[\w ./+-]*[\w./+-])?")
+# Все разрывы строк str.splitlines(): libyaml переносит строку не только
+# по "\n", поэтому такие значения всегда пишет yaml.dump
+_LINE_BREAK = re.compile("[\n\r\v\f\x1c-\x1e\x85\u2028\u2029]")
+
+_Encoder = Callable[[Any], Any]
+_Decoder = Callable[[dict[str, Any]], Any]
+_Writer = Callable[[Any, list[str], str, str, "ScalarCache"], None]
+
+
+# Представитель для перечислений моделей (StrEnum): выводим просто значение.
+# Регистрация на Enum покрывает все перечисления пакета models, в том
+# числе Chain и RuleAction правил межсетевого экрана.
+def _enum_representer(dumper: Any, obj: Enum) -> Any:
+    return dumper.represent_data(obj.value)
+
+
+yaml.add_multi_representer(Enum, _enum_representer, Dumper=Dumper)
+
+
+class _FallbackError(Exception):
+    """Значение писатель не пишет сам; элемент отдаётся yaml.dump"""
+
+
+# === Разбор аннотаций ===
+
+# Вид поля: ("scalar",), ("model", cls), ("enum", cls),
+# ("list", вид элемента), ("any",)
+_Kind = tuple[Any, ...]
+
+
+def _kind(annotation: Any) -> _Kind:
+    origin = get_origin(annotation)
+    if origin in (Union, types.UnionType):
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        return _kind(args[0]) if len(args) == 1 else ("any",)
+    if isinstance(origin, type) and issubclass(origin, list):
+        (item,) = get_args(annotation) or (Any,)
+        return ("list", _kind(item))
+    if isinstance(annotation, type):
+        if is_dataclass(annotation):
+            return ("model", annotation)
+        if issubclass(annotation, Enum):
+            return ("enum", annotation)
+        if annotation in (str, int, bool, float):
+            return ("scalar",)
+    return ("any",)
+
+
+_kinds: dict[type, list[tuple[str, _Kind]]] = {}
+
+
+def _field_kinds(cls: type) -> list[tuple[str, _Kind]]:
+    if (cached := _kinds.get(cls)) is not None:
+        return cached
+    hints = get_type_hints(cls)
+    kinds = _kinds[cls] = [(f.name, _kind(hints[f.name])) for f in fields(cls)]
+    return kinds
+
+
+def _omitted_if_empty(cls: type) -> frozenset[str]:
+    return frozenset(f.name for f in fields(cls) if f.metadata.get(OMIT_EMPTY))
+
+
+# === Encoder ===
+
+_encoders: dict[type, _Encoder] = {}
+
+
+def reflective_to_dict(obj: Any) -> Any:
+    """Прежний обход через fields() и __slots__ для чего угодно"""
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return {
+            f.name: reflective_to_dict(value)
+            for f in fields(obj)
+            if (value := getattr(obj, f.name)) != []
+            or not f.metadata.get(OMIT_EMPTY)
+        }
+    # Списки раньше __slots__: у NamedList он унаследован от Generic
+    elif isinstance(obj, list):
+        return [reflective_to_dict(item) for item in obj]
+    elif isinstance(obj, dict):
+        return {k: reflective_to_dict(v) for k, v in obj.items()}
+    elif hasattr(obj, "__slots__"):
+        return {
+            slot: reflective_to_dict(getattr(obj, slot))
+            for slot in obj.__slots__
+        }
+    return obj
+
+
+def encode(obj: Any) -> Any:
+    """Объект модели в примитивные структуры для yaml.dump"""
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return encoder_for(type(obj))(obj)
+    return reflective_to_dict(obj)
+
+
+def encoder_for(cls: type) -> _Encoder:
+    if (cached := _encoders.get(cls)) is not None:
+        return cached
+
+    env: dict[str, Any] = {"R": reflective_to_dict}
+    items = []
+    for i, (name, kind) in enumerate(_field_kinds(cls)):
+        value = f"obj.{name}"
+        match kind:
+            case ("scalar",) | ("enum", _):
+                items.append(f"{name!r}: {value}")
+            case ("model", model):
+                env[f"E{i}"] = encoder_for(model)
+                items.append(
+                    f"{name!r}: None if (v{i} := {value}) is None "
+                    f"else E{i}(v{i})"
+                )
+            case ("list", ("model", model)):
+                env[f"E{i}"] = encoder_for(model)
+                items.append(
+                    f"{name!r}: None if (v{i} := {value}) is None "
+                    f"else [E{i}(x) for x in v{i}]"
+                )
+            case ("list", ("scalar",) | ("enum", _)):
+                items.append(
+                    f"{name!r}: None if (v{i} := {value}) is None "
+                    f"else list(v{i})"
+                )
+            case _:
+                items.append(f"{name!r}: R({value})")
+
+    omit = "".join(
+        f"        if d[{name!r}] == []:\n            del d[{name!r}]\n"
+        for name in sorted(_omitted_if_empty(cls))
+    )
+    source = (
+        "def encode(obj):\n"
+        f"    if type(obj) is not C:\n"
+        f"        return R(obj)\n"
+        f"    try:\n"
+        f"        d = {{{', '.join(items)}}}\n"
+        f"{omit}"
+        f"        return d\n"
+        f"    except (AttributeError, TypeError):\n"
+        f"        return R(obj)\n"
+    )
+    env["C"] = cls
+    exec(source, env)  # noqa: S102
+    encoder: _Encoder = env["encode"]
+    _encoders[cls] = encoder
+    return encoder
+
+
+# === Decoder ===
+
+_decoders: dict[type, _Decoder] = {}
+
+
+def decode[T](cls: type[T], data: dict[str, Any]) -> T:
+    """Объект модели из dict, прочитанного из YAML"""
+    result: T = decoder_for(cls)(data)
+    return result
+
+
+def decoder_for(cls: type) -> _Decoder:
+    if (cached := _decoders.get(cls)) is not None:
+        return cached
+
+    env: dict[str, Any] = {"C": cls}
+    lines = ["def decode(data):", "    kw = dict(data)"]
+    for i, (name, kind) in enumerate(_field_kinds(cls)):
+        match kind:
+            case ("enum", enum) | ("model", enum):
+                env[f"D{i}"] = (
+                    decoder_for(enum) if kind[0] == "model" else enum
+                )
+                convert = f"D{i}(v)"
+            case ("list", ("enum", item) | ("model", item)):
+                env[f"D{i}"] = (
+                    decoder_for(item) if kind[1][0] == "model" else item
+                )
+                convert = f"[D{i}(x) for x in v]"
+            case _:
+                continue
+        lines.append(f"    if (v := kw.get({name!r})) is not None:")
+        lines.append(f"        kw[{name!r}] = {convert}")
+    lines.append("    return C(**kw)")
+
+    exec("\n".join(lines), env)  # noqa: S102
+    decoder: _Decoder = env["decode"]
+    _decoders[cls] = decoder
+    return decoder
+
+
+def decode_errors(cls: type, data: Any, path: str) -> list[tuple[str, str]]:
+    """
+    Все ошибки разбора data как cls: пары (путь в YAML, сообщение), путь
+    вида "devices[3].interfaces[0].vlan_mode". Медленнее decode, поэтому
+    вызывается только для записей, которые decode не принял.
+    """
+    errors: list[tuple[str, str]] = []
+    _check_model(cls, data, path, errors)
+    return errors
+
+
+def _check_model(
+    cls: type, data: Any, path: str, errors: list[tuple[str, str]]
+) -> Any:
+    if not isinstance(data, dict):
+        errors.append((path, f"expected a mapping, got {_type_name(data)}"))
+        return None
+    kinds = dict(_field_kinds(cls))
+    start = len(errors)
+    kw = {}
+    for key, value in data.items():
+        if (kind := kinds.get(key)) is None:
+            errors.append((f"{path}.{key}", "unknown field"))
+            continue
+        kw[key] = _check_value(kind, value, f"{path}.{key}", errors)
+    for f in fields(cls):
+        required = f.default is MISSING and f.default_factory is MISSING
+        if required and f.name not in data:
+            errors.append((f"{path}.{f.name}", "missing required field"))
+    if len(errors) > start:
+        return None
+    # Остались проверки самой модели (__post_init__)
+    try:
+        return cls(**kw)
+    except (TypeError, ValueError) as e:
+        errors.append((path, str(e)))
+        return None
+
+
+def _check_value(
+    kind: _Kind, value: Any, path: str, errors: list[tuple[str, str]]
+) -> Any:
+    if value is None:
+        return None
+    match kind:
+        case ("enum", enum):
+            try:
+                return enum(value)
+            except ValueError:
+                allowed = ", ".join(str(m.value) for m in enum)
+                errors.append((path, f"{value!r} is not one of: {allowed}"))
+                return None
+        case ("model", model):
+            return _check_model(model, value, path, errors)
+        case ("list", item):
+            if not isinstance(value, list):
+                errors.append(
+                    (path, f"expected a list, got {_type_name(value)}")
+                )
+                return None
+            return [
+                _check_value(item, x, f"{path}[{i}]", errors)
+                for i, x in enumerate(value)
+            ]
+    return value
+
+
+def _type_name(value: Any) -> str:
+    return "null" if value is None else type(value).__name__
+
+
+# === YAML ===
+
+
+class ScalarCache:
+    """Вид скаляров в YAML; живёт одну запись, а не весь процесс"""
+
+    __slots__ = ("_cache", "_resolver")
+
+    def __init__(self) -> None:
+        self._cache: dict[str, str | None] = {}
+        self._resolver = Resolver()
+
+    def __call__(self, value: Any, column: int) -> str:
+        """Запись value, начинающаяся в колонке column"""
+        if value is None:
+            text = "null"
+        elif value is True or value is False:
+            text = "true" if value else "false"
+        elif type(value) is int:
+            text = str(value)
+        elif isinstance(value, str):
+            try:
+                cached = self._cache[value]
+            except KeyError:
+                cached = self._cache[value] = self._represent(value)
+            if cached is None:
+                raise _FallbackError
+            text = cached
+        else:
+            raise _FallbackError
+        # Строка короче ширины не переносится ни в каком стиле
+        if column + len(text) > BEST_WIDTH:
+            raise _FallbackError
+        return text
+
+    def _represent(self, value: str) -> str | None:
+        if _LINE_BREAK.search(value):
+            return None
+        if _PLAIN.fullmatch(value):
+            tag = self._resolver.resolve(ScalarNode, value, (True, False))  # type: ignore[no-untyped-call]
+            if tag == STR_TAG:
+                return value
+        # Редкий случай: вид строки выбирает сам libyaml
+        text = yaml.dump(
+            {"k": str(value)}, Dumper=Dumper, allow_unicode=True, width=-1
+        )
+        text = text[len("k: ") : -1]
+        return None if "\n" in text else text
+
+
+_writers: dict[type, _Writer] = {}
+
+
+def writer_for(cls: type) -> _Writer:
+    """
+    Писатель блока YAML для объекта класса cls.
+    head - начало первой строки ("- " для элемента списка), ind - отступ
+    остальных ключей.
+    """
+    if (cached := _writers.get(cls)) is not None:
+        return cached
+
+    omitted = _omitted_if_empty(cls)
+    field_writers = [
+        _field_writer(name, kind, name in omitted)
+        for name, kind in _field_kinds(cls)
+    ]
+    if not field_writers:
+        raise TypeError(f"{cls.__name__} has no fields to write.")
+    # Первая строка блока несёт head, её поле всегда выводится
+    if fields(cls)[0].name in omitted:
+        raise TypeError(f"{cls.__name__}: first field cannot be omitted.")
+    first, *rest = field_writers
+
+    def write(
+        obj: Any, out: list[str], head: str, ind: str, scalar: ScalarCache
+    ) -> None:
+        if type(obj) is not cls:
+            raise _FallbackError
+        first(obj, out, head, ind, scalar)
+        for field_writer in rest:
+            field_writer(obj, out, ind, ind, scalar)
+
+    _writers[cls] = write
+    return write
+
+
+def _field_writer(name: str, kind: _Kind, omit_empty: bool = False) -> _Writer:
+    key = f"{name}:"
+    match kind:
+        case ("scalar",) | ("enum", _):
+
+            def write_scalar(
+                obj: Any,
+                out: list[str],
+                pre: str,
+                ind: str,
+                scalar: ScalarCache,
+            ) -> None:
+                line = f"{pre}{key} "
+                out.append(line + scalar(getattr(obj, name), len(line)))
+
+            return write_scalar
+
+        case ("model", model):
+
+            def write_model(
+                obj: Any,
+                out: list[str],
+                pre: str,
+                ind: str,
+                scalar: ScalarCache,
+            ) -> None:
+                value = getattr(obj, name)
+                if value is None:
+                    out.append(f"{pre}{key} null")
+                    return
+                out.append(f"{pre}{key}")
+                nested = ind + "  "
+                writer_for(model)(value, out, nested, nested, scalar)
+
+            return write_model
+
+        case ("list", ("scalar",) | ("enum", _)):
+
+            def write_scalars(
+                obj: Any,
+                out: list[str],
+                pre: str,
+                ind: str,
+                scalar: ScalarCache,
+            ) -> None:
+                value = getattr(obj, name)
+                if value is None:
+                    out.append(f"{pre}{key} null")
+                    return
+                if not isinstance(value, list):
+                    raise _FallbackError
+                if not value:
+                    if not omit_empty:
+                        out.append(f"{pre}{key} []")
+                    return
+                out.append(f"{pre}{key}")
+                item = ind + "- "
+                column = len(item)
+                out.extend(item + scalar(x, column) for x in value)
+
+            return write_scalars
+
+        case ("list", ("model", model)):
+
+            def write_models(
+                obj: Any,
+                out: list[str],
+                pre: str,
+                ind: str,
+                scalar: ScalarCache,
+            ) -> None:
+                value = getattr(obj, name)
+                if value is None:
+                    out.append(f"{pre}{key} null")
+                    return
+                if not isinstance(value, list):
+                    raise _FallbackError
+                if not value:
+                    if not omit_empty:
+                        out.append(f"{pre}{key} []")
+                    return
+                out.append(f"{pre}{key}")
+                writer = writer_for(model)
+                head, nested = ind + "- ", ind + "  "
+                for x in value:
+                    writer(x, out, head, nested, scalar)
+
+            return write_models
+
+    def write_any(
+        obj: Any, out: list[str], pre: str, ind: str, scalar: ScalarCache
+    ) -> None:
+        raise _FallbackError
+
+    return write_any
+
+
+def iter_yaml(obj: Any, scalar: ScalarCache | None = None) -> Iterator[str]:
+    """
+    Документ YAML для объекта модели по частям: ключ верхнего уровня или
+    один элемент списка верхнего уровня (сеть, устройство, ПО). В памяти
+    одновременно только текст текущей части.
+
+    Части, которые писатель не осилил, выводит yaml.dump: на верхнем
+    уровне их запись не зависит от окружения. Общий scalar позволяет
+    не вычислять заново вид строк при записи многих объектов подряд.
+    """
+    if scalar is None:
+        scalar = ScalarCache()
+    omitted = _omitted_if_empty(type(obj))
+    for name, kind in _field_kinds(type(obj)):
+        value = getattr(obj, name)
+        if name in omitted and value == []:
+            continue
+        if kind[0] == "list" and kind[1][0] == "model" and value:
+            yield f"{name}:\n"
+            writer = writer_for(kind[1][1])
+            for item in value:
+                out: list[str] = []
+                try:
+                    writer(item, out, "- ", "  ", scalar)
+                except _FallbackError:
+                    yield _yaml_text([encode(item)])
+                    continue
+                out.append("")
+                yield "\n".join(out)
+            continue
+        out = []
+        try:
+            _field_writer(name, kind)(obj, out, "", "", scalar)
+        except _FallbackError:
+            yield _yaml_text({name: encode(value)})
+            continue
+        out.append("")
+        yield "\n".join(out)
+
+
+def write_yaml(obj: Any, stream: TextIO) -> None:
+    """Пишет документ YAML в stream по мере сериализации"""
+    stream.writelines(iter_yaml(obj))
+
+
+def dump_yaml(obj: Any, scalar: ScalarCache | None = None) -> str:
+    """Документ YAML для объекта модели одной строкой"""
+    return "".join(iter_yaml(obj, scalar))
+
+
+def _yaml_text(data: Any) -> str:
+    text: str = yaml.dump(
+        data, Dumper=Dumper, sort_keys=False, allow_unicode=True
+    )
+    return text
@@ -0,0 +1,215 @@
+# src/halter/core/services/sharded_io.py
+"""
+Проект в каталоге: индекс плюс файл на каждую сеть, устройство и ПО.
+
+    project/
+      index.yaml          имя, описание, area_type, areas и порядок файлов
+      networks/NET0.yaml
+      devices/PLC-1.yaml
+      software/plc_runtime.yaml
+
+Файл сущности - тот же YAML, что и элемент списка в project.yaml, только
+без "- ". Изменение одного устройства затрагивает один файл, поэтому
+сохранение переписывает только изменённые файлы, а слияние веток не
+конфликтует на соседних устройствах.
+
+Файлы читаются и разбираются в пуле потоков. Имя файла выводится из
+имени сущности, но загрузка опирается только на список в индексе.
+"""
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml
+from yaml import CSafeDumper as Dumper
+from yaml import CSafeLoader as Loader
+
+from halter.core.models.area import Area
+from halter.core.models.collection import NamedList
+from halter.core.models.device import Device
+from halter.core.models.network import Network
+from halter.core.models.project import Project
+from halter.core.models.software import Software
+from halter.core.services.config_io import (
+    LoadIssue,
+    LoadResult,
+    accept_load_result,
+    atomic_write,
+    decode_entry,
+    decode_project_header,
+)
+from halter.core.services.serializers import (
+    ScalarCache,
+    dump_yaml,
+    encode,
+)
+
+INDEX_NAME = "index.yaml"
+LAYOUT_VERSION = 1
+# Разделитель в конце пути выбирает хранение каталогом
+_SEPARATORS = ("/", os.sep)
+SECTIONS: dict[str, type] = {
+    "networks": Network,
+    "devices": Device,
+    "software": Software,
+}
+
+_UNSAFE = re.compile(r"[^\w.-]")
+
+
+@dataclass(slots=True, kw_only=True)
+class ShardSaveResult:
+    written: list[Path] = field(default_factory=list)
+    unchanged: int = 0
+    removed: list[Path] = field(default_factory=list)
+
+
+def is_sharded_path(path: Path | str) -> bool:
+    """
+    Существующий каталог или путь, оканчивающийся разделителем ("plant/").
+    Новый путь без расширения остаётся файлом YAML, как раньше.
+    """
+    return Path(path).is_dir() or str(path).endswith(_SEPARATORS)
+
+
+def shard_file_names(names: list[str]) -> list[str]:
+    """
+    Имена файлов для сущностей в порядке names. Небезопасные символы
+    заменяются на "_", совпадения без учёта регистра получают суффикс.
+    """
+    used: set[str] = set()
+    result = []
+    for name in names:
+        stem = _UNSAFE.sub("_", name).lstrip(".") or "_"
+        candidate, n = stem, 1
+        while candidate.lower() in used:
+            n += 1
+            candidate = f"{stem}~{n}"
+        used.add(candidate.lower())
+        result.append(f"{candidate}.yaml")
+    return result
+
+
+def save_project_dir(project: Project, path: Path) -> ShardSaveResult:
+    """
+    Сохраняет проект в каталог. Переписываются только файлы, содержимое
+    которых изменилось; файлы удалённых сущностей удаляются после записи
+    индекса.
+    """
+    path = Path(path)
+    result = ShardSaveResult()
+    index: dict[str, Any] = {
+        "layout": LAYOUT_VERSION,
+        "name": project.name,
+        "description": project.description,
+        "area_type": list(project.area_type),
+        "areas": encode(project.areas),
+    }
+    keep: dict[Path, set[str]] = {}
+    scalar = ScalarCache()
+    for section in SECTIONS:
+        entities = getattr(project, section)
+        files = shard_file_names([e.name for e in entities])
+        section_dir = path / section
+        section_dir.mkdir(parents=True, exist_ok=True)
+        for entity, file in zip(entities, files, strict=True):
+            _write_if_changed(
+                section_dir / file, dump_yaml(entity, scalar), result
+            )
+        index[section] = files
+        keep[section_dir] = set(files)
+
+    text = yaml.dump(index, Dumper=Dumper, sort_keys=False, allow_unicode=True)
+    _write_if_changed(path / INDEX_NAME, text, result)
+
+    for section_dir, names in keep.items():
+        for stale in sorted(section_dir.glob("*.yaml")):
+            if stale.name not in names:
+                stale.unlink()
+                result.removed.append(stale)
+    return result
+
+
+def _write_if_changed(path: Path, text: str, result: ShardSaveResult) -> None:
+    data = text.encode("utf-8")
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            result.unchanged += 1
+            return
+    except FileNotFoundError:
+        pass
+    with atomic_write(path) as f:
+        f.write(text)
+    result.written.append(path)
+
+
+def load_project_dir(
+    path: Path, jobs: int | None = None, valid_subset: bool = False
+) -> Project:
+    """
+    Загружает проект из каталога. Файлы сущностей читаются и разбираются
+    в jobs потоках (None - значение ThreadPoolExecutor по умолчанию).
+    Ошибки всех файлов собираются вместе, как в config_io.load_project.
+    """
+    return accept_load_result(
+        read_project_dir(path, jobs), Path(path), valid_subset
+    )
+
+
+def read_project_dir(path: Path, jobs: int | None = None) -> LoadResult:
+    path = Path(path)
+    index_path = path / INDEX_NAME
+    if not index_path.exists():
+        raise ValueError(f"{path} has no {INDEX_NAME}.")
+    with open(index_path, encoding="utf-8") as f:
+        index = yaml.load(f, Loader=Loader)
+    if not isinstance(index, dict):
+        raise TypeError(f"{index_path}: root must be a mapping.")
+    if (layout := index.get("layout")) != LAYOUT_VERSION:
+        raise ValueError(f"{index_path}: unsupported layout {layout!r}.")
+
+    tasks = [
+        (section, path, f"{section}/{file}")
+        for section in SECTIONS
+        for file in index.get(section) or []
+    ]
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        loaded = list(pool.map(_load_shard, tasks))
+    issues: list[LoadIssue] = []
+    sections: dict[str, list[Any]] = {section: [] for section in SECTIONS}
+    for (section, _, _), (entity, shard_issues) in zip(
+        tasks, loaded, strict=True
+    ):
+        issues.extend(shard_issues)
+        if entity is not None:
+            sections[section].append(entity)
+    areas = [
+        area
+        for i, data in enumerate(index.get("areas") or [])
+        if (area := decode_entry(Area, data, f"areas[{i}]", issues))
+        is not None
+    ]
+
+    project = decode_project_header(index, issues)
+    project.networks = NamedList(sections["networks"])
+    project.devices = NamedList(sections["devices"])
+    project.software = NamedList(sections["software"])
+    project.areas = areas
+    return LoadResult(project=project, issues=issues)
+
+
+def _load_shard(task: tuple[str, Path, str]) -> tuple[Any, list[LoadIssue]]:
+    """Сущность из файла (или None) и ошибки с путями от файла"""
+    section, root, name = task
+    issues: list[LoadIssue] = []
+    try:
+        with open(root / name, encoding="utf-8") as f:
+            data = yaml.load(f, Loader=Loader)
+    except (OSError, yaml.YAMLError) as e:
+        issues.append(LoadIssue(path=name, message=str(e)))
+        return None, issues
+    return decode_entry(SECTIONS[section], data, name, issues), issues
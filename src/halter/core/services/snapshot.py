@@ -0,0 +1,111 @@
+# src/halter/core/services/snapshot.py
+"""
+Бинарный снимок проекта рядом с YAML для быстрой загрузки.
+
+Снимок хранит уже провалидированные объекты модели и ключ исходного
+YAML (mtime, размер, sha256). Если ключ не совпадает, снимок считается
+устаревшим и проект читается из YAML.
+
+Проект лежит в снимке отдельным pickle: хэш этих байтов и есть
+project_fingerprint, так что загрузка со снимком или с его записью
+получает хэш без повторной сериализации проекта.
+
+Снимок - это pickle, его нельзя принимать из недоверенных источников.
+"""
+
+import hashlib
+import os
+import pickle
+from dataclasses import dataclass
+from pathlib import Path
+
+from halter.core.models.project import Project
+
+# Меняется при несовместимых изменениях моделей
+SNAPSHOT_VERSION = 4
+
+
+@dataclass(frozen=True, slots=True)
+class SourceKey:
+    mtime_ns: int
+    size: int
+    sha256: str
+
+
+def dump_project(project: Project) -> bytes:
+    return pickle.dumps(project, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def fingerprint_of(data: bytes) -> str:
+    """Хэш проекта по его байтам из dump_project"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def snapshot_path(path: Path) -> Path:
+    """Путь к снимку: скрытый файл рядом с project.yaml"""
+    return path.with_name(f".{path.name}.cache")
+
+
+def source_key(path: Path) -> SourceKey:
+    stat = path.stat()
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return SourceKey(
+        mtime_ns=stat.st_mtime_ns, size=stat.st_size, sha256=digest.hexdigest()
+    )
+
+
+def read_snapshot(path: Path) -> tuple[Project, str] | None:
+    """
+    Проект из снимка и его хэш (см. fingerprint_of) или None, если
+    снимка нет или он устарел
+    """
+    cache = snapshot_path(path)
+    try:
+        stat = path.stat()
+        with open(cache, "rb") as f:
+            data = pickle.load(f)
+        if not isinstance(data, tuple) or len(data) != 3:
+            return None
+        version, key, payload = data
+        if version != SNAPSHOT_VERSION or not isinstance(payload, bytes):
+            return None
+        project = pickle.loads(payload)
+    except (
+        OSError,
+        pickle.UnpicklingError,
+        EOFError,
+        AttributeError,
+        ImportError,
+    ):
+        # Битый или несовместимый снимок - просто повод читать YAML
+        return None
+
+    if not isinstance(project, Project):
+        return None
+    # Дешёвая проверка до чтения файла целиком
+    if key.size != stat.st_size or key.mtime_ns != stat.st_mtime_ns:
+        return None
+    if key != source_key(path):
+        return None
+    return project, fingerprint_of(payload)
+
+
+def write_snapshot(project: Project, path: Path) -> str:
+    """
+    Сохраняет снимок для текущего содержимого YAML по пути path,
+    возвращает хэш проекта
+    """
+    cache = snapshot_path(path)
+    tmp = cache.with_name(cache.name + ".tmp")
+    payload = dump_project(project)
+    with open(tmp, "wb") as f:
+        pickle.dump(
+            (SNAPSHOT_VERSION, source_key(path), payload),
+            f,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+    os.replace(tmp, cache)
+    return fingerprint_of(payload)
@@ -0,0 +1,270 @@
+# src/halter/core/services/sqlite_io.py
+"""
+Хранение проекта в локальной базе SQLite.
+
+Каждая сеть, устройство и ПО - строка своей таблицы: позиция в проекте,
+имя и JSON объекта (тот же набор полей, что в YAML). Интерфейсы
+устройств дополнительно разложены в таблицу interfaces ради индекса по
+адресу. Индексы по именам и адресу позволяют командам-запросам читать
+одну запись, не собирая весь проект.
+
+Имена в проекте не обязаны быть уникальными: как и NamedList, запрос по
+имени возвращает первую по порядку запись.
+"""
+
+import json
+import sqlite3
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from halter.core.models.area import Area
+from halter.core.models.collection import NamedList
+from halter.core.models.device import Device
+from halter.core.models.network import Network
+from halter.core.models.project import Project
+from halter.core.models.software import Software
+from halter.core.services.config_io import (
+    LoadIssue,
+    LoadResult,
+    accept_load_result,
+    decode_entry,
+    decode_project_header,
+)
+from halter.core.services.serializers import decode, encode
+
+SQLITE_SUFFIXES = frozenset({".sqlite", ".sqlite3", ".db"})
+# Меняется при несовместимых изменениях схемы (PRAGMA user_version)
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE networks (
+    pos INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE devices (
+    pos INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    role TEXT NOT NULL,
+    interface_count INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE interfaces (
+    device_pos INTEGER NOT NULL REFERENCES devices (pos),
+    pos INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    network_id TEXT NOT NULL,
+    address TEXT,
+    PRIMARY KEY (device_pos, pos)
+);
+CREATE TABLE software (
+    pos INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX networks_name ON networks (name);
+CREATE INDEX devices_name ON devices (name);
+CREATE INDEX interfaces_address ON interfaces (address);
+CREATE INDEX software_name ON software (name);
+"""
+
+
+@dataclass(slots=True, kw_only=True)
+class DeviceSummary:
+    name: str
+    role: str
+    interfaces: int
+
+
+@dataclass(slots=True, kw_only=True)
+class InterfaceRef:
+    device: str
+    interface: str
+    network_id: str
+    address: str | None
+
+
+def is_sqlite_path(path: Path) -> bool:
+    return Path(path).suffix.lower() in SQLITE_SUFFIXES
+
+
+@contextmanager
+def _connect(path: Path) -> Iterator[sqlite3.Connection]:
+    """Соединение с транзакцией: commit при успехе, rollback при ошибке"""
+    with closing(sqlite3.connect(path)) as connection, connection:
+        yield connection
+
+
+def _dumps(obj: Any) -> str:
+    return json.dumps(encode(obj), ensure_ascii=False, separators=(",", ":"))
+
+
+def save_project_sqlite(project: Project, path: Path) -> None:
+    """
+    Записывает проект в базу целиком одной транзакцией: при сбое в базе
+    остаётся прежний проект.
+    """
+    with _connect(Path(path)) as db:
+        (version,) = db.execute("PRAGMA user_version").fetchone()
+        if version == 0:
+            db.executescript(SCHEMA)
+            db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        elif version != SCHEMA_VERSION:
+            raise ValueError(f"{path}: unsupported schema version {version}.")
+
+        for table in ("meta", "interfaces", "networks", "devices", "software"):
+            db.execute(f"DELETE FROM {table}")
+        db.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [
+                ("name", json.dumps(project.name)),
+                ("description", json.dumps(project.description)),
+                ("area_type", json.dumps(list(project.area_type))),
+                ("areas", _dumps(project.areas)),
+            ],
+        )
+        db.executemany(
+            "INSERT INTO networks VALUES (?, ?, ?)",
+            ((i, n.name, _dumps(n)) for i, n in enumerate(project.networks)),
+        )
+        db.executemany(
+            "INSERT INTO devices VALUES (?, ?, ?, ?, ?)",
+            (
+                (i, d.name, d.role, len(d.interfaces), _dumps(d))
+                for i, d in enumerate(project.devices)
+            ),
+        )
+        db.executemany(
+            "INSERT INTO interfaces VALUES (?, ?, ?, ?, ?)",
+            (
+                (i, j, iface.name, iface.network_id, iface.address)
+                for i, d in enumerate(project.devices)
+                for j, iface in enumerate(d.interfaces)
+            ),
+        )
+        db.executemany(
+            "INSERT INTO software VALUES (?, ?, ?)",
+            ((i, s.name, _dumps(s)) for i, s in enumerate(project.software)),
+        )
+
+
+class ProjectDatabase:
+    """Запросы к проекту в базе SQLite без загрузки всего проекта"""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        if not self.path.exists():
+            raise ValueError(f"Project database {self.path} not found.")
+
+    @contextmanager
+    def _query(self) -> Iterator[sqlite3.Connection]:
+        uri = f"{self.path.resolve().as_uri()}?mode=ro"
+        with closing(sqlite3.connect(uri, uri=True)) as db:
+            (version,) = db.execute("PRAGMA user_version").fetchone()
+            if version != SCHEMA_VERSION:
+                raise ValueError(
+                    f"{self.path}: unsupported schema version {version}."
+                )
+            yield db
+
+    def load(self, valid_subset: bool = False) -> Project:
+        """
+        Весь проект. Ошибки записей собираются, как в
+        config_io.load_project; путь записи - "devices[3]" по её позиции.
+        """
+        return accept_load_result(self.read(), self.path, valid_subset)
+
+    def read(self) -> LoadResult:
+        issues: list[LoadIssue] = []
+        with self._query() as db:
+            meta = {
+                key: json.loads(value)
+                for key, value in db.execute("SELECT key, value FROM meta")
+            }
+            networks = _decode_rows(db, "networks", Network, issues)
+            devices = _decode_rows(db, "devices", Device, issues)
+            software = _decode_rows(db, "software", Software, issues)
+        areas = [
+            area
+            for i, data in enumerate(meta.get("areas") or [])
+            if (area := decode_entry(Area, data, f"areas[{i}]", issues))
+            is not None
+        ]
+        project = decode_project_header(meta, issues)
+        project.networks = NamedList(networks)
+        project.devices = NamedList(devices)
+        project.software = NamedList(software)
+        project.areas = areas
+        return LoadResult(project=project, issues=issues)
+
+    def device_summaries(self) -> list[DeviceSummary]:
+        with self._query() as db:
+            rows = db.execute(
+                "SELECT name, role, interface_count FROM devices ORDER BY pos"
+            ).fetchall()
+        return [
+            DeviceSummary(name=name, role=role, interfaces=count)
+            for name, role, count in rows
+        ]
+
+    def network(self, name: str) -> Network | None:
+        return self._get("networks", Network, name)
+
+    def device(self, name: str) -> Device | None:
+        return self._get("devices", Device, name)
+
+    def software(self, name: str) -> Software | None:
+        return self._get("software", Software, name)
+
+    def interfaces_with_address(self, address: str) -> list[InterfaceRef]:
+        with self._query() as db:
+            rows = db.execute(
+                "SELECT d.name, i.name, i.network_id, i.address "
+                "FROM interfaces AS i "
+                "JOIN devices AS d ON d.pos = i.device_pos "
+                "WHERE i.address = ? ORDER BY i.device_pos, i.pos",
+                (address,),
+            ).fetchall()
+        return [
+            InterfaceRef(
+                device=device, interface=iface, network_id=net, address=addr
+            )
+            for device, iface, net, addr in rows
+        ]
+
+    def _get[T](self, table: str, cls: type[T], name: str) -> T | None:
+        with self._query() as db:
+            row = db.execute(
+                f"SELECT data FROM {table} WHERE name = ? "
+                "ORDER BY pos LIMIT 1",
+                (name,),
+            ).fetchone()
+        return None if row is None else decode(cls, json.loads(row[0]))
+
+
+def _decode_rows[T](
+    db: sqlite3.Connection, table: str, cls: type[T], issues: list[LoadIssue]
+) -> list[T]:
+    """Записи таблицы по порядку; ошибочные пропускаются и идут в issues"""
+    entries = []
+    for pos, data in db.execute(f"SELECT pos, data FROM {table} ORDER BY pos"):
+        path = f"{table}[{pos}]"
+        try:
+            value = json.loads(data)
+        except ValueError as e:
+            issues.append(LoadIssue(path=path, message=str(e)))
+            continue
+        if (entry := decode_entry(cls, value, path, issues)) is not None:
+            entries.append(entry)
+    return entries
+
+
+def load_project_sqlite(path: Path, valid_subset: bool = False) -> Project:
+    return ProjectDatabase(path).load(valid_subset)
@@ -3,8 +3,8 @@
 
 import ipaddress
 import re
-from collections.abc import Callable
-from typing import Any
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
 
 from halter.core.models.address import AddressingType
 
@@ -41,70 +41,130 @@ _validation_patterns: dict[AddressingType, tuple[str, str]] = {
 }
 
 
-def _validate_with_pattern(addr: str, pattern: str, desc: str) -> None:
-    # Полное совпадение строки
-    if not re.fullmatch(pattern, addr):
-        raise ValueError(f"Invalid {desc}: {addr}")
+@dataclass(frozen=True, slots=True)
+class AddressValidator:
+    """
+    Скомпилированный валидатор адреса.
 
+    check - предикат без исключений (для пакетной проверки),
+    вызов валидатора бросает ValueError с текстом message.
+    """
 
-# Простые валидаторы
+    check: Callable[[str], bool]
+    message: str
 
+    def __call__(self, addr: str) -> None:
+        if not self.check(addr):
+            raise ValueError(self.message.format(addr=addr))
 
-def _validate_ipv4_network(addr: str) -> None:
+
+def _pattern_check(pattern: str) -> Callable[[str], bool]:
+    # Шаблон компилируется один раз, проверка - полное совпадение строки
+    fullmatch = re.compile(pattern).fullmatch
+    return lambda addr: fullmatch(addr) is not None
+
+
+def _pattern_validator(atype: AddressingType) -> AddressValidator:
+    pattern, desc = _validation_patterns[atype]
+    return AddressValidator(
+        check=_pattern_check(pattern), message=f"Invalid {desc}: {{addr}}"
+    )
+
+
+# Простые проверки
+
+
+def _is_ipv4_network(addr: str) -> bool:
     try:
         ipaddress.ip_network(addr, strict=False)
-    except ValueError as e:
-        raise ValueError(f"Invalid IPv4 network: {addr}") from e
+    except ValueError:
+        return False
+    return True
 
 
-def _validate_ipv4_address(addr: str) -> None:
+def _is_ipv4_address(addr: str) -> bool:
     try:
         ipaddress.ip_address(addr)
-    except ValueError as e:
-        raise ValueError(f"Invalid IPv4 address: {addr}") from e
+    except ValueError:
+        return False
+    return True
 
 
-def _validate_slaveid(addr: str) -> None:
-    if not (addr.isdigit() and 0 <= int(addr) <= 247):
-        raise ValueError(f"Slave ID must be integer 0-247: {addr}")
+def _is_slaveid(addr: str) -> bool:
+    return addr.isdigit() and 0 <= int(addr) <= 247
 
 
-def _validate_crateid(addr: str) -> None:
-    if not (addr.isdigit() and 1 <= int(addr) <= 247):
-        raise ValueError(f"Crate ID must be integer 1-255: {addr}")
+def _is_crateid(addr: str) -> bool:
+    return addr.isdigit() and 1 <= int(addr) <= 247
+
+
+def _is_db_connection(addr: str) -> bool:
+    lowered = addr.lower()
+    return any(
+        p in lowered for p in ("server=", "host=", "data source=", "database=")
+    )
 
 
 # Словарь валидаторов
-VALIDATION_FUNCTIONS: dict[AddressingType, Callable[[str], Any]] = {
-    AddressingType.ANALOG_SIGNAL: lambda a: _validate_with_pattern(
-        a, *_validation_patterns[AddressingType.ANALOG_SIGNAL]
+VALIDATION_FUNCTIONS: dict[AddressingType, AddressValidator] = {
+    AddressingType.ANALOG_SIGNAL: _pattern_validator(
+        AddressingType.ANALOG_SIGNAL
     ),
-    AddressingType.MODBUS_RTU_ADDRESS: _validate_slaveid,
-    AddressingType.IP_NETWORK: _validate_ipv4_network,
-    AddressingType.IP_ADDRESS: _validate_ipv4_address,
-    AddressingType.OPC_UA_ADDRESS: lambda a: _validate_with_pattern(
-        a, *_validation_patterns[AddressingType.OPC_UA_ADDRESS]
+    AddressingType.MODBUS_RTU_ADDRESS: AddressValidator(
+        check=_is_slaveid, message="Slave ID must be integer 0-247: {addr}"
     ),
-    AddressingType.MES_TAG_ADDRESS: lambda a: _validate_with_pattern(
-        a, *_validation_patterns[AddressingType.MES_TAG_ADDRESS]
+    AddressingType.IP_NETWORK: AddressValidator(
+        check=_is_ipv4_network, message="Invalid IPv4 network: {addr}"
     ),
-    AddressingType.DNS_NAME: lambda a: _validate_with_pattern(
-        a, *_validation_patterns[AddressingType.DNS_NAME]
+    AddressingType.IP_ADDRESS: AddressValidator(
+        check=_is_ipv4_address, message="Invalid IPv4 address: {addr}"
     ),
-    AddressingType.SCADA_TAG_ADDRESS: lambda a: _validate_with_pattern(
-        a, *_validation_patterns[AddressingType.SCADA_TAG_ADDRESS]
+    AddressingType.OPC_UA_ADDRESS: _pattern_validator(
+        AddressingType.OPC_UA_ADDRESS
     ),
-    AddressingType.HTTP_URL: lambda a: _validate_with_pattern(
-        a, *_validation_patterns[AddressingType.HTTP_URL]
+    AddressingType.MES_TAG_ADDRESS: _pattern_validator(
+        AddressingType.MES_TAG_ADDRESS
     ),
-    AddressingType.EMAIL_ADDRESS: lambda a: _validate_with_pattern(
-        a, *_validation_patterns[AddressingType.EMAIL_ADDRESS]
+    AddressingType.DNS_NAME: _pattern_validator(AddressingType.DNS_NAME),
+    AddressingType.SCADA_TAG_ADDRESS: _pattern_validator(
+        AddressingType.SCADA_TAG_ADDRESS
+    ),
+    AddressingType.HTTP_URL: _pattern_validator(AddressingType.HTTP_URL),
+    AddressingType.EMAIL_ADDRESS: _pattern_validator(
+        AddressingType.EMAIL_ADDRESS
+    ),
+    AddressingType.DATABASE_CONNECTION: AddressValidator(
+        check=_is_db_connection, message="Invalid DB connection: {addr}"
+    ),
+    AddressingType.REGULBUS_CRATE_ADDRESS: AddressValidator(
+        check=_is_crateid, message="Crate ID must be integer 1-255: {addr}"
     ),
-    AddressingType.DATABASE_CONNECTION: lambda a: True
-    if any(
-        p in a.lower()
-        for p in ("server=", "host=", "data source=", "database=")
-    )
-    else (_ for _ in ()).throw(ValueError(f"Invalid DB connection: {a}")),
-    AddressingType.REGULBUS_CRATE_ADDRESS: _validate_crateid,
 }
+
+
+def validate_many(
+    address_type: AddressingType, addresses: Iterable[str]
+) -> list[str | None]:
+    """
+    Пакетная проверка адресов одного типа без исключений на каждую ошибку.
+
+    Возвращает для каждого адреса None, если он корректен, иначе текст
+    ошибки - тот же, что у ValueError одиночного валидатора.
+    """
+    validator = VALIDATION_FUNCTIONS.get(address_type)
+    if validator is None:
+        return [None for _ in addresses]
+    check, message = validator.check, validator.message
+    return [
+        None if check(addr) else message.format(addr=addr)
+        for addr in addresses
+    ]
+
+
+def parse_range(text: str) -> tuple[str, str]:
+    """'10.0.0.5' или '10.0.0.10-10.0.0.20' -> (первый, последний)"""
+    first, _, last = text.partition("-")
+    first, last = first.strip(), (last or first).strip()
+    if ipaddress.IPv4Address(first) > ipaddress.IPv4Address(last):
+        raise ValueError(f"Range {text} is empty.")
+    return first, last
@@ -4,6 +4,8 @@ import re
 
 from halter.core.constants import DEVICE_ROLES
 
+_NETBIOS_NAME = re.compile(r"[A-Za-z0-9-]{1,15}")
+
 
 def validate_netbios_name(name: str) -> None:
     """
@@ -11,8 +13,7 @@ def validate_netbios_name(name: str) -> None:
     - длина от 1 до 15 символов
     - только латинские буквы, цифры и дефис
     """
-    pattern = r"^[A-Za-z0-9-]{1,15}$"
-    if not re.fullmatch(pattern, name):
+    if not _NETBIOS_NAME.fullmatch(name):
         raise ValueError(f"Invalid NetBIOS name: {name}")
 
 
@@ -11,6 +11,7 @@ from halter.core.models.network import (
 )
 from halter.core.validation.address_validators import (
     VALIDATION_FUNCTIONS,
+    validate_many,
 )
 
 
@@ -183,3 +184,26 @@ def test_get_address_type_name(base_network: Network) -> None:
     assert (
         base_network.get_address_type_name() == AddressingType.IP_NETWORK.value
     )
+
+
+# Batch validation
+def test_validate_many_reports_per_item() -> None:
+    results = validate_many(
+        AddressingType.IP_ADDRESS, ["10.0.0.1", "256.0.0.1", "10.0.0.2"]
+    )
+    assert results == [None, "Invalid IPv4 address: 256.0.0.1", None]
+
+
+def test_validate_many_matches_single_validator() -> None:
+    addresses = ["4-20mA", "20mV", "100%"]
+    func = VALIDATION_FUNCTIONS[AddressingType.ANALOG_SIGNAL]
+    for addr, error in zip(
+        addresses,
+        validate_many(AddressingType.ANALOG_SIGNAL, addresses),
+        strict=True,
+    ):
+        if error is None:
+            func(addr)
+        else:
+            with pytest.raises(ValueError, match=error):
+                func(addr)
@@ -0,0 +1,86 @@
+# tests/test_benchmarks.py
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+from halter.core.services.config_io import load_project, save_project
+
+BENCHMARKS = Path(__file__).resolve().parents[1] / "benchmarks"
+SRC = BENCHMARKS.parent / "src"
+
+
+@pytest.fixture
+def synthetic(monkeypatch: pytest.MonkeyPatch) -> ModuleType:
+    monkeypatch.syspath_prepend(str(BENCHMARKS))
+    import synthetic
+
+    return synthetic
+
+
+# === Генератор проекта ===
+
+
+def test_generator_is_deterministic(synthetic: ModuleType) -> None:
+    shape = synthetic.ProjectShape(devices=30, networks=4, seed=7)
+
+    assert synthetic.generate_project(shape) == synthetic.generate_project(
+        shape
+    )
+    other = synthetic.ProjectShape(devices=30, networks=4, seed=8)
+    assert synthetic.generate_project(other) != synthetic.generate_project(
+        shape
+    )
+
+
+def test_generated_project_is_consistent(
+    synthetic: ModuleType, tmp_path: Path
+) -> None:
+    shape = synthetic.ProjectShape(devices=40, networks=3, prefix=26)
+    project = synthetic.generate_project(shape)
+
+    addresses = [i.address for d in project.devices for i in d.interfaces]
+    assert len(project.devices) == 40
+    assert len(set(addresses)) == len(addresses)
+    assert all(n.address.endswith("/26") for n in project.networks)
+
+    path = tmp_path / "project.yaml"
+    save_project(project, path)
+    assert len(load_project(path).devices) == 40
+
+
+def test_generator_rejects_small_subnets(synthetic: ModuleType) -> None:
+    shape = synthetic.ProjectShape(devices=20, networks=2, prefix=29)
+
+    with pytest.raises(ValueError, match="too few hosts"):
+        synthetic.generate_project(shape)
+
+
+# === Бенчмарк этапов ===
+
+
+def test_pipeline_benchmark_smoke(tmp_path: Path) -> None:
+    pytest.importorskip("openpyxl")
+    results = tmp_path / "results.json"
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    subprocess.run(
+        [
+            sys.executable,
+            str(BENCHMARKS / "bench_pipeline.py"),
+            "--devices=6",
+            "--networks=2",
+            "--repeat=1",
+            f"--save={results}",
+        ],
+        env=env,
+        check=True,
+        capture_output=True,
+    )
+
+    stages = [r["stage"] for r in json.loads(results.read_text())["results"]]
+    assert {"load_project", "firewall", "export_to_xlsx"} <= set(stages)
@@ -0,0 +1,125 @@
+# tests/test_cli_shell.py
+
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("typer")
+
+import typer
+from typer.testing import CliRunner
+
+from halter.cli import main
+from halter.cli.context import project_ref
+
+NETWORK_ADD = (
+    "network add --name {name} --description '' --topology Star "
+    "--tier Controllers --address-type 'IPv4 Network' "
+    "--address {address} --vlan-id 10 --vlan-name PLC --gateway {gateway}"
+)
+
+
+@pytest.fixture
+def runner() -> CliRunner:
+    project_ref.clear()
+    return CliRunner()
+
+
+def _script(tmp_path: Path, *lines: str) -> Path:
+    path = tmp_path / "script.txt"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def test_shell_runs_commands_on_one_project(
+    runner: CliRunner, tmp_path: Path
+) -> None:
+    script = _script(
+        tmp_path,
+        "# сети стенда",
+        NETWORK_ADD.format(
+            name="NET1", address="10.0.1.0/24", gateway="10.0.1.1"
+        ),
+        "",
+        NETWORK_ADD.format(
+            name="NET2", address="10.0.2.0/24", gateway="10.0.2.1"
+        ),
+        "network delete NET1",
+    )
+
+    result = runner.invoke(
+        main.app, ["-f", str(tmp_path / "p.yaml"), "shell", str(script)]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert [n.name for n in project_ref["active"].networks] == ["NET2"]
+    assert "3 command(s)" in result.output
+
+
+def test_shell_reads_stdin_and_reports_failures(
+    runner: CliRunner, tmp_path: Path
+) -> None:
+    result = runner.invoke(
+        main.app,
+        ["-f", str(tmp_path / "p.yaml"), "shell"],
+        input="bogus\nnetwork list\n",
+    )
+
+    assert result.exit_code == 1
+    assert "Unknown command 'bogus'" in result.output
+    assert "2 command(s)" in result.output
+    assert "1 failed" in result.output
+
+
+def test_shell_fail_fast_stops(runner: CliRunner, tmp_path: Path) -> None:
+    script = _script(tmp_path, "network add --name X", "network list")
+
+    result = runner.invoke(
+        main.app,
+        ["-f", str(tmp_path / "p.yaml"), "shell", "--fail-fast", str(script)],
+    )
+
+    assert result.exit_code == 1
+    assert "1 command(s)" in result.output
+
+
+def test_run_command_reports_project_errors_only() -> None:
+    from halter.cli.shell import run_command
+
+    class Failing:
+        def __init__(self, error: Exception) -> None:
+            self.error = error
+
+        def main(self, *args: object, **kwargs: object) -> None:
+            raise self.error
+
+    commands = {
+        "invalid": Failing(ValueError("bad address")),
+        "exit": Failing(typer.Exit(3)),
+        "bug": Failing(KeyError("bug")),
+    }
+
+    assert run_command(commands, "invalid") == 1
+    assert run_command(commands, "exit") == 3
+    with pytest.raises(KeyError, match="bug"):
+        run_command(commands, "bug")
+
+
+def test_each_run_resets_loaded_fingerprint(
+    runner: CliRunner, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def run(path: Path) -> None:
+        monkeypatch.setattr(
+            "sys.argv", ["halter-cli", "-f", str(path), "network", "list"]
+        )
+        with pytest.raises(SystemExit):
+            main.run()
+
+    first, second = tmp_path / "first.yaml", tmp_path / "second.yaml"
+    run(first)
+    run(first)
+    # Проект по умолчанию совпадает с загруженным из first.yaml, но
+    # second.yaml ещё нет - его надо записать
+    run(second)
+
+    assert second.is_file()
@@ -0,0 +1,35 @@
+# tests/test_cli_startup.py
+
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("typer")
+
+# Тяжёлые модули, которые должны грузиться только командами экспорта
+LAZY_MODULES = [
+    "openpyxl",
+    "concurrent.futures.process",
+    "rich.table",
+    "halter.core.services.export.netmap",
+    "halter.core.services.export.firewall",
+    "halter.core.services.export.network_config",
+    "halter.core.services.export.parallel",
+    "halter.core.services.export.incremental",
+]
+
+
+def test_cli_import_does_not_load_exporters() -> None:
+    code = (
+        "import sys, halter.cli.main; "
+        f"print(*[m for m in {LAZY_MODULES!r} if m in sys.modules])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"PYTHONPATH": ":".join(sys.path)},
+    )
+    assert result.stdout.split() == []
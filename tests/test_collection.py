@@ -0,0 +1,135 @@
+# tests/test_collection.py
+
+import pickle
+
+import pytest
+
+from halter.core.models.address import AddressingType
+from halter.core.models.collection import NamedList, name_map
+from halter.core.models.device import Device
+from halter.core.models.interface import NetworkInterface, VlanMode
+from halter.core.models.network import Network, NetworkTier, NetworkTopology
+from halter.core.models.project import Project
+from halter.core.models.software import Software
+from halter.core.services.config_io import to_dict
+
+
+def _network(name: str, i: int = 0) -> Network:
+    return Network(
+        name=name,
+        description="",
+        topology=NetworkTopology.STAR,
+        tier=NetworkTier.TIER_2,
+        address_type=AddressingType.IP_NETWORK,
+        address=f"10.0.{i}.0/24",
+        gateway=f"10.0.{i}.1",
+    )
+
+
+@pytest.fixture
+def project() -> Project:
+    return Project(
+        name="Plant",
+        description="",
+        networks=[_network("NET0", 0), _network("NET1", 1)],
+        devices=[
+            Device(
+                name="PLC-1",
+                description="",
+                model="",
+                role="PLC",
+                interfaces=[
+                    NetworkInterface(
+                        name="eth0",
+                        network_id="NET0",
+                        routes=["NET1"],
+                        address_type=AddressingType.IP_ADDRESS,
+                        address="10.0.0.5",
+                        vlan_mode=VlanMode.ACCESS,
+                        software_id="networking",
+                    )
+                ],
+                software_used=["plc_runtime"],
+            )
+        ],
+        software=[Software(name="plc_runtime", description="", version="1")],
+    )
+
+
+# === Индекс по имени ===
+
+
+def test_project_wraps_plain_lists(project: Project) -> None:
+    assert isinstance(project.networks, NamedList)
+    assert project.networks.get("NET1") is project.networks[1]
+
+    project.devices = []
+    assert isinstance(project.devices, NamedList)
+
+
+def test_index_follows_list_changes(project: Project) -> None:
+    networks = project.networks
+    networks.append(_network("NET2", 2))
+    assert networks.get("NET2") is networks[-1]
+
+    networks.pop(0)
+    assert networks.get("NET0") is None
+
+    networks[0] = _network("NET9", 9)
+    assert networks.names() == ["NET9", "NET2"]
+
+    del networks[:]
+    assert networks.get("NET9") is None
+
+
+def test_duplicate_names_keep_baseline_semantics() -> None:
+    first, second = _network("NET", 0), _network("NET", 1)
+    networks = NamedList([first, second])
+
+    # Поиск в CLI - первый, как перебором; экспортёры - последний,
+    # как словарь из списка
+    assert networks.get("NET") is first
+    assert name_map(networks)["NET"] is second
+    assert name_map([first, second])["NET"] is second
+    third = _network("NET", 2)
+    networks.append(third)
+    assert networks.get("NET") is first
+    assert name_map(networks)["NET"] is third
+    assert networks.remove_named("NET") == 3
+    assert networks == []
+
+
+def test_serialization_keeps_index(project: Project) -> None:
+    copy = pickle.loads(pickle.dumps(project))
+
+    assert copy == project
+    assert copy.networks.get("NET0") == project.networks[0]
+    assert to_dict(project)["networks"][0]["name"] == "NET0"
+
+
+# === Переименование ===
+
+
+def test_rename_network_updates_references(project: Project) -> None:
+    project.rename_network("NET1", "LAN")
+
+    iface = project.devices[0].interfaces[0]
+    assert project.networks.get("LAN") is project.networks[1]
+    assert project.networks.get("NET1") is None
+    assert iface.routes == ["LAN"]
+
+
+def test_rename_software_updates_devices(project: Project) -> None:
+    project.rename_software("plc_runtime", "runtime")
+
+    assert project.devices[0].software_used == ["runtime"]
+
+
+def test_rename_rejects_conflict_and_invalid_name(project: Project) -> None:
+    with pytest.raises(ValueError):
+        project.rename_network("NET0", "NET1")
+    with pytest.raises(ValueError):
+        project.rename_device("PLC-1", "NAME_IS_FAR_TOO_LONG")
+
+    assert project.devices.get("PLC-1") is project.devices[0]
+    assert project.devices[0].name == "PLC-1"
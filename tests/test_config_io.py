@@ -0,0 +1,274 @@
+# tests/test_config_io.py
+
+import pickle
+from pathlib import Path
+
+import pytest
+
+from halter.core.models.project import Project
+from halter.core.services import config_io
+from halter.core.services.config_io import (
+    ProjectLoadError,
+    atomic_write,
+    load_project,
+    load_project_fingerprinted,
+    project_fingerprint,
+    save_project,
+)
+from halter.core.services.snapshot import SNAPSHOT_VERSION, snapshot_path
+
+PROJECT_YAML = """\
+name: Plant
+description: Тестовый проект
+area_type:
+- MNS
+networks:
+- name: PLC_OSN
+  description: ''
+  vlan:
+    id: 10
+    name: PLC
+  topology: Star
+  tier: Controllers
+  address_type: IPv4 Network
+  address: 10.0.0.0/24
+  gateway: 10.0.0.1
+  area_type: []
+devices:
+- name: PLC-1
+  description: ''
+  model: ''
+  role: PLC
+  interfaces:
+  - name: eth0
+    routes: []
+    address_type: IPv4 Address
+    address: 10.0.0.5
+    vlan_mode: Access
+    software_id: networking
+    network_id: PLC_OSN
+  software_used: []
+  firewall_id: null
+  area_type: []
+software:
+- name: plc_runtime
+  description: ''
+  version: '1.0'
+  ports:
+  - index: 502
+    description: Modbus
+    direction: inbound
+    protocol: TCP
+areas: []
+"""
+
+
+@pytest.fixture
+def project_path(tmp_path: Path) -> Path:
+    path = tmp_path / "project.yaml"
+    path.write_text(PROJECT_YAML, encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def project(project_path: Path) -> Project:
+    return load_project(project_path)
+
+
+def test_yaml_round_trip(project: Project, project_path: Path) -> None:
+    save_project(project, project_path)
+
+    assert project_path.read_text(encoding="utf-8") == PROJECT_YAML
+    assert load_project(project_path) == project
+    assert not snapshot_path(project_path).exists()
+
+
+# === Бинарный снимок ===
+
+
+def test_snapshot_used_when_fresh(
+    project: Project, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "project.yaml"
+    save_project(project, path, cache=True)
+    assert snapshot_path(path).exists()
+
+    def fail(path: Path) -> Project:
+        raise AssertionError("YAML must not be parsed")
+
+    monkeypatch.setattr(config_io, "_load_project_yaml", fail)
+    assert load_project(path, cache=True) == project
+
+
+def test_stale_snapshot_falls_back_to_yaml(
+    project: Project, tmp_path: Path
+) -> None:
+    path = tmp_path / "project.yaml"
+    save_project(project, path, cache=True)
+
+    text = path.read_text(encoding="utf-8")
+    path.write_text(text.replace("name: Plant", "name: Plant2"), "utf-8")
+
+    loaded = load_project(path, cache=True)
+    assert loaded.name == "Plant2"
+    # Снимок пересоздан по новому содержимому
+    assert load_project(path, cache=True).name == "Plant2"
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        b"garbage",
+        pickle.dumps((1, 2, 3))[:-3],
+        pickle.dumps(["not", "a", "tuple"]),
+        pickle.dumps((1, 2)),
+        pickle.dumps((SNAPSHOT_VERSION, None, b"garbage")),
+    ],
+)
+def test_corrupt_snapshot_is_ignored(
+    project: Project, tmp_path: Path, payload: bytes
+) -> None:
+    path = tmp_path / "project.yaml"
+    save_project(project, path, cache=True)
+    snapshot_path(path).write_bytes(payload)
+
+    assert load_project(path, cache=True) == project
+
+
+def test_snapshot_bug_is_not_a_cache_miss(
+    project: Project, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "project.yaml"
+    save_project(project, path, cache=True)
+
+    def broken_load(f: object) -> object:
+        raise RuntimeError("bug")
+
+    monkeypatch.setattr(pickle, "load", broken_load)
+    with pytest.raises(RuntimeError, match="bug"):
+        load_project(path, cache=True)
+
+
+# === Отслеживание изменений и атомарная запись ===
+
+
+def test_fingerprint_tracks_changes(project: Project) -> None:
+    before = project_fingerprint(project)
+    assert project_fingerprint(project) == before
+
+    project.devices[0].interfaces[0].address = "10.0.0.6"
+    assert project_fingerprint(project) != before
+
+
+def test_snapshot_supplies_fingerprint(
+    project: Project, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "project.yaml"
+    save_project(project, path)
+    expected = project_fingerprint(project)
+
+    # Снимок записан при загрузке: хэш - от его байтов
+    assert load_project_fingerprinted(path, cache=True)[1] == expected
+
+    def fail(project: Project) -> bytes:
+        raise AssertionError("project must not be pickled again")
+
+    monkeypatch.setattr(config_io, "dump_project", fail)
+    loaded, fingerprint = load_project_fingerprinted(path, cache=True)
+    assert loaded == project
+    assert fingerprint == expected
+
+
+def test_atomic_write_keeps_old_file_on_failure(project_path: Path) -> None:
+    with pytest.raises(RuntimeError), atomic_write(project_path) as f:
+        f.write("name: broken")
+        raise RuntimeError("crash mid-save")
+
+    assert project_path.read_text(encoding="utf-8") == PROJECT_YAML
+    assert list(project_path.parent.iterdir()) == [project_path]
+
+
+# === Ошибки загрузки ===
+
+BROKEN_YAML = PROJECT_YAML.replace(
+    "devices:\n",
+    """\
+- name: BROKEN_NET
+  description: ''
+  topology: Nowhere
+  tier: Controllers
+  address_type: IPv4 Network
+  address: 10.0.1.0/24
+devices:
+- name: PLC-2
+  description: ''
+  model: ''
+  role: PLC
+  interfaces:
+  - name: eth0
+    address_type: IPv4 Address
+    address: 10.0.0.300
+    vlan_mode: Access
+    software_id: networking
+  - name: eth1
+    address_type: IPv4 Address
+    vlan_mode: Sideways
+    software_id: networking
+    speed: 1000
+""",
+).replace("    direction: inbound\n", "    direction: sideways\n")
+
+
+@pytest.fixture
+def broken_path(tmp_path: Path) -> Path:
+    path = tmp_path / "broken.yaml"
+    path.write_text(BROKEN_YAML, encoding="utf-8")
+    return path
+
+
+def test_load_reports_every_error_with_path(broken_path: Path) -> None:
+    with pytest.raises(ProjectLoadError) as excinfo:
+        load_project(broken_path)
+
+    assert [issue.path for issue in excinfo.value.issues] == [
+        "networks[1].topology",
+        "devices[0].interfaces[0].address",
+        "devices[0].interfaces[1].vlan_mode",
+        "devices[0].interfaces[1].speed",
+        "software[0].ports[0].direction",
+    ]
+    assert "'Nowhere' is not one of: " in str(excinfo.value)
+    assert excinfo.value.issues[1].message == (
+        "Invalid IPv4 address: 10.0.0.300"
+    )
+
+
+def test_load_valid_subset(broken_path: Path) -> None:
+    project = load_project(broken_path, cache=True, valid_subset=True)
+
+    assert [n.name for n in project.networks] == ["PLC_OSN"]
+    assert [d.name for d in project.devices] == ["PLC-1"]
+    assert project.software == []
+    # Неполный проект не должен попасть в снимок
+    assert not snapshot_path(broken_path).exists()
+
+
+def test_cli_load_valid_flag(broken_path: Path) -> None:
+    pytest.importorskip("typer")
+    from typer.testing import CliRunner
+
+    from halter.cli import main
+    from halter.cli.context import project_ref
+
+    runner = CliRunner()
+    result = runner.invoke(
+        main.app, ["-f", str(broken_path), "device", "list"]
+    )
+    assert "5 error(s)" in result.output
+
+    result = runner.invoke(
+        main.app, ["-f", str(broken_path), "--load-valid", "device", "list"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "PLC-1" in result.output
+    assert [d.name for d in project_ref["active"].devices] == ["PLC-1"]
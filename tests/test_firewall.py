@@ -0,0 +1,338 @@
+# tests/test_firewall.py
+
+from dataclasses import replace
+
+import pytest
+
+from halter.core.models.address import AddressingType
+from halter.core.models.device import Device
+from halter.core.models.firewall import (
+    Chain,
+    FirewallConfig,
+    FirewallRule,
+    IpSetType,
+    IptablesFormat,
+    RuleAction,
+)
+from halter.core.models.interface import NetworkInterface, VlanMode
+from halter.core.models.software import Direction, Port, Protocol, Software
+from halter.core.services.connectivity import build_connectivity_index
+from halter.core.services.export.firewall import (
+    _generate_rule,
+    generate_firewall_config_for_device,
+    generate_iptables_restore,
+    generate_iptables_script,
+    render_firewall,
+)
+from halter.core.services.firewall_optimizer import (
+    chunk_ports,
+    collect_ipsets,
+    optimize_rules,
+    port_spec,
+)
+
+# === Тестовые данные ===
+
+
+def _iface(
+    name: str, network_id: str, address: str, routes: list[str] | None = None
+) -> NetworkInterface:
+    return NetworkInterface(
+        name=name,
+        network_id=network_id,
+        routes=routes or [],
+        address_type=AddressingType.IP_ADDRESS,
+        address=address,
+        vlan_mode=VlanMode.ACCESS,
+        software_id="networking",
+    )
+
+
+@pytest.fixture
+def software() -> list[Software]:
+    return [
+        Software(
+            name="scada_server",
+            description="",
+            version="1.0",
+            ports=[
+                Port(
+                    index=502,
+                    description="Modbus",
+                    direction=Direction.In,
+                    protocol=Protocol.TCP,
+                )
+            ],
+        ),
+        Software(
+            name="scada_client",
+            description="",
+            version="1.0",
+            ports=[
+                Port(
+                    index=502,
+                    description="Modbus",
+                    direction=Direction.Out,
+                    protocol=Protocol.TCP,
+                )
+            ],
+        ),
+    ]
+
+
+@pytest.fixture
+def devices() -> list[Device]:
+    return [
+        Device(
+            name="SRV",
+            description="",
+            model="",
+            role="Workstation",
+            interfaces=[_iface("eth0", "HMI", "10.0.0.1")],
+            software_used=["scada_server"],
+            area_type=["MNS"],
+        ),
+        Device(
+            name="ARM",
+            description="",
+            model="",
+            role="Workstation",
+            interfaces=[_iface("eth0", "ARM", "10.0.1.1", routes=["HMI"])],
+            software_used=["scada_client"],
+            area_type=["MNS"],
+        ),
+        Device(
+            name="OTHER-AREA",
+            description="",
+            model="",
+            role="Workstation",
+            interfaces=[_iface("eth0", "HMI", "10.0.0.2")],
+            software_used=["scada_client"],
+            area_type=["PT"],
+        ),
+    ]
+
+
+# === Индекс связности ===
+
+
+def test_connectivity_index_maps(
+    devices: list[Device], software: list[Software]
+) -> None:
+    index = build_connectivity_index(devices, software)
+
+    assert index.devices_by_port[502] == {0, 1, 2}
+    assert index.devices_by_area["MNS"] == {0, 1}
+    assert index.devices_by_network["HMI"] == {0, 1, 2}
+    assert index.reach[1]["HMI"].address == "10.0.1.1"
+
+
+def test_peers_filter_by_area_and_self(
+    devices: list[Device], software: list[Software]
+) -> None:
+    index = build_connectivity_index(devices, software)
+
+    assert index.peers_of(devices[0]) == [1]
+    assert index.peers_of(devices[2]) == []
+
+
+# === Генерация правил ===
+
+
+def test_rules_for_routed_peer(
+    devices: list[Device], software: list[Software]
+) -> None:
+    config = generate_firewall_config_for_device(devices[0], software, devices)
+
+    assert (
+        FirewallRule(
+            chain=Chain.INPUT,
+            action=RuleAction.ACCEPT,
+            protocol="tcp",
+            destination_ports=[502],
+            source="10.0.1.1",
+        )
+        in config.rules
+    )
+    assert all(rule.source != "10.0.0.2" for rule in config.rules)
+
+
+def test_shared_index_gives_same_rules(
+    devices: list[Device], software: list[Software]
+) -> None:
+    index = build_connectivity_index(devices, software)
+
+    for device in devices:
+        assert generate_firewall_config_for_device(
+            device, software, devices, index
+        ) == generate_firewall_config_for_device(device, software, devices)
+
+
+# === Оптимизация правил ===
+
+
+def _accept(
+    ports: list[int], source: str, protocol: str = "tcp"
+) -> FirewallRule:
+    return FirewallRule(
+        chain=Chain.INPUT,
+        action=RuleAction.ACCEPT,
+        protocol=protocol,
+        destination_ports=ports,
+        source=source,
+    )
+
+
+def test_optimize_removes_duplicates_and_merges_ports() -> None:
+    rules = [
+        _accept([502], "10.0.0.1"),
+        _accept([502], "10.0.0.1"),
+        _accept([503, 504], "10.0.0.1"),
+        _accept([502], "10.0.0.1", protocol="udp"),
+    ]
+
+    assert optimize_rules(rules) == [
+        _accept([502, 503, 504], "10.0.0.1"),
+        _accept([502], "10.0.0.1", protocol="udp"),
+    ]
+
+
+def test_optimize_groups_sources_by_cidr() -> None:
+    rules = [_accept([502], f"10.0.0.{i}") for i in (4, 5, 6, 7, 9)]
+
+    assert [r.source for r in optimize_rules(rules)] == [
+        "10.0.0.4/30",
+        "10.0.0.9",
+    ]
+
+
+def test_optimize_keeps_order_across_actions() -> None:
+    drop = FirewallRule(
+        chain=Chain.INPUT,
+        action=RuleAction.DROP,
+        protocol="tcp",
+        destination_ports=[502],
+    )
+    rules = [_accept([502], "10.0.0.1"), drop, _accept([503], "10.0.0.1")]
+
+    assert optimize_rules(rules) == rules
+
+
+def test_ports_compact_into_ranges() -> None:
+    assert port_spec([5, 1, 2, 3, 7]) == ["1:3", "5", "7"]
+    # Диапазон занимает два места из 15
+    chunks = chunk_ports([*range(100, 110), *range(200, 228, 2)])
+    assert [len(port_spec(c)) for c in chunks] == [14, 1]
+
+
+def test_rule_renders_ranges_without_spaces() -> None:
+    line = _generate_rule(_accept([502, 1000, 1001, 1002], "10.0.0.1"))
+
+    assert "--match multiport --dports 502,1000:1002 " in line
+    assert "--dport 1000:1002 " in _generate_rule(
+        _accept([1000, 1001, 1002], "10.0.0.1")
+    )
+
+
+def test_generated_config_has_no_duplicates(
+    devices: list[Device], software: list[Software]
+) -> None:
+    # Второй интерфейс в той же сети раньше давал повтор правил
+    devices[0].interfaces.append(_iface("eth1", "HMI", "10.0.0.3"))
+
+    raw = generate_firewall_config_for_device(
+        devices[0], software, devices, optimize=False
+    )
+    config = generate_firewall_config_for_device(devices[0], software, devices)
+
+    assert len(config.rules) < len(raw.rules)
+    assert config.rules == optimize_rules(raw.rules)
+    assert len(config.rules) == len(
+        {_generate_rule(rule) for rule in config.rules}
+    )
+
+
+# === Наборы ipset ===
+
+
+def test_collect_ipsets_replaces_peer_rules() -> None:
+    peers = [f"10.0.0.{i}" for i in range(1, 6)]
+    config = FirewallConfig(
+        rules=[
+            *(_accept([502], peer) for peer in peers),
+            *(_accept([503], peer) for peer in peers),
+            _accept([504], "10.0.0.1"),
+        ]
+    )
+
+    result = collect_ipsets(config, min_members=4)
+
+    assert len(result.ipsets) == 1
+    ipset = result.ipsets[0]
+    assert ipset.set_type == IpSetType.HASH_IP
+    assert ipset.members == peers
+    # Одинаковый набор соседей - один ipset на оба порта
+    assert [(r.destination_ports, r.source_set) for r in result.rules] == [
+        ([502], ipset.name),
+        ([503], ipset.name),
+        ([504], None),
+    ]
+
+
+def test_ipset_script_loads_sets_before_rules() -> None:
+    config = FirewallConfig(
+        rules=[_accept([502], f"10.0.{i}.0/24") for i in range(4)]
+    )
+
+    script = generate_iptables_script(config, ipset=True)
+
+    assert "create halter_1 hash:net" in script
+    assert "add halter_1 10.0.3.0/24" in script
+    assert (
+        "iptables -A INPUT -p tcp --dport 502 "
+        "-m set --match-set halter_1 src -j ACCEPT"
+    ) in script
+    assert script.index("ipset -exist restore") < script.index("-A INPUT")
+    assert "ipset" not in generate_iptables_script(config)
+
+
+# === Формат iptables-restore ===
+
+
+def test_restore_format_matches_script_rules() -> None:
+    config = FirewallConfig(
+        rules=[_accept([502, 503], "10.0.0.1")],
+        default_policy_input=RuleAction.DROP,
+        default_policy_forward=RuleAction.DROP,
+    )
+
+    restore = generate_iptables_restore(config)
+    script = generate_iptables_script(config)
+
+    lines = restore.splitlines()
+    assert lines[1:5] == [
+        "*filter",
+        ":INPUT DROP [0:0]",
+        ":FORWARD DROP [0:0]",
+        ":OUTPUT ACCEPT [0:0]",
+    ]
+    assert lines[-1] == "COMMIT"
+    # Те же правила, что и в скрипте, только без вызова iptables
+    rules = [line for line in lines if line.startswith("-A ")]
+    assert rules
+    assert all(f"iptables {rule}" in script for rule in rules)
+
+
+def test_render_restore_writes_ipset_file(devices: list[Device]) -> None:
+    server = replace(devices[0], firewall_id="iptables")
+    config = FirewallConfig(
+        rules=[_accept([502], f"10.0.{i}.0/24") for i in range(4)]
+    )
+
+    files = render_firewall(
+        server, config, ipset=True, iptables_format=IptablesFormat.RESTORE
+    )
+
+    assert set(files) == {"iptables.rules", "ipset.rules"}
+    assert "create halter_1 hash:net" in files["ipset.rules"]
+    assert "--match-set halter_1 src" in files["iptables.rules"]
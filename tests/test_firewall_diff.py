@@ -0,0 +1,144 @@
+# tests/test_firewall_diff.py
+
+import copy
+from pathlib import Path
+
+import pytest
+
+from halter.core.models.address import AddressingType
+from halter.core.models.device import Device
+from halter.core.models.interface import NetworkInterface, VlanMode
+from halter.core.models.network import Network, NetworkTier, NetworkTopology
+from halter.core.models.project import Project
+from halter.core.models.software import Direction, Port, Protocol, Software
+from halter.core.services.config_io import save_project
+from halter.core.services.firewall_diff import diff_firewalls
+
+
+def _plc(i: int, network: str) -> Device:
+    return Device(
+        name=f"PLC-{i}",
+        description="",
+        model="",
+        role="PLC",
+        interfaces=[
+            NetworkInterface(
+                name="eth0",
+                network_id=network,
+                address_type=AddressingType.IP_ADDRESS,
+                address=f"10.0.{network[-1]}.{i + 1}",
+                vlan_mode=VlanMode.ACCESS,
+                software_id="networking",
+            )
+        ],
+        software_used=["plc_runtime"],
+        firewall_id="iptables",
+        area_type=["MNS"],
+    )
+
+
+@pytest.fixture
+def project() -> Project:
+    return Project(
+        name="Plant",
+        description="",
+        area_type=["MNS"],
+        networks=[
+            Network(
+                name=f"NET{i}",
+                description="",
+                topology=NetworkTopology.STAR,
+                tier=NetworkTier.TIER_2,
+                address_type=AddressingType.IP_NETWORK,
+                address=f"10.0.{i}.0/24",
+                gateway=f"10.0.{i}.254",
+            )
+            for i in range(2)
+        ],
+        software=[
+            Software(
+                name="plc_runtime",
+                description="",
+                version="1.0",
+                ports=[
+                    Port(
+                        index=502,
+                        description="Modbus",
+                        direction=Direction.Both,
+                        protocol=Protocol.TCP,
+                    )
+                ],
+            )
+        ],
+        devices=[_plc(0, "NET0"), _plc(1, "NET0"), _plc(2, "NET1")],
+    )
+
+
+def test_identical_revisions_recompute_nothing(project: Project) -> None:
+    diff = diff_firewalls(project, copy.deepcopy(project))
+
+    assert diff.devices == []
+    assert diff.recomputed == 0
+    assert diff.unchanged == 3
+
+
+def test_new_peer_adds_rules_only_where_connected(project: Project) -> None:
+    new = copy.deepcopy(project)
+    new.devices.append(_plc(3, "NET0"))
+
+    diff = diff_firewalls(project, new)
+
+    changed = {d.device: d for d in diff.devices}
+    assert sorted(changed) == ["PLC-0", "PLC-1", "PLC-3"]
+    # PLC-2 в другой сети: входы не изменились, правила не пересчитаны
+    assert diff.recomputed == 3
+    assert changed["PLC-3"].old_backend is None
+    assert changed["PLC-0"].removed == []
+    assert {r.source or r.destination for r in changed["PLC-0"].added} == {
+        "10.0.0.4"
+    }
+
+
+def test_removed_device_and_backend_change(project: Project) -> None:
+    new = copy.deepcopy(project)
+    new.devices.remove_named("PLC-1")
+    device = new.devices.get("PLC-0")
+    assert device is not None
+    device.firewall_id = "nftables"
+
+    diff = diff_firewalls(project, new)
+
+    changed = {d.device: d for d in diff.devices}
+    assert changed["PLC-1"].new_backend is None
+    assert changed["PLC-1"].added == []
+    assert changed["PLC-1"].removed
+    assert changed["PLC-0"].old_backend == "iptables"
+    assert changed["PLC-0"].new_backend == "nftables"
+
+
+def test_firewall_diff_command(project: Project, tmp_path: Path) -> None:
+    pytest.importorskip("typer")
+    from typer.testing import CliRunner
+
+    from halter.cli import main
+
+    old_path, new_path = tmp_path / "old.yaml", tmp_path / "new.yaml"
+    save_project(project, old_path)
+    project.devices.append(_plc(3, "NET0"))
+    save_project(project, new_path)
+
+    result = CliRunner().invoke(
+        main.app,
+        [
+            "-f",
+            str(tmp_path / "none.yaml"),
+            "firewall-diff",
+            str(old_path),
+            str(new_path),
+            "--exit-code",
+        ],
+    )
+
+    assert result.exit_code == 1, result.output
+    assert "+ -A INPUT" in result.output
+    assert "3 device(s) changed" in result.output
@@ -0,0 +1,246 @@
+# tests/test_ipam.py
+
+import ipaddress
+from pathlib import Path
+
+import pytest
+
+from halter.core.models.address import AddressingType
+from halter.core.models.device import Device
+from halter.core.models.interface import NetworkInterface, VlanMode
+from halter.core.models.network import Network, NetworkTier, NetworkTopology
+from halter.core.models.project import Project
+from halter.core.services.ipam import (
+    AddressPool,
+    build_ipam,
+    format_ranges,
+)
+from halter.core.validation.address_validators import parse_range
+
+
+def _network(name: str, address: str, **kwargs: object) -> Network:
+    return Network(
+        name=name,
+        description="",
+        topology=NetworkTopology.STAR,
+        tier=NetworkTier.TIER_2,
+        address_type=AddressingType.IP_NETWORK,
+        address=address,
+        **kwargs,  # type: ignore[arg-type]
+    )
+
+
+def _device(name: str, network: str, address: str) -> Device:
+    return Device(
+        name=name,
+        description="",
+        model="",
+        role="PLC",
+        interfaces=[
+            NetworkInterface(
+                name="eth0",
+                network_id=network,
+                address_type=AddressingType.IP_ADDRESS,
+                address=address,
+                vlan_mode=VlanMode.ACCESS,
+                software_id="networking",
+            )
+        ],
+    )
+
+
+@pytest.fixture
+def project() -> Project:
+    return Project(
+        name="Plant",
+        description="",
+        area_type=["MNS"],
+        networks=[
+            _network(
+                "NET0",
+                "10.0.0.0/29",
+                gateway="10.0.0.1",
+                reserved=["10.0.0.5-10.0.0.6"],
+            )
+        ],
+        devices=[
+            _device("PLC-1", "NET0", "10.0.0.2"),
+            _device("PLC-2", "NET0", "10.0.0.3"),
+            _device("PLC-3", "NET0", "10.0.0.3"),
+        ],
+    )
+
+
+# === Пул адресов ===
+
+
+def test_pool_skips_network_broadcast_and_gateway() -> None:
+    pool = AddressPool.from_network(
+        _network("NET", "192.168.1.0/30", gateway="192.168.1.1")
+    )
+
+    assert pool.free_count() == 1
+    assert pool.next_free() == ipaddress.IPv4Address("192.168.1.2")
+    assert pool.allocate() == [ipaddress.IPv4Address("192.168.1.2")]
+    assert pool.next_free() is None
+    with pytest.raises(ValueError, match="0 free"):
+        pool.allocate()
+
+
+def test_pool_bulk_allocate_fills_gaps_in_order() -> None:
+    pool = AddressPool.from_network(_network("NET", "10.1.0.0/16"))
+    pool.reserve("10.1.0.1", "10.1.0.9")
+    pool.assign("10.1.0.11", "PLC/eth0")
+
+    addresses = pool.allocate(3)
+
+    assert [str(a) for a in addresses] == [
+        "10.1.0.10",
+        "10.1.0.12",
+        "10.1.0.13",
+    ]
+    assert pool.free_count() == 2**16 - 2 - 9 - 4
+
+
+def test_reserve_rejects_assigned_addresses() -> None:
+    pool = AddressPool.from_network(_network("NET", "10.0.0.0/24"))
+    pool.assign("10.0.0.20", "PLC/eth0")
+
+    with pytest.raises(ValueError, match=r"10\.0\.0\.20 \(PLC/eth0\)"):
+        pool.reserve("10.0.0.10", "10.0.0.30")
+    with pytest.raises(ValueError, match="outside"):
+        pool.reserve("10.0.1.1", "10.0.1.2")
+
+    assert [str(a) for a in pool.conflicts("10.0.0.0", "10.0.0.20")] == [
+        "10.0.0.0",
+        "10.0.0.20",
+    ]
+
+
+def test_range_helpers() -> None:
+    assert parse_range("10.0.0.5") == ("10.0.0.5", "10.0.0.5")
+    assert parse_range("10.0.0.5 - 10.0.0.9") == ("10.0.0.5", "10.0.0.9")
+    with pytest.raises(ValueError):
+        parse_range("10.0.0.300")
+    with pytest.raises(ValueError, match="empty"):
+        parse_range("10.0.0.9-10.0.0.5")
+    addresses = [ipaddress.IPv4Address(f"10.0.0.{i}") for i in (7, 3, 4, 5)]
+    assert format_ranges(addresses) == ["10.0.0.3-10.0.0.5", "10.0.0.7"]
+
+
+@pytest.mark.parametrize(
+    ("address", "reserved", "match"),
+    [
+        ("10.0.0.0/24", ["10.0.0.x"], "10.0.0.x"),
+        ("10.0.0.0/24", ["10.0.1.5"], "outside"),
+        ("10.0.0.0/24", ["10.0.0.9-10.0.0.5"], "empty"),
+        ("fd00::/64", ["fd00::5"], "IPv4 network"),
+    ],
+)
+def test_network_rejects_bad_reserved(
+    address: str, reserved: list[str], match: str
+) -> None:
+    with pytest.raises(ValueError, match=match):
+        _network("NET", address, reserved=reserved)
+
+
+# === Пулы проекта ===
+
+
+def test_build_ipam_reports_conflicts(project: Project) -> None:
+    ipam = build_ipam(project)
+
+    assert [(c.address, c.owners) for c in ipam.conflicts] == [
+        ("10.0.0.3", ["PLC-2/eth0", "PLC-3/eth0"])
+    ]
+    pool = ipam.pool("NET0")
+    # .0, .1 (шлюз), .2, .3, .5, .6 и .7 заняты
+    assert [str(a) for a in pool.allocate(1)] == ["10.0.0.4"]
+    with pytest.raises(ValueError, match="no IPv4 address pool"):
+        ipam.pool("MISSING")
+
+
+def test_build_ipam_skips_ipv6_networks(project: Project) -> None:
+    project.networks.append(_network("NET6", "fd00::/64"))
+    project.devices.append(_device("PLC-6", "NET6", "fd00::2"))
+
+    ipam = build_ipam(project)
+
+    assert list(ipam.pools) == ["NET0"]
+    with pytest.raises(ValueError, match="no IPv4 address pool"):
+        ipam.pool("NET6")
+
+
+# === CLI ===
+
+
+def test_cli_allocate_and_auto_ip(project: Project, tmp_path: Path) -> None:
+    pytest.importorskip("typer")
+    from typer.testing import CliRunner
+
+    from halter.cli import main
+    from halter.cli.context import project_ref
+    from halter.core.services.config_io import save_project
+
+    path = tmp_path / "project.yaml"
+    project.devices.remove_named("PLC-3")
+    project.networks[0].reserved.clear()
+    # Сеть IPv6 не мешает выделению адресов в сетях IPv4
+    project.networks.append(_network("NET6", "fd00::/64"))
+    save_project(project, path)
+    runner = CliRunner()
+
+    result = runner.invoke(
+        main.app, ["-f", str(path), "network", "allocate", "NET0"]
+    )
+    assert result.exit_code == 0, result.output
+    assert project_ref["active"].networks[0].reserved == ["10.0.0.4"]
+
+    result = runner.invoke(
+        main.app, ["-f", str(path), "network", "allocate", "NET6"]
+    )
+    assert result.exit_code == 1
+    assert "no IPv4 address pool" in result.output
+
+    result = runner.invoke(
+        main.app,
+        [
+            "-f",
+            str(path),
+            "network",
+            "allocate",
+            "NET0",
+            "--reserve",
+            "10.0.0.2",
+        ],
+    )
+    assert result.exit_code == 1
+    assert "PLC-1/eth0" in result.output
+
+    result = runner.invoke(
+        main.app,
+        [
+            "-f",
+            str(path),
+            "device",
+            "add",
+            "--name",
+            "PLC-4",
+            "--description",
+            "",
+            "--model",
+            "",
+            "--role",
+            "PLC",
+            "--interfaces",
+            "2",
+            "--auto-ip",
+        ],
+        input="".join(
+            f"{iface}\nNET0\n\n\nnetworking\n" for iface in ("eth0", "eth1")
+        ),
+    )
+    assert result.exit_code == 0, result.output
+    device = project_ref["active"].devices.get("PLC-4")
+    assert device is not None
+    assert [i.address for i in device.interfaces] == ["10.0.0.4", "10.0.0.5"]
@@ -0,0 +1,107 @@
+# tests/test_netmap.py
+
+from pathlib import Path
+
+import pytest
+from openpyxl import load_workbook
+
+from halter.core.models.address import AddressingType
+from halter.core.models.area import Area
+from halter.core.models.device import Device
+from halter.core.models.interface import NetworkInterface, VlanMode
+from halter.core.models.network import (
+    VLAN,
+    Network,
+    NetworkTier,
+    NetworkTopology,
+)
+from halter.core.models.project import Project
+from halter.core.services.export.netmap import NetmapLayout, export_to_xlsx
+
+
+@pytest.fixture
+def project() -> Project:
+    return Project(
+        name="Plant",
+        description="",
+        area_type=["MNS"],
+        areas=[Area(name="MNS", description="МНС")],
+        networks=[
+            Network(
+                name="PLC_OSN",
+                description="Сеть ПЛК (Основной канал)",
+                vlan=VLAN(id=10, name="PLC"),
+                topology=NetworkTopology.STAR,
+                tier=NetworkTier.TIER_2,
+                address_type=AddressingType.IP_NETWORK,
+                address="10.0.0.0/28",
+                gateway="10.0.0.1",
+                area_type=["MNS"],
+            )
+        ],
+        devices=[
+            Device(
+                name="PLC-1",
+                description="ПЛК 1",
+                model="Regul R500",
+                role="PLC",
+                interfaces=[
+                    NetworkInterface(
+                        name="eth0",
+                        network_id="PLC_OSN",
+                        address_type=AddressingType.IP_ADDRESS,
+                        address="10.0.0.5",
+                        vlan_mode=VlanMode.ACCESS,
+                        software_id="regul_networking",
+                    )
+                ],
+            )
+        ],
+    )
+
+
+def _values(path: Path) -> dict[str, list[tuple[object, ...]]]:
+    wb = load_workbook(path)
+    return {
+        ws.title: list(ws.iter_rows(values_only=True)) for ws in wb.worksheets
+    }
+
+
+def test_streaming_export_matches_regular(
+    project: Project, tmp_path: Path
+) -> None:
+    regular = tmp_path / "regular.xlsx"
+    streaming = tmp_path / "streaming.xlsx"
+
+    export_to_xlsx(project, str(regular))
+    export_to_xlsx(project, str(streaming), streaming=True)
+
+    assert _values(streaming) == _values(regular)
+
+    ws = load_workbook(streaming)["MNS"]
+    assert ws.freeze_panes == "A3"
+    assert "A3:A17" in {str(r) for r in ws.merged_cells.ranges}
+    # 10.0.0.5 - занятый адрес, шестая строка блока
+    assert ws["B8"].value == "ПЛК 1"
+    assert ws["G8"].value == "PLC-1"
+    assert ws["B9"].font.color.rgb == "00FFFFFF"
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_compact_layout_collapses_free_ranges(
+    project: Project, tmp_path: Path, streaming: bool
+) -> None:
+    path = tmp_path / "compact.xlsx"
+
+    export_to_xlsx(
+        project, str(path), streaming=streaming, layout=NetmapLayout.COMPACT
+    )
+
+    rows = _values(path)["MNS"]
+    assert [row[1:3] for row in rows[3:-1]] == [
+        ("Не используется", "10.0.0.1"),
+        ("Не используется (хостов: 3)", "10.0.0.2–10.0.0.4"),
+        ("ПЛК 1", "10.0.0.5"),
+        ("Не используется (хостов: 9)", "10.0.0.6–10.0.0.14"),
+    ]
+    assert rows[3][4] == "Шлюз"
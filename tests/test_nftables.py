@@ -0,0 +1,153 @@
+# tests/test_nftables.py
+
+from pathlib import Path
+
+from halter.core.models.address import AddressingType
+from halter.core.models.device import Device
+from halter.core.models.firewall import (
+    Chain,
+    FirewallConfig,
+    FirewallRule,
+    RuleAction,
+)
+from halter.core.models.interface import NetworkInterface, VlanMode
+from halter.core.models.network import Network, NetworkTier, NetworkTopology
+from halter.core.models.project import Project
+from halter.core.models.software import Direction, Port, Protocol, Software
+from halter.core.services.export.firewall import (
+    export_firewall_configs,
+    generate_firewall_config_for_device,
+)
+from halter.core.services.export.nftables import generate_nftables_ruleset
+
+
+def _accept(ports: list[int], source: str) -> FirewallRule:
+    return FirewallRule(
+        chain=Chain.INPUT,
+        action=RuleAction.ACCEPT,
+        protocol="tcp",
+        destination_ports=ports,
+        source=source,
+    )
+
+
+# === Набор правил ===
+
+
+def test_ruleset_replaces_table_atomically() -> None:
+    ruleset = generate_nftables_ruleset(
+        FirewallConfig(default_policy_input=RuleAction.DROP)
+    )
+
+    assert ruleset.startswith("#!/usr/sbin/nft -f")
+    head = ruleset.index("table inet halter\ndelete table inet halter")
+    assert head < ruleset.index("table inet halter {")
+    assert "type filter hook input priority filter; policy drop;" in ruleset
+    assert "type filter hook output priority filter; policy accept;" in ruleset
+
+
+def test_peer_rules_fold_into_verdict_map() -> None:
+    config = FirewallConfig(
+        rules=[
+            _accept([502], "10.0.0.1"),
+            _accept([502, 1000, 1001], "10.0.0.2"),
+            FirewallRule(
+                chain=Chain.INPUT,
+                action=RuleAction.DROP,
+                protocol="tcp",
+                destination_ports=[22],
+            ),
+        ]
+    )
+
+    ruleset = generate_nftables_ruleset(config)
+
+    assert "ip saddr . tcp dport vmap @input_tcp_1" in ruleset
+    assert "10.0.0.1 . 502 : accept" in ruleset
+    assert "10.0.0.2 . 1000-1001 : accept" in ruleset
+    # DROP идёт после map, порядок серий сохраняется
+    assert ruleset.index("vmap @input_tcp_1") < ruleset.index(
+        "tcp dport 22 drop"
+    )
+
+
+def test_security_rules_translate() -> None:
+    device = Device(
+        name="PLC-1", description="", model="", role="PLC", interfaces=[]
+    )
+    config = generate_firewall_config_for_device(device, [], [device])
+
+    ruleset = generate_nftables_ruleset(config)
+
+    assert 'iif "lo" accept' in ruleset
+    assert "ct state { established, related } accept" in ruleset
+    assert "ct state new tcp flags & (fin|syn|rst|ack) != syn drop" in ruleset
+    assert "icmp type echo-request accept" in ruleset
+
+
+# === Экспорт ===
+
+
+def test_export_selects_backend_by_firewall_id(tmp_path: Path) -> None:
+    def device(name: str, address: str, firewall_id: str) -> Device:
+        return Device(
+            name=name,
+            description="",
+            model="",
+            role="PLC",
+            interfaces=[
+                NetworkInterface(
+                    name="eth0",
+                    network_id="NET",
+                    address_type=AddressingType.IP_ADDRESS,
+                    address=address,
+                    vlan_mode=VlanMode.ACCESS,
+                    software_id="networking",
+                )
+            ],
+            software_used=["modbus"],
+            firewall_id=firewall_id,
+            area_type=["MNS"],
+        )
+
+    project = Project(
+        name="Plant",
+        description="",
+        networks=[
+            Network(
+                name="NET",
+                description="",
+                topology=NetworkTopology.STAR,
+                tier=NetworkTier.TIER_2,
+                address_type=AddressingType.IP_NETWORK,
+                address="10.0.0.0/24",
+            )
+        ],
+        devices=[
+            device("NFT", "10.0.0.1", "nftables"),
+            device("IPT", "10.0.0.2", "iptables"),
+        ],
+        software=[
+            Software(
+                name="modbus",
+                description="",
+                version="1",
+                ports=[
+                    Port(
+                        index=502,
+                        description="",
+                        direction=Direction.Both,
+                        protocol=Protocol.TCP,
+                    )
+                ],
+            )
+        ],
+    )
+
+    export_firewall_configs(project, tmp_path)
+
+    nft_dir = tmp_path / "Plant" / "NFT"
+    assert [p.name for p in nft_dir.iterdir()] == ["nftables.nft"]
+    ruleset = (nft_dir / "nftables.nft").read_text(encoding="utf-8")
+    assert "ip saddr 10.0.0.2 tcp dport 502 accept" in ruleset
+    assert (tmp_path / "Plant" / "IPT" / "iptables.sh").exists()
@@ -0,0 +1,207 @@
+# tests/test_parallel_export.py
+
+from pathlib import Path
+
+import pytest
+
+from halter.core.models.address import AddressingType
+from halter.core.models.device import Device
+from halter.core.models.firewall import IptablesFormat
+from halter.core.models.interface import NetworkInterface, VlanMode
+from halter.core.models.network import Network, NetworkTier, NetworkTopology
+from halter.core.models.project import Project
+from halter.core.models.software import Direction, Port, Protocol, Software
+from halter.core.services.export.firewall import export_firewall_configs
+from halter.core.services.export.incremental import (
+    MANIFEST_NAME,
+    export_configs_incremental,
+)
+from halter.core.services.export.network_config import (
+    export_networking_configs,
+)
+from halter.core.services.export.parallel import export_configs_parallel
+
+
+@pytest.fixture
+def project() -> Project:
+    networks = [
+        Network(
+            name=f"NET{i}",
+            description="",
+            topology=NetworkTopology.STAR,
+            tier=NetworkTier.TIER_2,
+            address_type=AddressingType.IP_NETWORK,
+            address=f"10.0.{i}.0/24",
+            gateway=f"10.0.{i}.254",
+        )
+        for i in range(2)
+    ]
+    software = [
+        Software(
+            name="plc_runtime",
+            description="",
+            version="1.0",
+            ports=[
+                Port(
+                    index=502,
+                    description="Modbus",
+                    direction=Direction.Both,
+                    protocol=Protocol.TCP,
+                )
+            ],
+        )
+    ]
+    devices = [
+        Device(
+            name=f"PLC-{i}",
+            description="",
+            model="",
+            role="PLC",
+            interfaces=[
+                NetworkInterface(
+                    name="eth0",
+                    network_id=f"NET{i % 2}",
+                    routes=[f"NET{(i + 1) % 2}"],
+                    address_type=AddressingType.IP_ADDRESS,
+                    address=f"10.0.{i % 2}.{i + 1}",
+                    vlan_mode=VlanMode.ACCESS,
+                    software_id="networking",
+                )
+            ],
+            software_used=["plc_runtime"],
+            firewall_id="iptables",
+            area_type=["MNS"],
+        )
+        for i in range(6)
+    ]
+    return Project(
+        name="Plant",
+        description="",
+        area_type=["MNS"],
+        networks=networks,
+        devices=devices,
+        software=software,
+    )
+
+
+def _read_tree(root: Path) -> dict[str, bytes]:
+    return {
+        str(p.relative_to(root)): p.read_bytes()
+        for p in root.rglob("*")
+        if p.is_file()
+    }
+
+
+def test_parallel_export_matches_serial(
+    project: Project, tmp_path: Path
+) -> None:
+    serial_dir = tmp_path / "serial"
+    parallel_dir = tmp_path / "parallel"
+
+    export_networking_configs(project=project, output_dir=serial_dir)
+    export_firewall_configs(project=project, output_dir=serial_dir)
+    results = export_configs_parallel(project, parallel_dir, jobs=2)
+
+    assert all(r.error is None for r in results)
+    assert _read_tree(parallel_dir) == _read_tree(serial_dir)
+
+
+def test_parallel_export_collects_errors(
+    project: Project, tmp_path: Path
+) -> None:
+    project.devices[0].interfaces[0].software_id = "unknown"
+
+    results = export_configs_parallel(project, tmp_path, jobs=2)
+
+    failed = [r for r in results if r.error is not None]
+    assert [r.device for r in failed] == ["PLC-0"]
+    assert "No handler registered" in (failed[0].error or "")
+    assert len(results) == len(project.devices)
+
+
+def test_parallel_export_propagates_programming_errors(
+    project: Project, tmp_path: Path
+) -> None:
+    project.software[0].ports[0].index = None  # type: ignore[assignment]
+
+    with pytest.raises(TypeError):
+        export_configs_parallel(project, tmp_path, jobs=2)
+
+
+# === Инкрементальный экспорт ===
+
+
+def _mtimes(root: Path) -> dict[str, int]:
+    return {
+        str(p.relative_to(root)): p.stat().st_mtime_ns
+        for p in root.rglob("*")
+        if p.is_file() and p.name != MANIFEST_NAME
+    }
+
+
+def test_incremental_export_matches_full(
+    project: Project, tmp_path: Path
+) -> None:
+    full_dir = tmp_path / "full"
+    incremental_dir = tmp_path / "incremental"
+
+    export_networking_configs(project=project, output_dir=full_dir)
+    export_firewall_configs(project=project, output_dir=full_dir)
+    result = export_configs_incremental(project, incremental_dir)
+
+    assert len(result.written) == len(project.devices)
+    tree = _read_tree(incremental_dir)
+    assert tree.pop(f"Plant/{MANIFEST_NAME}")
+    assert tree == _read_tree(full_dir)
+
+
+def test_incremental_export_propagates_programming_errors(
+    project: Project, tmp_path: Path
+) -> None:
+    project.software[0].ports[0].index = None  # type: ignore[assignment]
+
+    with pytest.raises(TypeError):
+        export_configs_incremental(project, tmp_path)
+
+
+def test_incremental_export_skips_unchanged(
+    project: Project, tmp_path: Path
+) -> None:
+    export_configs_incremental(project, tmp_path)
+    before = _mtimes(tmp_path)
+
+    result = export_configs_incremental(project, tmp_path)
+
+    assert result.written == []
+    assert len(result.unchanged) == len(project.devices)
+    assert _mtimes(tmp_path) == before
+
+
+def test_incremental_export_follows_peers(
+    project: Project, tmp_path: Path
+) -> None:
+    export_configs_incremental(project, tmp_path)
+
+    # Новый адрес PLC-5 меняет его интерфейсы и правила всех соседей
+    project.devices[5].interfaces[0].address = "10.0.1.100"
+    result = export_configs_incremental(project, tmp_path, jobs=2)
+
+    assert sorted(result.written) == [d.name for d in project.devices]
+    project.description = "changed"
+    assert export_configs_incremental(project, tmp_path).written == []
+
+
+def test_incremental_export_removes_stale_files(
+    project: Project, tmp_path: Path
+) -> None:
+    export_configs_incremental(project, tmp_path)
+    project.devices.remove_named("PLC-0")
+
+    result = export_configs_incremental(
+        project, tmp_path, iptables_format=IptablesFormat.RESTORE
+    )
+
+    assert not (tmp_path / "Plant" / "PLC-0").exists()
+    assert not (tmp_path / "Plant" / "PLC-1" / "iptables.sh").exists()
+    assert (tmp_path / "Plant" / "PLC-1" / "iptables.rules").is_file()
+    assert "PLC-0/interfaces" in result.removed
@@ -0,0 +1,137 @@
+# tests/test_project_check.py
+
+from pathlib import Path
+
+import pytest
+
+from halter.core.models.address import AddressingType
+from halter.core.models.device import Device
+from halter.core.models.interface import NetworkInterface, VlanMode
+from halter.core.models.network import Network, NetworkTier, NetworkTopology
+from halter.core.models.project import Project
+from halter.core.services.project_check import (
+    check_project,
+    find_duplicate_addresses,
+    find_network_overlaps,
+)
+
+
+def _network(name: str, address: str) -> Network:
+    return Network(
+        name=name,
+        description="",
+        topology=NetworkTopology.STAR,
+        tier=NetworkTier.TIER_2,
+        address_type=AddressingType.IP_NETWORK,
+        address=address,
+    )
+
+
+def _device(name: str, *addresses: str) -> Device:
+    return Device(
+        name=name,
+        description="",
+        model="",
+        role="PLC",
+        interfaces=[
+            NetworkInterface(
+                name=f"eth{i}",
+                network_id="NET",
+                address_type=AddressingType.IP_ADDRESS,
+                address=address,
+                vlan_mode=VlanMode.ACCESS,
+                software_id="networking",
+            )
+            for i, address in enumerate(addresses)
+        ],
+    )
+
+
+def _project(networks: list[Network], devices: list[Device]) -> Project:
+    return Project(
+        name="Plant",
+        description="",
+        area_type=["MNS"],
+        networks=networks,
+        devices=devices,
+    )
+
+
+def test_duplicate_addresses_grouped_by_address() -> None:
+    project = _project(
+        [],
+        [
+            _device("PLC-1", "10.0.0.1", "10.0.1.1"),
+            _device("PLC-2", "10.0.0.2"),
+            _device("PLC-3", "10.0.0.1"),
+            _device("PLC-4", "10.0.1.1"),
+        ],
+    )
+
+    duplicates = find_duplicate_addresses(project)
+
+    assert [(d.address, d.owners) for d in duplicates] == [
+        ("10.0.0.1", ["PLC-1/eth0", "PLC-3/eth0"]),
+        ("10.0.1.1", ["PLC-1/eth1", "PLC-4/eth0"]),
+    ]
+
+
+def test_network_overlaps_report_every_enclosing_network() -> None:
+    project = _project(
+        [
+            _network("SMALL", "10.0.1.0/26"),
+            _network("WIDE", "10.0.0.0/16"),
+            _network("OTHER", "192.168.0.0/24"),
+            _network("MID", "10.0.1.0/24"),
+            _network("MID-COPY", "10.0.1.0/24"),
+            _network("NEXT", "10.1.0.0/24"),
+        ],
+        [],
+    )
+
+    overlaps = find_network_overlaps(project)
+
+    assert sorted((o.outer, o.inner) for o in overlaps) == [
+        ("MID", "MID-COPY"),
+        ("MID", "SMALL"),
+        ("MID-COPY", "SMALL"),
+        ("WIDE", "MID"),
+        ("WIDE", "MID-COPY"),
+        ("WIDE", "SMALL"),
+    ]
+    assert [o.identical for o in overlaps if o.inner == "MID-COPY"] == [
+        False,
+        True,
+    ]
+
+
+def test_clean_project_passes() -> None:
+    project = _project(
+        [_network("A", "10.0.0.0/24"), _network("B", "10.0.1.0/24")],
+        [_device("PLC-1", "10.0.0.1"), _device("PLC-2", "10.0.1.1")],
+    )
+
+    assert check_project(project).ok
+
+
+def test_check_command_exit_code(tmp_path: Path) -> None:
+    pytest.importorskip("typer")
+    from typer.testing import CliRunner
+
+    from halter.cli import main
+    from halter.core.services.config_io import save_project
+
+    path = tmp_path / "project.yaml"
+    save_project(
+        _project(
+            [_network("A", "10.0.0.0/24"), _network("B", "10.0.0.128/25")],
+            [_device("PLC-1", "10.0.0.1"), _device("PLC-2", "10.0.0.1")],
+        ),
+        path,
+    )
+
+    result = CliRunner().invoke(main.app, ["-f", str(path), "check"])
+
+    assert result.exit_code == 1
+    assert "Duplicate address 10.0.0.1" in result.output
+    assert "1 duplicate address(es), 1 network overlap(s)" in result.output
@@ -0,0 +1,145 @@
+# tests/test_reachability.py
+
+from pathlib import Path
+
+import pytest
+
+from halter.core.models.address import AddressingType
+from halter.core.models.device import Device
+from halter.core.models.interface import NetworkInterface, VlanMode
+from halter.core.models.project import Project
+from halter.core.models.software import Direction, Port, Protocol, Software
+from halter.core.services.connectivity import build_connectivity_index
+from halter.core.services.reachability import (
+    PathHop,
+    build_reachability_graph,
+)
+
+
+def _device(
+    name: str, network: str, routes: list[str], software: list[str]
+) -> Device:
+    return Device(
+        name=name,
+        description="",
+        model="",
+        role="PLC",
+        interfaces=[
+            NetworkInterface(
+                name="eth0",
+                network_id=network,
+                routes=routes,
+                address_type=AddressingType.IP_ADDRESS,
+                address="10.0.0.1",
+                vlan_mode=VlanMode.ACCESS,
+                software_id="networking",
+            )
+        ],
+        software_used=software,
+    )
+
+
+def _software(name: str, port: int) -> Software:
+    return Software(
+        name=name,
+        description="",
+        version="1.0",
+        ports=[
+            Port(
+                index=port,
+                description="",
+                direction=Direction.Both,
+                protocol=Protocol.TCP,
+            )
+        ],
+    )
+
+
+@pytest.fixture
+def project() -> Project:
+    # FIELD -> CTRL -> SCADA, обратных маршрутов нет
+    return Project(
+        name="Plant",
+        description="",
+        area_type=["MNS"],
+        software=[_software("modbus", 502), _software("opc", 4840)],
+        devices=[
+            _device("IO-1", "FIELD", ["CTRL"], ["modbus"]),
+            _device("PLC-1", "CTRL", ["SCADA"], ["modbus", "opc"]),
+            _device("HMI-1", "SCADA", [], ["opc"]),
+            _device("IO-2", "FIELD", [], ["modbus"]),
+        ],
+    )
+
+
+def test_closure_follows_routes_transitively(project: Project) -> None:
+    graph = build_reachability_graph(project)
+
+    assert graph.reachable_networks("FIELD") == {"FIELD", "CTRL", "SCADA"}
+    assert graph.reachable_networks("SCADA") == {"SCADA"}
+    # Повторный запрос берётся из кэша
+    assert graph.reachable_networks("FIELD") is graph.reachable_networks(
+        "FIELD"
+    )
+
+
+def test_can_reach_respects_direction_and_port(project: Project) -> None:
+    graph = build_reachability_graph(project)
+
+    assert graph.can_reach("IO-2", "HMI-1")
+    assert not graph.can_reach("HMI-1", "IO-2")
+    assert graph.can_reach("IO-1", "IO-2", port=502)
+    assert not graph.can_reach("IO-1", "HMI-1", port=4840)
+    with pytest.raises(ValueError, match="not found"):
+        graph.can_reach("IO-1", "MISSING")
+
+
+def test_device_reach_is_wider_than_firewall_peers(project: Project) -> None:
+    for device in project.devices:
+        device.area_type = ["MNS"]
+    graph = build_reachability_graph(project)
+    index = build_connectivity_index(project.devices, project.software)
+
+    assert graph.device_reach("IO-2") is graph.device_reach("IO-2")
+    # IO-2 попадает в CTRL по маршруту IO-1, но сам маршрута не объявляет:
+    # для фаервола PLC-1 он не сосед
+    assert graph.can_reach("IO-2", "PLC-1", port=502)
+    peers = index.peers_of(project.devices[1])
+    assert [project.devices[pos].name for pos in peers] == ["IO-1"]
+
+
+def test_path_lists_routes_taken(project: Project) -> None:
+    graph = build_reachability_graph(project)
+
+    assert graph.path("IO-2", "HMI-1") == [
+        PathHop(network="FIELD"),
+        PathHop(network="CTRL", via="IO-1/eth0"),
+        PathHop(network="SCADA", via="PLC-1/eth0"),
+    ]
+    assert graph.path("IO-1", "IO-2") == [PathHop(network="FIELD")]
+    assert graph.path("HMI-1", "IO-1") is None
+
+
+def test_path_command(project: Project, tmp_path: Path) -> None:
+    pytest.importorskip("typer")
+    from typer.testing import CliRunner
+
+    from halter.cli import main
+    from halter.core.services.config_io import save_project
+
+    path = tmp_path / "project.yaml"
+    save_project(project, path)
+    runner = CliRunner()
+
+    result = runner.invoke(
+        main.app, ["-f", str(path), "path", "PLC-1", "HMI-1"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "SCADA (route on PLC-1/eth0)" in result.output
+    assert "Common ports: 4840" in result.output
+
+    result = runner.invoke(
+        main.app, ["-f", str(path), "path", "HMI-1", "PLC-1"]
+    )
+    assert result.exit_code == 1
+    assert "not reachable" in result.output
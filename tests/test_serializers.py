@@ -0,0 +1,161 @@
+# tests/test_serializers.py
+
+import io
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+from yaml import CSafeDumper as Dumper
+
+from halter.core.models.device import Device
+from halter.core.models.firewall import Chain, FirewallRule, RuleAction
+from halter.core.models.interface import VlanMode
+from halter.core.models.network import Network, NetworkTopology
+from halter.core.models.project import Project
+from halter.core.services.serializers import (
+    decode,
+    dump_yaml,
+    encode,
+    reflective_to_dict,
+    write_yaml,
+)
+
+BENCHMARKS = Path(__file__).resolve().parents[1] / "benchmarks"
+
+# Строки, вид которых в YAML выбирает libyaml: кавычки, перенос по
+# ширине, многострочная запись
+TRICKY = [
+    "",
+    " lead",
+    "trail ",
+    "yes",
+    "null",
+    "1.0",
+    "0x1f",
+    "1:20",
+    "2020-01-01",
+    "a: b",
+    "#comment",
+    "- item",
+    "it's",
+    "multi\nline",
+    "carriage\rreturn",
+    "line\u2028separator",
+    "paragraph\u2029separator",
+    "next\x85line",
+    "Кириллица и ёлка",
+    "word " * 30,
+    "x" * 100,
+]
+
+
+@pytest.fixture
+def project(monkeypatch: pytest.MonkeyPatch) -> Project:
+    monkeypatch.syspath_prepend(str(BENCHMARKS))
+    from synthetic import ProjectShape, generate_project
+
+    project: Project = generate_project(
+        ProjectShape(devices=len(TRICKY), networks=3)
+    )
+    return project
+
+
+def _reference(obj: object) -> str:
+    text: str = yaml.dump(
+        reflective_to_dict(obj),
+        Dumper=Dumper,
+        sort_keys=False,
+        allow_unicode=True,
+    )
+    return text
+
+
+def test_dump_matches_yaml_dump(project: Project) -> None:
+    assert dump_yaml(project) == _reference(project)
+
+
+def test_dump_matches_yaml_dump_for_tricky_strings(project: Project) -> None:
+    project.description = "word " * 30
+    for device, text in zip(project.devices, TRICKY, strict=True):
+        device.description = text
+        device.interfaces[0].routes = [text, "NET0000"]
+    project.networks[0].description = TRICKY[-1]
+    project.software[0].version = 1.5  # type: ignore[assignment]
+    project.devices[0].software_used = None  # type: ignore[assignment]
+
+    assert dump_yaml(project) == _reference(project)
+
+
+def test_write_yaml_streams_entities(project: Project) -> None:
+    chunks: list[str] = []
+
+    class Recorder(io.StringIO):
+        def write(self, text: str) -> int:
+            chunks.append(text)
+            return len(text)
+
+    write_yaml(project, Recorder())
+
+    assert "".join(chunks) == _reference(project)
+    # Сети, устройства и ПО уходят в поток по одному
+    sections = [chunks.index(f"{name}:\n") for name in ("devices", "software")]
+    assert sections[1] - sections[0] == len(project.devices) + 1
+    assert chunks[sections[0] + 1].startswith("- name: DEV-00000\n")
+
+
+def test_encode_matches_reflective(project: Project) -> None:
+    assert encode(project) == reflective_to_dict(project)
+    # Не dataclass - прежний обход
+    assert encode({"a": [project.networks[0]]}) == {
+        "a": [reflective_to_dict(project.networks[0])]
+    }
+
+
+def test_empty_reserved_is_not_written(project: Project) -> None:
+    network = project.networks[0]
+    assert "reserved" not in encode(network)
+    assert "reserved:" not in dump_yaml(project)
+
+    network.reserved = ["10.0.0.5-10.0.0.9"]
+    assert encode(network)["reserved"] == ["10.0.0.5-10.0.0.9"]
+    assert dump_yaml(project) == _reference(project)
+    data = yaml.safe_load(dump_yaml(project))
+    assert decode(Network, data["networks"][0]) == network
+
+
+def test_decode_converts_enums_and_nested_models(project: Project) -> None:
+    data = yaml.safe_load(dump_yaml(project))
+
+    network = decode(Network, data["networks"][0])
+    device = decode(Device, data["devices"][0])
+
+    assert network == project.networks[0]
+    assert type(network.topology) is NetworkTopology
+    assert type(device.interfaces[0].vlan_mode) is VlanMode
+    assert device == project.devices[0]
+
+
+def test_every_model_enum_is_represented() -> None:
+    rule = FirewallRule(
+        chain=Chain.INPUT, action=RuleAction.DROP, source_ports=[22]
+    )
+
+    assert yaml.safe_load(dump_yaml(rule)) == {
+        **reflective_to_dict(rule),
+        "chain": Chain.INPUT.value,
+        "action": RuleAction.DROP.value,
+    }
+    assert dump_yaml(rule) == _reference(rule)
+
+
+def test_serializer_benchmark_smoke(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.syspath_prepend(str(BENCHMARKS))
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["bench_serializers.py", "--devices=6", "--networks=2", "--repeat=1"],
+    )
+    import bench_serializers
+
+    assert bench_serializers.main() == 0
@@ -0,0 +1,217 @@
+# tests/test_sharded_io.py
+
+from pathlib import Path
+
+import pytest
+import yaml
+
+from halter.core.models.project import Project
+from halter.core.services.config_io import (
+    ProjectLoadError,
+    load_project,
+    save_project,
+)
+from halter.core.services.sharded_io import (
+    INDEX_NAME,
+    load_project_dir,
+    save_project_dir,
+    shard_file_names,
+)
+
+BENCHMARKS = Path(__file__).resolve().parents[1] / "benchmarks"
+
+
+@pytest.fixture
+def project(monkeypatch: pytest.MonkeyPatch) -> Project:
+    monkeypatch.syspath_prepend(str(BENCHMARKS))
+    from synthetic import ProjectShape, generate_project
+
+    project: Project = generate_project(ProjectShape(devices=12, networks=3))
+    return project
+
+
+def test_directory_round_trip(project: Project, tmp_path: Path) -> None:
+    path = tmp_path / "plant"
+    path.mkdir()
+    save_project(project, path)
+
+    index = yaml.safe_load((path / INDEX_NAME).read_text(encoding="utf-8"))
+    assert index["devices"][0] == "DEV-00000.yaml"
+    assert len(list((path / "devices").iterdir())) == 12
+    assert load_project(path) == project
+    assert load_project_dir(path, jobs=1) == project
+
+
+def test_round_trip_with_single_file(project: Project, tmp_path: Path) -> None:
+    single = tmp_path / "project.yaml"
+    save_project(project, single)
+    save_project(load_project(single), f"{tmp_path / 'plant'}/")
+    save_project(load_project(tmp_path / "plant"), tmp_path / "again.yaml")
+
+    assert (tmp_path / "again.yaml").read_bytes() == single.read_bytes()
+
+
+def test_save_rewrites_only_changed_shards(
+    project: Project, tmp_path: Path
+) -> None:
+    path = tmp_path / "plant"
+    first = save_project_dir(project, path)
+    assert len(first.written) == 3 + 12 + 10 + 1
+
+    again = save_project_dir(project, path)
+    assert again.written == [] and again.removed == []
+
+    project.devices[3].description = "moved"
+    removed = project.devices[5].name
+    project.devices.remove_named(removed)
+    result = save_project_dir(project, path)
+
+    assert result.written == [
+        path / "devices" / f"{project.devices[3].name}.yaml",
+        path / INDEX_NAME,
+    ]
+    assert result.removed == [path / "devices" / f"{removed}.yaml"]
+    assert load_project(path) == project
+
+
+def test_directory_layout_needs_directory_or_separator(
+    project: Project, tmp_path: Path
+) -> None:
+    # Новый путь без расширения - по-прежнему файл YAML
+    save_project(project, tmp_path / "myproject")
+    assert (tmp_path / "myproject").is_file()
+    assert load_project(tmp_path / "myproject") == project
+
+    save_project(project, f"{tmp_path / 'plant'}/")
+    assert (tmp_path / "plant" / INDEX_NAME).is_file()
+    save_project(project, tmp_path / "plant")
+    assert load_project(tmp_path / "plant") == project
+
+
+def test_cli_save_with_trailing_separator(
+    project: Project, tmp_path: Path
+) -> None:
+    pytest.importorskip("typer")
+    from typer.testing import CliRunner
+
+    from halter.cli import main
+
+    single = tmp_path / "project.yaml"
+    save_project(project, single)
+    target = tmp_path / "plant"
+
+    result = CliRunner().invoke(
+        main.app,
+        ["-f", str(single), "project", "save", "--path", f"{target}/"],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert load_project(target) == project
+
+
+def test_cli_creates_directory_from_trailing_separator(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pytest.importorskip("typer")
+    from halter.cli import main
+
+    target = tmp_path / "plant"
+    monkeypatch.setattr(
+        "sys.argv", ["halter-cli", "-f", f"{target}/", "project", "show"]
+    )
+
+    with pytest.raises(SystemExit):
+        main.run()
+
+    assert (target / INDEX_NAME).is_file()
+    assert load_project(target).name == "Default name"
+
+
+def test_index_root_must_be_mapping(tmp_path: Path) -> None:
+    (tmp_path / INDEX_NAME).write_text("- networks\n", encoding="utf-8")
+
+    with pytest.raises(TypeError, match="root must be a mapping"):
+        load_project(tmp_path)
+
+
+def test_shard_file_names_are_safe_and_unique() -> None:
+    assert shard_file_names(["NET 1/a", "net_1_a", ".hidden", ""]) == [
+        "NET_1_a.yaml",
+        "net_1_a~2.yaml",
+        "hidden.yaml",
+        "_.yaml",
+    ]
+
+
+def test_broken_shard_names_its_file(project: Project, tmp_path: Path) -> None:
+    path = tmp_path / "plant"
+    path.mkdir()
+    save_project(project, path)
+    shard = path / "networks" / "NET0001.yaml"
+    shard.write_text("name: NET0001\ntopology: Nowhere\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="NET0001.yaml"):
+        load_project(path)
+
+
+def test_cli_accepts_directory(project: Project, tmp_path: Path) -> None:
+    pytest.importorskip("typer")
+    from typer.testing import CliRunner
+
+    from halter.cli import main
+    from halter.cli.context import project_ref
+
+    path = tmp_path / "plant"
+    path.mkdir()
+    save_project(project, path)
+
+    result = CliRunner().invoke(main.app, ["-f", str(path), "check"])
+
+    assert result.exit_code == 0, result.output
+    assert project_ref["active"] == project
+
+
+def test_broken_shards_are_reported_together(
+    project: Project, tmp_path: Path
+) -> None:
+    path = tmp_path / "plant"
+    path.mkdir()
+    save_project(project, path)
+    (path / "networks" / "NET0001.yaml").write_text(
+        "name: NET0001\ntopology: Nowhere\n", encoding="utf-8"
+    )
+    device = path / "devices" / "DEV-00002.yaml"
+    device.write_text(
+        device.read_text(encoding="utf-8") + "colour: red\n", encoding="utf-8"
+    )
+
+    with pytest.raises(ProjectLoadError) as excinfo:
+        load_project(path)
+    paths = [issue.path for issue in excinfo.value.issues]
+    assert paths[0] == "networks/NET0001.yaml.topology"
+    assert "networks/NET0001.yaml.tier" in paths
+    assert paths[-1] == "devices/DEV-00002.yaml.colour"
+
+    subset = load_project(path, valid_subset=True)
+    assert "NET0001" not in [n.name for n in subset.networks]
+    assert len(subset.devices) == len(project.devices) - 1
+
+
+def test_index_without_name_is_a_load_issue(
+    project: Project, tmp_path: Path
+) -> None:
+    path = tmp_path / "plant"
+    path.mkdir()
+    save_project(project, path)
+    index_path = path / INDEX_NAME
+    index = yaml.safe_load(index_path.read_text(encoding="utf-8"))
+    del index["name"], index["description"]
+    index_path.write_text(yaml.safe_dump(index), encoding="utf-8")
+
+    with pytest.raises(ProjectLoadError) as excinfo:
+        load_project(path)
+
+    assert [issue.path for issue in excinfo.value.issues] == [
+        "name",
+        "description",
+    ]
@@ -0,0 +1,135 @@
+# tests/test_sqlite_io.py
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from halter.core.models.project import Project
+from halter.core.services.config_io import (
+    ProjectLoadError,
+    load_project,
+    save_project,
+)
+from halter.core.services.sqlite_io import ProjectDatabase
+
+BENCHMARKS = Path(__file__).resolve().parents[1] / "benchmarks"
+
+
+@pytest.fixture
+def project(monkeypatch: pytest.MonkeyPatch) -> Project:
+    monkeypatch.syspath_prepend(str(BENCHMARKS))
+    from synthetic import ProjectShape, generate_project
+
+    project: Project = generate_project(ProjectShape(devices=12, networks=3))
+    return project
+
+
+@pytest.fixture
+def db_path(project: Project, tmp_path: Path) -> Path:
+    path = tmp_path / "plant.sqlite"
+    save_project(project, path)
+    return path
+
+
+def test_round_trip_with_yaml(project: Project, tmp_path: Path) -> None:
+    single = tmp_path / "project.yaml"
+    save_project(project, single)
+    save_project(load_project(single), tmp_path / "plant.db")
+    save_project(load_project(tmp_path / "plant.db"), tmp_path / "again.yaml")
+
+    assert load_project(tmp_path / "plant.db") == project
+    assert (tmp_path / "again.yaml").read_bytes() == single.read_bytes()
+
+
+def test_save_replaces_previous_project(
+    project: Project, db_path: Path
+) -> None:
+    project.devices.remove_named(project.devices[0].name)
+    project.networks[1].description = "changed"
+    save_project(project, db_path)
+
+    assert load_project(db_path) == project
+
+
+def test_load_collects_bad_rows(project: Project, db_path: Path) -> None:
+    with sqlite3.connect(db_path) as db:
+        db.execute(
+            "UPDATE networks "
+            "SET data = json_set(data, '$.topology', 'Nowhere') "
+            "WHERE pos = 1"
+        )
+        db.execute("UPDATE devices SET data = '{' WHERE pos = 4")
+
+    with pytest.raises(ProjectLoadError) as excinfo:
+        load_project(db_path)
+    assert [issue.path for issue in excinfo.value.issues] == [
+        "networks[1].topology",
+        "devices[4]",
+    ]
+
+    subset = load_project(db_path, valid_subset=True)
+    assert len(subset.networks) == len(project.networks) - 1
+    assert project.devices[4].name not in subset.devices.names()
+
+
+def test_queries_read_single_records(project: Project, db_path: Path) -> None:
+    db = ProjectDatabase(db_path)
+    device = project.devices[4]
+    iface = device.interfaces[0]
+
+    assert [(d.name, d.interfaces) for d in db.device_summaries()] == [
+        (d.name, len(d.interfaces)) for d in project.devices
+    ]
+    assert db.network("NET0001") == project.networks[1]
+    assert db.device(device.name) == device
+    assert db.software("sw_003") == project.software[3]
+    assert db.network("MISSING") is None
+    assert [
+        (ref.device, ref.interface)
+        for ref in db.interfaces_with_address(iface.address)
+    ] == [(device.name, iface.name)]
+
+
+def test_lookups_use_indexes(db_path: Path) -> None:
+    with sqlite3.connect(db_path) as db:
+        plans = [
+            db.execute(f"EXPLAIN QUERY PLAN {query}", ("x",)).fetchall()
+            for query in (
+                "SELECT data FROM devices WHERE name = ?",
+                "SELECT data FROM networks WHERE name = ?",
+                "SELECT data FROM software WHERE name = ?",
+                "SELECT pos FROM interfaces WHERE address = ?",
+            )
+        ]
+
+    assert all("USING INDEX" in str(plan) for plan in plans)
+
+
+def test_cli_queries_do_not_load_project(
+    project: Project, db_path: Path
+) -> None:
+    pytest.importorskip("typer")
+    from typer.testing import CliRunner
+
+    from halter.cli import main
+    from halter.cli.context import project_ref
+
+    runner = CliRunner()
+    for args in (
+        ["device", "list"],
+        ["network", "show", "NET0002"],
+        ["software", "list-ports", "sw_001"],
+    ):
+        result = runner.invoke(main.app, ["-f", str(db_path), *args])
+        assert result.exit_code == 0, result.output
+        assert project_ref.loaded() is None
+    listing = runner.invoke(main.app, ["-f", str(db_path), "device", "list"])
+    assert project.devices[-1].name in listing.output
+
+    result = runner.invoke(
+        main.app, ["-f", str(db_path), "device", "delete", "DEV-00000"]
+    )
+    assert result.exit_code == 0, result.output
+    assert project_ref.loaded() is not None
+    assert project_ref["active"].devices.get("DEV-00000") is None